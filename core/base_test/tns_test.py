@@ -12,6 +12,7 @@ from core.utils.device.adb import Adb
 from core.utils.device.device_manager import DeviceManager
 from core.utils.file_utils import Folder, File
 from core.utils.gradle import Gradle
+from core.utils.probe_cache import ProbeCache
 from core.utils.process import Process
 from core.utils.xcode import Xcode
 from products.nativescript.tns import Tns
@@ -58,18 +59,14 @@ class TnsTest(unittest.TestCase):
     def setUp(self):
         TestContext.TEST_NAME = self._testMethodName
         Log.test_start(test_name=TestContext.TEST_NAME)
-        Tns.kill()
-        Gradle.kill()
-        AppiumDriver.kill()
+        TnsTest.kill_processes()
         TnsTest.__clean_backup_folder_and_dictionary()
 
     def tearDown(self):
         # pylint: disable=no-member
 
         # Kill processes
-        Tns.kill()
-        AppiumDriver.kill()
-        Gradle.kill()
+        TnsTest.kill_processes()
         Process.kill_all_in_context()
         TnsTest.restore_files()
 
@@ -97,9 +94,18 @@ class TnsTest(unittest.TestCase):
         Tns.kill()
         TnsTest.kill_emulators()
         Process.kill_all_in_context()
-        Folder.clean(Settings.TEST_OUT_TEMP)
+        Folder.clean(Settings.TEST_OUT_TEMP, fast=True)
+        Log.info('Probe cache stats: {0}'.format(ProbeCache.stats()))
         Log.test_class_end(TestContext.CLASS_NAME)
 
+    @staticmethod
+    def kill_processes():
+        """
+        Kill tns, gradle and appium processes (with single pass over the process table).
+        """
+        Log.info("Kill tns, gradle and appium processes.")
+        Process.kill_all(patterns=Tns.kill_patterns() + Gradle.kill_patterns() + AppiumDriver.kill_patterns())
+
     @staticmethod
     def kill_emulators():
         DeviceManager.Emulator.stop()
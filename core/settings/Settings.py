@@ -62,8 +62,26 @@ ASSETS_HOME = os.path.join(TEST_RUN_HOME, 'assets')
 
 SSH_CLONE = os.environ.get('SSH_CLONE', False)
 
+# Cache results of environment probes (tool versions) on disk for whole CI run (disabled if not set)
+PROBE_CACHE_FILE = os.environ.get('PROBE_CACHE_FILE', None)
+PROBE_CACHE_TTL = int(os.environ.get('PROBE_CACHE_TTL', 12 * 60 * 60))
+
+# Folder for persisted file indexes of folders that rarely change (for example Android SDK)
+FILE_INDEX_CACHE = os.environ.get('FILE_INDEX_CACHE',
+                                  os.path.join(os.path.expanduser('~'), '.cache', 'nativescript-tests', 'file_index'))
+
+# Record trace of commands, adb calls, screenshots and waits in TEST_OUT_LOGS/trace.jsonl
+TRACE = str(os.environ.get('TRACE', False)).lower() in ['true', '1']
+
+# Read logcat of android devices with long-lived `adb logcat` process instead of `adb logcat -d` on each check
+LOGCAT_STREAM = str(os.environ.get('LOGCAT_STREAM', True)).lower() in ['true', '1']
+LOGCAT_MAX_LINES = int(os.environ.get('LOGCAT_MAX_LINES', 100000))
+
 BACKUP_FOLDER = os.path.join(TEST_RUN_HOME, "backup_folder")
 
+# Folders cleaned with `Folder.clean(fast=True)` are moved here and deleted in background
+TRASH_HOME = os.environ.get('TRASH_HOME', os.path.join(TEST_RUN_HOME, '.trash'))
+
 
 def resolve_package(name, variable, default=str(ENV)):
     package = os.environ.get(variable, default)
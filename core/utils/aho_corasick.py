@@ -0,0 +1,104 @@
+"""
+Multi-pattern string matching (Aho-Corasick automaton).
+"""
+import collections
+
+
+class AhoCorasick(object):
+    """
+    Automaton that finds all occurrences of many patterns in single pass over the text.
+    """
+
+    def __init__(self, patterns):
+        """
+        Build automaton.
+        :param patterns: List of strings (empty strings are ignored).
+        """
+        self.patterns = list(patterns)
+        self.__goto = [{}]
+        self.__fail = [0]
+        self.__output = [[]]
+        for index, pattern in enumerate(self.patterns):
+            if pattern:
+                self.__add(pattern, index)
+        self.__build()
+
+    def __add(self, pattern, index):
+        state = 0
+        for char in pattern:
+            next_state = self.__goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.__goto)
+                self.__goto[state][char] = next_state
+                self.__goto.append({})
+                self.__fail.append(0)
+                self.__output.append([])
+            state = next_state
+        self.__output[state].append(index)
+
+    def __build(self):
+        queue = collections.deque(self.__goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.__goto[state].items():
+                queue.append(next_state)
+                fail = self.__fail[state]
+                while fail and char not in self.__goto[fail]:
+                    fail = self.__fail[fail]
+                self.__fail[next_state] = self.__goto[fail].get(char, 0)
+                self.__output[next_state] = self.__output[next_state] + self.__output[self.__fail[next_state]]
+
+    def step(self, state, char):
+        """
+        Move automaton with one char.
+        :return: Tuple (new state, list of indexes of patterns that end at this char).
+        """
+        goto = self.__goto
+        while state and char not in goto[state]:
+            state = self.__fail[state]
+        state = goto[state].get(char, 0)
+        return state, self.__output[state]
+
+    def matcher(self):
+        """
+        :return: StreamMatcher object that can be fed with text in chunks.
+        """
+        return StreamMatcher(self)
+
+    def find_all(self, text):
+        """
+        Find all occurrences of patterns in text.
+        :return: List of (pattern index, end position) tuples.
+        """
+        return self.matcher().feed(text)
+
+
+class StreamMatcher(object):
+    """
+    Stateful matcher, matches that span two chunks are found as well.
+    """
+
+    def __init__(self, automaton):
+        self.automaton = automaton
+        self.state = 0
+        self.position = 0
+
+    def feed(self, text):
+        """
+        Feed next chunk of text.
+        :param text: String.
+        :return: List of (pattern index, end position) tuples (position is counted from first fed char).
+        """
+        matches = []
+        state = self.state
+        step = self.automaton.step
+        position = self.position
+        for char in text:
+            state, output = step(state, char)
+            position += 1
+            if output:
+                for index in output:
+                    matches.append((index, position))
+        self.state = state
+        self.position = position
+        return matches
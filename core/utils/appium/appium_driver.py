@@ -37,7 +37,14 @@ class AppiumDriver(object):
         """
         Kill all instance of appium server.
         """
-        Process.kill(proc_name='node', proc_cmdline='appium')
+        Process.kill_all(patterns=AppiumDriver.kill_patterns())
+
+    @staticmethod
+    def kill_patterns():
+        """
+        Get patterns of appium server processes (see `Process.kill_all()`).
+        """
+        return [('node', 'appium')]
 
     def __start_server(self):
         Log.info("Starting appium server...")
@@ -0,0 +1,224 @@
+"""
+Inspect content of archives (apk, aab, ipa, zip, tgz) without extracting them.
+"""
+# pylint: disable=broad-except
+import collections
+import fnmatch
+import os
+import shutil
+import tarfile
+import threading
+import zipfile
+
+from core.log.log import Log
+
+
+class ArchiveEntry(object):
+    """
+    Member of archive.
+    """
+
+    def __init__(self, name, size, compressed_size, is_dir=False):
+        self.name = name
+        # Name as it is stored in archive
+        self.member = name
+        self.size = size
+        # Compressed size is not known for members of tar archives (whole archive is compressed)
+        self.compressed_size = compressed_size
+        self.is_dir = is_dir
+
+    def __str__(self):
+        return '{0} ({1} bytes)'.format(self.name, self.size)
+
+
+class Archive(object):
+    """
+    Member list of archive, read once (from zip central directory or tar headers) and queried from memory.
+
+    Paths of members are always separated with '/', paths passed to queries might use `os.sep` as well.
+    """
+    MAX_ARCHIVES = 32
+
+    __archives = collections.OrderedDict()
+    __lock = threading.Lock()
+
+    def __init__(self, path):
+        """
+        Read member list of archive.
+        :param path: Path to archive.
+        """
+        self.path = os.path.abspath(path)
+        self.entries = collections.OrderedDict()
+        if zipfile.is_zipfile(self.path):
+            self.type = 'zip'
+            with zipfile.ZipFile(self.path, 'r') as zip_file:
+                for info in zip_file.infolist():
+                    is_dir = info.filename.endswith('/')
+                    self.__add(ArchiveEntry(name=info.filename, size=info.file_size,
+                                            compressed_size=info.compress_size, is_dir=is_dir))
+        elif tarfile.is_tarfile(self.path):
+            self.type = 'tar'
+            with tarfile.open(self.path, 'r:*') as tar_file:
+                for info in tar_file:
+                    self.__add(ArchiveEntry(name=info.name, size=info.size, compressed_size=None, is_dir=info.isdir()))
+        else:
+            raise IOError('Error: {0} is not zip or tar archive'.format(path))
+
+    def __add(self, entry):
+        entry.name = entry.name.rstrip('/')
+        if entry.name.startswith('./'):
+            entry.name = entry.name[2:]
+        if entry.name:
+            self.entries[entry.name] = entry
+
+    @staticmethod
+    def get(path):
+        """
+        Get shared archive object (member list is read again only when archive is modified).
+        :param path: Path to archive.
+        :return: Archive object.
+        """
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        with Archive.__lock:
+            cached = Archive.__archives.pop(key, None)
+            if cached is not None and cached[0] == (stat.st_mtime, stat.st_size):
+                archive = cached[1]
+            else:
+                archive = Archive(path)
+            Archive.__archives[key] = ((stat.st_mtime, stat.st_size), archive)
+            while len(Archive.__archives) > Archive.MAX_ARCHIVES:
+                Archive.__archives.popitem(last=False)
+            return archive
+
+    @staticmethod
+    def __normalize(path):
+        return path.replace('\\', '/').strip('/')
+
+    def __under(self, prefix):
+        """
+        :return: Files (not folders) with path equal to prefix or inside prefix folder.
+        """
+        prefix = Archive.__normalize(prefix)
+        if not prefix:
+            return [entry for entry in self.entries.values() if not entry.is_dir]
+        folder = prefix + '/'
+        return [entry for name, entry in self.entries.items()
+                if not entry.is_dir and (name == prefix or name.startswith(folder))]
+
+    def names(self, prefix=''):
+        """
+        :param prefix: Path of folder in archive (empty for whole archive).
+        :return: List of file paths in archive.
+        """
+        return [entry.name for entry in self.__under(prefix)]
+
+    def exists(self, path):
+        """
+        :param path: Path of file or folder in archive.
+        :return: True if archive contains file or non-empty folder with such path.
+        """
+        path = Archive.__normalize(path)
+        return path in self.entries or len(self.__under(path)) > 0
+
+    def contains(self, text):
+        """
+        :param text: Part of path, for example 'x86/libNativeScript.so'.
+        :return: True if path of any member contains text.
+        """
+        text = text.replace('\\', '/')
+        return any(text in name for name in self.entries.keys())
+
+    def find(self, pattern):
+        """
+        :param pattern: Glob pattern of file name, for example: '*.aar'.
+        :return: List of paths of files with matching names.
+        """
+        return [entry.name for entry in self.entries.values()
+                if not entry.is_dir and fnmatch.fnmatch(entry.name.split('/')[-1], pattern)]
+
+    def get_size(self, prefix='', compressed=False):
+        """
+        Get size of file or folder in archive.
+        :param prefix: Path of file or folder in archive (empty for whole archive).
+        :param compressed: If True return compressed size (available only for zip archives).
+        :return: Size in bytes.
+        """
+        if compressed and self.type != 'zip':
+            raise IOError('Error: Compressed size of members is not available for {0}'.format(self.path))
+        return sum(entry.compressed_size if compressed else entry.size for entry in self.__under(prefix))
+
+    def get_size_breakdown(self, prefix='', compressed=False):
+        """
+        Get size of each direct child of folder in archive.
+        :param prefix: Path of folder in archive (empty for whole archive).
+        :param compressed: If True return compressed size (available only for zip archives).
+        :return: Dict {child name: size in bytes}.
+        """
+        prefix = Archive.__normalize(prefix)
+        start = len(prefix) + 1 if prefix else 0
+        breakdown = {}
+        for entry in self.__under(prefix):
+            child = entry.name[start:].split('/')[0]
+            size = entry.compressed_size if compressed else entry.size
+            breakdown[child] = breakdown.get(child, 0) + size
+        return breakdown
+
+    def read(self, path):
+        """
+        Read single file from archive.
+        :param path: Path of file in archive.
+        :return: Content of file (bytes).
+        """
+        with self.__open() as archive_file:
+            member = self.__open_member(archive_file, Archive.__normalize(path))
+            try:
+                return member.read()
+            finally:
+                member.close()
+
+    def extract(self, dest_dir, members=None, prefix=None):
+        """
+        Extract only requested files (content is streamed to disk, whole files are never loaded in memory).
+        :param dest_dir: Destination folder.
+        :param members: List of paths of files in archive.
+        :param prefix: Path of folder in archive (all files in it are extracted).
+        :return: List of paths of extracted files.
+        """
+        names = [Archive.__normalize(name) for name in members or []]
+        if prefix is not None:
+            names.extend(self.names(prefix))
+        # Extract in archive order, so compressed tar streams are read forward only
+        order = dict((name, index) for index, name in enumerate(self.entries.keys()))
+        names = sorted(set(names), key=lambda item: order.get(item, -1))
+        extracted = []
+        with self.__open() as archive_file:
+            for name in names:
+                target = os.path.join(dest_dir, *name.split('/'))
+                if not os.path.abspath(target).startswith(os.path.abspath(dest_dir)):
+                    raise IOError('Error: {0} is outside of destination folder'.format(name))
+                folder = os.path.dirname(target)
+                if not os.path.isdir(folder):
+                    os.makedirs(folder)
+                member = self.__open_member(archive_file, name)
+                try:
+                    with open(target, 'wb') as target_file:
+                        shutil.copyfileobj(member, target_file, 1024 * 1024)
+                finally:
+                    member.close()
+                extracted.append(target)
+        Log.debug('Extracted {0} files from {1}.'.format(len(extracted), self.path))
+        return extracted
+
+    def __open(self):
+        if self.type == 'zip':
+            return zipfile.ZipFile(self.path, 'r')
+        return tarfile.open(self.path, 'r:*')
+
+    def __open_member(self, archive_file, name):
+        entry = self.entries.get(name)
+        if entry is None or entry.is_dir:
+            raise IOError('Error: {0} not found in {1}'.format(name, self.path))
+        if self.type == 'zip':
+            return archive_file.open(entry.member)
+        return archive_file.extractfile(entry.member)
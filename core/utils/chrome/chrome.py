@@ -22,7 +22,7 @@ class Chrome(object):
         path = ChromeDriverManager().install()
         Log.info('Starting Google Chrome ...')
         profile_path = os.path.join(Settings.TEST_OUT_TEMP, 'chrome_profile')
-        Folder.clean(profile_path)
+        Folder.clean(profile_path, fast=True)
         options = webdriver.ChromeOptions()
         options.add_argument('user-data-dir={0}'.format(profile_path))
         self.driver = webdriver.Chrome(executable_path=path, chrome_options=options)
@@ -0,0 +1,60 @@
+"""
+Histogram of image colors.
+
+Colors are packed in 24-bit integers (B << 16 | G << 8 | R), so unique colors are found by sorting of
+one dimensional array instead of lexicographic sort of pixel rows.
+Order of packed colors is the same as lexicographic order of BGR values.
+"""
+import cv2
+import numpy
+
+
+class ColorHistogram(object):
+    def __init__(self, pixels):
+        """
+        Build histogram once and answer many color queries from it.
+        :param pixels: Image as numpy array in OpenCV (BGR) order.
+        """
+        pixels = pixels.reshape(-1, 3).astype(numpy.uint32)
+        packed = (pixels[:, 0] << 16) | (pixels[:, 1] << 8) | pixels[:, 2]
+        self.colors, self.counts = numpy.unique(packed, return_counts=True)
+        self.channels = numpy.stack([(self.colors >> 16) & 0xFF, (self.colors >> 8) & 0xFF, self.colors & 0xFF],
+                                    axis=1).astype(numpy.int32)
+
+    @staticmethod
+    def from_file(image_path):
+        """
+        :param image_path: Image path.
+        :return: ColorHistogram of the image.
+        """
+        return ColorHistogram(cv2.imread(image_path))
+
+    def get_pixels_by_color(self, color, rdb_tolerance=25):
+        """
+        Get count of pixels of specific color.
+        :param color: Color as numpy array in BGR order. Example: numpy.array([255, 217, 141])
+        :param rdb_tolerance: If diff of each of b, g and r values is less then specified colors are equal.
+        :return: Count of pixels of most common color similar to `color`.
+        """
+        diff = numpy.abs(self.channels - numpy.asarray(color, dtype=numpy.int32)[:3])
+        similar = (diff < rdb_tolerance).all(axis=1)
+        if not similar.any():
+            return 0
+        return self.counts[similar].max()
+
+    def get_pixels_by_colors(self, colors, rdb_tolerance=25):
+        """
+        Get count of pixels of multiple colors.
+        :param colors: List of colors as numpy arrays in BGR order.
+        :param rdb_tolerance: If diff of each of b, g and r values is less then specified colors are equal.
+        :return: List of counts (same order as `colors`).
+        """
+        return [self.get_pixels_by_color(color=color, rdb_tolerance=rdb_tolerance) for color in colors]
+
+    def get_main_color(self):
+        """
+        :return: Most common color as numpy array in BGR order (first in BGR order if multiple colors have same count).
+        """
+        if len(self.counts) == 0:
+            return None
+        return self.channels[numpy.argmax(self.counts)].astype(numpy.uint8)
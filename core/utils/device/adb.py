@@ -8,10 +8,15 @@ from subprocess32 import TimeoutExpired
 from core.enums.os_type import OSType
 from core.log.log import Log
 from core.settings import Settings
+from core.utils.device.logcat import Logcat
+from core.utils.file_index import FileIndex
 from core.utils.file_utils import File
+from core.utils.probe_cache import ProbeCache
 from core.utils.process import Process
-from core.utils.run import run
+from core.utils.run import run, run_all, get_async_engine
+from core.utils.trace import Trace
 from core.utils.version import Version
+from core.utils.wait import Wait
 
 ANDROID_HOME = os.environ.get('ANDROID_HOME')
 ADB_PATH = os.path.join(ANDROID_HOME, 'platform-tools', 'adb')
@@ -19,12 +24,25 @@ ADB_PATH = os.path.join(ANDROID_HOME, 'platform-tools', 'adb')
 
 class Adb(object):
     @staticmethod
-    def run_adb_command(command, device_id=None, wait=True, timeout=60, fail_safe=False, log_level=logging.DEBUG):
+    def __get_adb_command(command, device_id=None):
         if device_id is None:
-            command = '{0} {1}'.format(ADB_PATH, command)
-        else:
-            command = '{0} -s {1} {2}'.format(ADB_PATH, device_id, command)
-        return run(cmd=command, wait=wait, timeout=timeout, fail_safe=fail_safe, log_level=log_level)
+            return '{0} {1}'.format(ADB_PATH, command)
+        return '{0} -s {1} {2}'.format(ADB_PATH, device_id, command)
+
+    @staticmethod
+    def run_adb_command(command, device_id=None, wait=True, timeout=60, fail_safe=False, log_level=logging.DEBUG):
+        with Trace.span(name='adb ' + command.split(' ')[0], category='adb', cmd=command, device=device_id):
+            command = Adb.__get_adb_command(command=command, device_id=device_id)
+            return run(cmd=command, wait=wait, timeout=timeout, fail_safe=fail_safe, log_level=log_level)
+
+    @staticmethod
+    def run_adb_command_async(command, device_id=None, timeout=60, fail_safe=False, log_level=logging.DEBUG):
+        """
+        Same as `run_adb_command(wait=True)`, but returns awaitable (Python 3 only).
+        """
+        run_async = get_async_engine().run_async
+        command = Adb.__get_adb_command(command=command, device_id=device_id)
+        return run_async(cmd=command, timeout=timeout, fail_safe=fail_safe, log_level=log_level)
 
     @staticmethod
     def get_ids(include_emulators=False):
@@ -47,6 +65,16 @@ class Adb(object):
 
     @staticmethod
     def get_logcat(device_id):
+        """
+        Get the log (same as `adb logcat -d`, but read from logcat stream when `Settings.LOGCAT_STREAM` is enabled).
+        :param device_id: Device id.
+        """
+        if Settings.LOGCAT_STREAM:
+            return Adb.__get_logcat_stream(device_id=device_id).get_text()
+        return Adb.__dump_logcat(device_id=device_id)
+
+    @staticmethod
+    def __dump_logcat(device_id):
         """
         Dump the log and then exit (don't block).
         :param device_id: Device id.
@@ -65,6 +93,29 @@ class Adb(object):
                 Log.info('Process already killed...')
         return result
 
+    @staticmethod
+    def __get_logcat_stream(device_id):
+        """
+        Get long-lived logcat reader of the device (it is started on first call and restarted if adb exits).
+        :param device_id: Device id.
+        :return: LogcatStream object.
+        """
+        return Logcat.get(device_id=device_id, command=Adb.__get_adb_command(command='logcat', device_id=device_id))
+
+    @staticmethod
+    def wait_for_logcat(device_id, text, timeout=30):
+        """
+        Wait until text is available in the log.
+        :param device_id: Device id.
+        :param text: Text to be searched in the log.
+        :param timeout: Timeout in seconds.
+        :return: True if text is found.
+        """
+        if Settings.LOGCAT_STREAM and '\n' not in text:
+            # Streamed lines are checked by waiter as soon as they are received.
+            return Adb.__get_logcat_stream(device_id=device_id).wait_for(text=text, timeout=timeout) is not None
+        return Wait.until(lambda: text in Adb.get_logcat(device_id=device_id), timeout=timeout, period=1)
+
     @staticmethod
     def clear_logcat(device_id):
         """
@@ -72,6 +123,8 @@ class Adb(object):
         :param device_id: Device id.
         """
         Adb.run_adb_command(command='logcat -c', device_id=device_id, wait=True)
+        if Settings.LOGCAT_STREAM:
+            Adb.__get_logcat_stream(device_id=device_id).clear()
         Log.info("The logcat on {0} is cleared.".format(device_id))
 
     @staticmethod
@@ -84,7 +137,13 @@ class Adb(object):
         if Settings.HOST_OS is OSType.WINDOWS:
             aapt_executable += '.exe'
         base_path = os.path.join(ANDROID_HOME, 'build-tools')
-        return File.find(base_path=base_path, file_name=aapt_executable, exact_match=True)
+        # build-tools rarely change, so index is persisted and refreshed at most once per hour
+        matches = FileIndex.get(root=base_path, follow_symlinks=True, max_age=3600, persist=True).find(
+            name=aapt_executable)
+        if not matches or not all(os.path.isfile(match) for match in matches):
+            matches = FileIndex.get(root=base_path, follow_symlinks=True, persist=True).find(name=aapt_executable)
+        matches.sort(key=lambda s: len(s))
+        return matches[0]
 
     @staticmethod
     def restart():
@@ -126,19 +185,14 @@ class Adb(object):
         :param check_interval: Sleep specified time before check again.
         :return: True if device is ready before timeout, otherwise - False.
         """
-        booted = False
-        start_time = time.time()
-        end_time = start_time + timeout
-        while not booted:
-            time.sleep(check_interval)
-            booted = Adb.is_running(device_id=device_id)
-            if (booted is True) or (time.time() > end_time):
-                break
-        return booted
+        return Wait.until_adaptive(lambda: Adb.is_running(device_id=device_id) is True, timeout=timeout,
+                                   period=check_interval, min_period=0.5)
 
     @staticmethod
     def reboot(device_id):
         Adb.run_adb_command(command='reboot', device_id=device_id)
+        ProbeCache.invalidate(prefix='adb.')
+        Logcat.stop(device_id=device_id)
         Adb.wait_until_boot(device_id=device_id)
 
     @staticmethod
@@ -242,6 +296,7 @@ class Adb(object):
             raise Exception('Failed to get screen of {0}.'.format(device_id))
 
     @staticmethod
+    @ProbeCache.cached('adb.device_version')
     def get_device_version(device_id):
         result = Adb.run_adb_command(command='shell getprop ro.build.version.release', device_id=device_id)
         if result.exit_code == 0:
@@ -311,14 +366,9 @@ class Adb(object):
         :param timeout: Timeout in seconds.
         :return: True if path exists, false if path does not exists
         """
-        t_end = time.time() + timeout
-        found = False
-        while time.time() < t_end:
-            files = Adb.__list_path(device_id=device_id, package_id=package_id, path=file_name)
-            if 'No such file or directory' not in files:
-                found = True
-                break
-        return found
+        return Wait.until_adaptive(
+            lambda: 'No such file or directory' not in Adb.__list_path(device_id=device_id, package_id=package_id,
+                                                                       path=file_name), timeout=timeout, period=1)
 
     @staticmethod
     def start_application(device_id, app_id):
@@ -356,6 +406,7 @@ class Adb(object):
         return is_application_installed
 
     @staticmethod
+    @ProbeCache.cached('adb.version')
     def get_version(device_id):
         """
         Get device version
@@ -364,6 +415,18 @@ class Adb(object):
         result = Adb.run_adb_command(command='shell getprop ro.build.version.release', wait=True, device_id=device_id)
         return Version.get(result.output)
 
+    @staticmethod
+    def get_versions(device_ids):
+        """
+        Get versions of multiple devices (adb commands are executed concurrently).
+        :param device_ids: List of device identifiers.
+        :return: Dict with device identifiers as keys and versions as values.
+        """
+        command = 'shell getprop ro.build.version.release'
+        commands = [Adb.__get_adb_command(command=command, device_id=device_id) for device_id in device_ids]
+        results = run_all(commands=commands, timeout=60)
+        return dict((device_id, Version.get(result.output)) for device_id, result in zip(device_ids, results))
+
     @staticmethod
     def get_active_services(device_id, service_name=""):
         """
@@ -7,13 +7,16 @@ from core.enums.device_type import DeviceType
 from core.enums.os_type import OSType
 from core.log.log import Log
 from core.settings import Settings
+from core.utils.color_histogram import ColorHistogram
 from core.utils.device.adb import Adb
 from core.utils.device.idevice import IDevice
 from core.utils.device.simctl import Simctl
 from core.utils.file_utils import File, Folder
 from core.utils.image_utils import ImageUtils
 from core.utils.run import run
-from core.utils.wait import Wait
+from core.utils.screen_mask import ScreenMask, ScreenMasks
+from core.utils.trace import Trace
+from core.utils.wait import Wait, WaitStats
 
 if Settings.HOST_OS is OSType.OSX:
     from core.utils.device.simauto import SimAuto
@@ -92,23 +95,19 @@ class Device(object):
         :param retry_delay: Retry interval in seconds.
         :param case_sensitive: Should text be case sensitive.
         """
-        t_end = time.time() + timeout
-        found = False
         error_msg = '{0} NOT found on {1}.'.format(text, self.name)
         found_msg = '{0} found on {1}.'.format(text, self.name)
-        while time.time() < t_end:
-            if self.is_text_visible(text=text, case_sensitive=case_sensitive):
-                found = True
-                Log.info(found_msg)
-                break
-            else:
-                Log.info(error_msg + ' Waiting ...')
-                time.sleep(retry_delay)
-        if not found:
+        stats = WaitStats()
+        found = Wait.until_adaptive(lambda: self.is_text_visible(text=text, case_sensitive=case_sensitive),
+                                    timeout=timeout, period=retry_delay, stats=stats)
+        if found:
+            Log.info('{0} ({1} checks in {2:.2f} seconds)'.format(found_msg, stats.attempts, stats.elapsed))
+        else:
             text = self.get_text()
             Log.info('Current text: {0}{1}'.format(os.linesep, text))
         assert found, error_msg
 
+    @Trace.traced(name='get_screen', category='device')
     def get_screen(self, path, log_level=logging.INFO):
         """
         Save screen of mobile device.
@@ -140,38 +139,54 @@ class Device(object):
             Log.error(message)
             raise Exception(message)
 
-    def screen_match(self, expected_image, tolerance=0.1, timeout=30):
+    def screen_match(self, expected_image, tolerance=0.1, timeout=30, masks=None):
         """
         Verify screen match expected image.
         :param expected_image: Name of expected image.
         :param tolerance: Tolerance in percents.
         :param timeout: Timeout in seconds.
+        :param masks: ScreenMask object or list of ScreenMask objects (default is mask of device model).
         """
 
         if File.exists(expected_image):
+            if masks is None:
+                mask = ScreenMasks.get(self.model)
+            elif isinstance(masks, ScreenMask):
+                mask = masks
+            else:
+                mask = ScreenMask()
+                for item in masks:
+                    mask = mask.merge(item)
             match = False
             error_msg = 'Screen of {0} does NOT match {1}.'.format(self.name, expected_image)
             t_end = time.time() + timeout
-            diff_image = None
+            actual_image = expected_image.replace('.png', '_actual.png')
             while time.time() < t_end:
-                actual_image = expected_image.replace('.png', '_actual.png')
                 self.get_screen(path=actual_image, log_level=logging.DEBUG)
+                # Stop comparison as soon as diff is over tolerance, screen is checked again anyway
                 result = ImageUtils.image_match(actual_image=actual_image,
                                                 expected_image=expected_image,
-                                                tolerance=tolerance)
+                                                tolerance=tolerance,
+                                                mask=mask,
+                                                early_exit=True)
                 if result[0]:
                     Log.info('Screen of {0} matches {1}.'.format(self.name, expected_image))
                     match = True
                     break
                 else:
-                    diff_image = result[2]
-                    error_msg += ' Diff is {0} %.'.format(result[1])
-                    Log.info(error_msg)
+                    Log.info('Screen of {0} does NOT match {1}. Diff is at least {2} %.'.format(
+                        self.name, expected_image, result[1]))
                     time.sleep(3)
-            if not match:
-                if diff_image is not None:
-                    diff_image_path = expected_image.replace('.png', '_diff.png')
-                    diff_image.save(diff_image_path)
+            if not match and File.exists(actual_image):
+                # Full comparison of last screen to report exact diff
+                result = ImageUtils.image_match(actual_image=actual_image,
+                                                expected_image=expected_image,
+                                                tolerance=tolerance,
+                                                mask=mask)
+                error_msg += ' Diff is {0} %.'.format(result[1])
+                Log.info(error_msg)
+                diff_image_path = expected_image.replace('.png', '_diff.png')
+                result[2].save(diff_image_path)
             assert match, error_msg
         else:
             Log.info('Expected image not found!')
@@ -180,14 +195,21 @@ class Device(object):
             self.get_screen(path=expected_image, log_level=logging.DEBUG)
             assert False, "Expected image not found!"
 
-    def get_pixels_by_color(self, color):
+    def get_color_histogram(self):
+        """
+        Get histogram of colors on the screen (use it to query multiple colors of the same screen).
+        :return: ColorHistogram object.
+        """
         image_path = os.path.join(Settings.TEST_OUT_IMAGES, self.name,
                                   'screen_{0}.png'.format(int(time.time() * 1000)))
         self.get_screen(image_path, log_level=logging.DEBUG)
-        result = ImageUtils.get_pixels_by_color(image_path, color)
+        result = ColorHistogram.from_file(image_path)
         File.delete(path=image_path)
         return result
 
+    def get_pixels_by_color(self, color):
+        return self.get_color_histogram().get_pixels_by_color(color=color)
+
     # noinspection PyShadowingBuiltins
     def wait_for_color(self, color, pixel_count, delta=10, timeout=30):
         found = False
@@ -209,11 +231,7 @@ class Device(object):
         assert found, err_msg
 
     def get_main_color(self):
-        image_path = os.path.join(Settings.TEST_OUT_IMAGES, self.name, 'screen_{0}.png'.format(int(time.time() * 1000)))
-        self.get_screen(image_path, log_level=logging.DEBUG)
-        result = ImageUtils.get_main_color(image_path)
-        File.delete(path=image_path)
-        return result
+        return self.get_color_histogram().get_main_color()
 
     # noinspection PyUnresolvedReferences
     def wait_for_main_color(self, color, timeout=60):
@@ -263,4 +281,6 @@ class Device(object):
         :param timeout: Timeout in seconds.
         :return: True if text found in device logs.
         """
+        if self.type is DeviceType.EMU or self.type is DeviceType.ANDROID:
+            return Adb.wait_for_logcat(device_id=self.id, text=text, timeout=timeout)
         return Wait.until(lambda: text in self.get_log(), timeout=timeout, period=1)
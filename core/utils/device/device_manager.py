@@ -6,9 +6,11 @@ from core.log.log import Log
 from core.utils.device.adb import Adb, ANDROID_HOME
 from core.utils.device.device import Device
 from core.utils.device.idevice import IDevice
+from core.utils.device.logcat import Logcat
 from core.utils.device.simctl import Simctl
 from core.utils.file_utils import Folder
 from core.utils.java import Java
+from core.utils.probe_cache import ProbeCache
 from core.utils.process import Process
 from core.utils.run import run
 
@@ -19,8 +21,8 @@ class DeviceManager(object):
         devices = []
         # Get Android devices
         if device_type is DeviceType.ANDROID or device_type is any:
-            for device_id in Adb.get_ids(include_emulators=False):
-                version = Adb.get_version(device_id=device_id)
+            versions = Adb.get_versions(device_ids=Adb.get_ids(include_emulators=False))
+            for device_id, version in versions.items():
                 device = Device(id=device_id, name=device_id, type=DeviceType.ANDROID, version=version, model=None)
                 devices.append(device)
         # Get iOS devices
@@ -49,16 +51,13 @@ class DeviceManager(object):
             Stop all running emulators.
             """
             Log.info('Stop all running emulators...')
-            Process.kill_by_commandline('qemu')
-            Process.kill_by_commandline('emulator64')
-
-            Process.kill('emulator64-arm')
-            Process.kill('emulator64-x86')
-            Process.kill('emulator-arm')
-            Process.kill('emulator-x86')
-            Process.kill('qemu-system-arm')
-            Process.kill('qemu-system-i386')
-            Process.kill('qemu-system-i38')
+            ProbeCache.invalidate(prefix='adb.')
+            Logcat.stop()
+            Process.kill_all(patterns=[(None, 'qemu'), (None, 'emulator64'),
+                                       ('emulator64-arm', None), ('emulator64-x86', None),
+                                       ('emulator-arm', None), ('emulator-x86', None),
+                                       ('qemu-system-arm', None), ('qemu-system-i386', None),
+                                       ('qemu-system-i38', None)])
 
         @staticmethod
         def start(emulator):
@@ -80,6 +79,7 @@ class DeviceManager(object):
             Log.info('Booting {0} with cmd:'.format(emulator.avd))
             Log.info(command)
             run(cmd=command, wait=False, register=False)
+            ProbeCache.invalidate(prefix='adb.')
             booted = Adb.wait_until_boot(device_id=emulator.emu_id)
             if booted:
                 Log.info('{0} is up and running!'.format(emulator.avd))
@@ -147,10 +147,8 @@ class DeviceManager(object):
             """
             if sim_id == 'booted':
                 Log.info('Stop all running simulators.')
-                Process.kill('Simulator')
-                Process.kill('tail')
-                Process.kill('launchd_sim')
-                Process.kill_by_commandline('CoreSimulator')
+                Process.kill_all(patterns=[('Simulator', None), ('tail', None), ('launchd_sim', None),
+                                           (None, 'CoreSimulator')])
             else:
                 Log.info('Stop simulator with id ' + sim_id)
                 run(cmd='xcrun simctl shutdown {0}'.format(sim_id), timeout=60)
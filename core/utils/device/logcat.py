@@ -0,0 +1,232 @@
+"""
+Stream logcat of android devices into in-memory ring buffers.
+"""
+# pylint: disable=broad-except
+import atexit
+import collections
+import subprocess
+import threading
+import time
+
+from core.log.log import Log
+from core.settings import Settings
+from core.utils.process import Process
+from core.utils.run import get_process_group_options
+
+
+class LogcatStream(object):
+    """
+    Long-lived `adb logcat` process that streams lines into bounded ring buffer.
+
+    Each line is stored as (sequence number, host timestamp, text) tuple. Sequence numbers never repeat,
+    so position (sequence number of next line) can be used as cursor, lines older than `max_lines` are dropped.
+    """
+
+    def __init__(self, command, max_lines=Settings.LOGCAT_MAX_LINES):
+        """
+        Init stream (call `start()` to start reading).
+        :param command: Command that prints the log (for example `adb -s emulator-5554 logcat`).
+        :param max_lines: Max count of lines in the buffer.
+        """
+        self.command = command
+        self.max_lines = max_lines
+        self.start_position = 0
+        self.__entries = collections.deque(maxlen=max_lines)
+        self.__position = 0
+        self.__waiters = []
+        self.__condition = threading.Condition()
+        self.__process = None
+        self.__thread = None
+
+    @property
+    def position(self):
+        """
+        :return: Sequence number of next line (use it as cursor).
+        """
+        with self.__condition:
+            return self.__position
+
+    @property
+    def is_running(self):
+        return self.__process is not None and self.__process.poll() is None
+
+    def start(self):
+        """
+        Start (or restart) the logcat process.
+        Buffer is reset, because new process prints whole device buffer again.
+        :return: Self.
+        """
+        self.stop()
+        with self.__condition:
+            self.__entries.clear()
+            self.start_position = self.__position
+        self.__process = subprocess.Popen(self.command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                          **get_process_group_options())
+        self.__thread = threading.Thread(target=self.__read, args=(self.__process.stdout,))
+        self.__thread.daemon = True
+        self.__thread.start()
+        self.__settle()
+        Log.debug('Logcat stream started: {0}'.format(self.command))
+        return self
+
+    def __settle(self, quiet_period=0.2, timeout=5):
+        # New process dumps whole device buffer first, wait until it is read (so first get_text() is complete).
+        end_time = time.time() + timeout
+        position = -1
+        while position != self.position and self.is_running and time.time() < end_time:
+            position = self.position
+            time.sleep(quiet_period)
+
+    def stop(self):
+        """
+        Stop the logcat process (buffer is kept).
+        """
+        if self.__process is not None:
+            if self.__process.poll() is None:
+                Process.kill_tree(pid=self.__process.pid, pgid=Process.get_pgid(self.__process.pid))
+            self.__process = None
+        if self.__thread is not None:
+            self.__thread.join(5)
+            self.__thread = None
+
+    def __read(self, pipe):
+        for line in iter(pipe.readline, b''):
+            text = line.decode('utf-8', 'ignore').rstrip('\r\n')
+            with self.__condition:
+                entry = (self.__position, time.time(), text)
+                self.__entries.append(entry)
+                self.__position += 1
+                for waiter in list(self.__waiters):
+                    if waiter[0] in text:
+                        self.__waiters.remove(waiter)
+                        self.__fire(waiter, entry)
+        pipe.close()
+
+    @staticmethod
+    def __fire(waiter, entry):
+        try:
+            waiter[1](entry)
+        except Exception:
+            Log.debug('Logcat waiter failed on: {0}'.format(entry[2]))
+
+    def clear(self):
+        """
+        Ignore lines received so far (lines are still available with explicit `since`).
+        """
+        with self.__condition:
+            self.start_position = self.__position
+
+    def entries(self, since=None):
+        """
+        Get lines.
+        :param since: Sequence number of first line (default is `start_position`).
+        :return: List of (sequence number, timestamp, text) tuples.
+        """
+        if since is None:
+            since = self.start_position
+        with self.__condition:
+            if not self.__entries or self.__entries[-1][0] < since:
+                return []
+            skip = max(since - self.__entries[0][0], 0)
+            return list(self.__entries)[skip:]
+
+    def get_text(self, since=None):
+        """
+        Get log as text (same as output of `adb logcat -d`).
+        :param since: Sequence number of first line (default is `start_position`).
+        :return: String.
+        """
+        return ''.join(entry[2] + '\n' for entry in self.entries(since=since))
+
+    def search(self, text, since=None):
+        """
+        Find lines that contain text.
+        :param text: Text (should not contain new lines).
+        :param since: Sequence number of first line (default is `start_position`).
+        :return: List of (sequence number, timestamp, text) tuples.
+        """
+        return [entry for entry in self.entries(since=since) if text in entry[2]]
+
+    def add_waiter(self, text, callback, since=None):
+        """
+        Call callback once line that contains text is received.
+        Callback is called with (sequence number, timestamp, text) tuple from reader thread, so it should be fast.
+        :param text: Text (should not contain new lines).
+        :param callback: Function with single argument.
+        :param since: Lines after this sequence number that are already in the buffer are checked as well
+        (default is `start_position`).
+        :return: Waiter (pass it to `remove_waiter`) or None if callback is already called.
+        """
+        with self.__condition:
+            for entry in self.entries(since=since):
+                if text in entry[2]:
+                    self.__fire((text, callback), entry)
+                    return None
+            waiter = (text, callback)
+            self.__waiters.append(waiter)
+            return waiter
+
+    def remove_waiter(self, waiter):
+        with self.__condition:
+            if waiter in self.__waiters:
+                self.__waiters.remove(waiter)
+
+    def wait_for(self, text, timeout=30, since=None):
+        """
+        Wait until line that contains text is received.
+        :param text: Text (should not contain new lines).
+        :param timeout: Timeout in seconds.
+        :param since: Sequence number of first line (default is `start_position`).
+        :return: (sequence number, timestamp, text) tuple of matched line or None if text is not found.
+        """
+        found = []
+        event = threading.Event()
+
+        def on_match(entry):
+            found.append(entry)
+            event.set()
+
+        waiter = self.add_waiter(text=text, callback=on_match, since=since)
+        if waiter is not None:
+            event.wait(timeout)
+            self.remove_waiter(waiter)
+        return found[0] if found else None
+
+
+class Logcat(object):
+    """
+    Registry of logcat streams (one per device).
+    """
+    __streams = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get(device_id, command):
+        """
+        Get stream of a device (stream is started or restarted if it is not running).
+        :param device_id: Device id.
+        :param command: Command that prints the log.
+        :return: LogcatStream object.
+        """
+        with Logcat.__lock:
+            stream = Logcat.__streams.get(device_id)
+            if stream is None:
+                stream = LogcatStream(command=command)
+                Logcat.__streams[device_id] = stream
+            if not stream.is_running:
+                stream.start()
+            return stream
+
+    @staticmethod
+    def stop(device_id=None):
+        """
+        Stop streams.
+        :param device_id: Device id (stop all streams if None).
+        """
+        with Logcat.__lock:
+            for key in list(Logcat.__streams.keys()):
+                if device_id is None or key == device_id:
+                    Logcat.__streams.pop(key).stop()
+
+
+atexit.register(Logcat.stop)
@@ -1,12 +1,13 @@
 import json
 import os
-import time
 
 from core.log.log import Log
 from core.utils.file_utils import File
+from core.utils.probe_cache import ProbeCache
 from core.utils.process import Process
-from core.utils.run import run
+from core.utils.run import run, get_async_engine
 from core.utils.version import Version
+from core.utils.wait import Wait
 
 
 class Simctl(object):
@@ -16,6 +17,15 @@ class Simctl(object):
         command = '{0} {1}'.format('xcrun simctl', command)
         return run(cmd=command, wait=wait, timeout=timeout)
 
+    @staticmethod
+    def run_simctl_command_async(command, timeout=60):
+        """
+        Same as `run_simctl_command(wait=True)`, but returns awaitable (Python 3 only).
+        """
+        run_async = get_async_engine().run_async
+        command = '{0} {1}'.format('xcrun simctl', command)
+        return run_async(cmd=command, timeout=timeout)
+
     # noinspection PyBroadException
     @staticmethod
     def __get_simulators():
@@ -28,14 +38,16 @@ class Simctl(object):
 
     # noinspection PyBroadException
     @staticmethod
+    @ProbeCache.cached('simctl.max_runtime_version', disk=True)
     def get_max_runtime_version(version):
         # Parse runtimes
         result = Simctl.run_simctl_command(command='list --json runtimes')
         try:
             runtimes = json.loads(result.output)
         except ValueError:
+            # Raise instead of returning empty value, so failure is not cached
             Log.error('Failed to parse json ' + os.linesep + result.output)
-            return json.loads('{}')
+            raise
 
         # Get max runtime version
         exact_sdk_version = None
@@ -98,15 +110,9 @@ class Simctl(object):
         :param timeout: Timeout until device is ready (in seconds).
         :return: SimulatorInfo object with defined id, otherwise - False.
         """
-        booted = False
-        start_time = time.time()
-        end_time = start_time + timeout
-        while not booted:
-            time.sleep(2)
-            booted = Simctl.is_running(simulator_info)
-            if booted or time.time() > end_time:
-                return booted
-        return booted
+        if Wait.until_adaptive(lambda: Simctl.is_running(simulator_info), timeout=timeout, period=2, min_period=0.5):
+            return simulator_info
+        return False
 
     @staticmethod
     def is_available(simulator_info):
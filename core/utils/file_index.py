@@ -0,0 +1,224 @@
+"""
+In-memory index of file tree.
+"""
+# pylint: disable=broad-except
+import collections
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+import time
+
+from core.log.log import Log
+from core.settings import Settings
+from core.utils.folder_size import ListdirEntry, scandir
+
+
+class FileIndex(object):
+    """
+    Names of files in a tree, scanned once and queried from memory.
+
+    `refresh()` is incremental: folders are scanned again only when their modification time is changed
+    (it changes when files are added, removed or renamed), other folders cost single stat call.
+    """
+    MAX_INDEXES = 32
+
+    __indexes = collections.OrderedDict()
+    __lock = threading.Lock()
+
+    def __init__(self, root, follow_symlinks=False, folders=None):
+        """
+        Init index (call `refresh()` to scan the tree).
+        :param root: Root folder.
+        :param follow_symlinks: If True index content of symlinked folders as well.
+        :param folders: Folders of previously scanned index (used by `load()`).
+        """
+        self.root = os.path.abspath(root)
+        self.follow_symlinks = follow_symlinks
+        self.refreshed = 0
+        # Count of folders scanned by last refresh
+        self.scanned = 0
+        # {folder path: (mtime, [file names], [(folder name, is symlink)])}
+        self.__folders = folders or {}
+
+    def refresh(self):
+        """
+        Scan folders modified since previous refresh.
+        :return: Self.
+        """
+        seen = set()
+        visited = set()
+        scanned = 0
+        stack = [self.root]
+        while stack:
+            folder = stack.pop()
+            try:
+                stat = os.stat(folder)
+            except OSError:
+                continue
+            if self.follow_symlinks:
+                # Symlinks might create cycles, index each folder only once
+                if (stat.st_dev, stat.st_ino) in visited:
+                    continue
+                visited.add((stat.st_dev, stat.st_ino))
+            entry = self.__folders.get(folder)
+            if entry is None or entry[0] != stat.st_mtime:
+                entry = (stat.st_mtime,) + FileIndex.__scan(folder)
+                self.__folders[folder] = entry
+                scanned += 1
+            seen.add(folder)
+            for name, is_link in reversed(entry[2]):
+                if self.follow_symlinks or not is_link:
+                    stack.append(os.path.join(folder, name))
+        for folder in list(self.__folders.keys()):
+            if folder not in seen:
+                del self.__folders[folder]
+        self.refreshed = time.time()
+        self.scanned = scanned
+        Log.debug('File index of {0} refreshed ({1} of {2} folders scanned).'.format(self.root, scanned, len(seen)))
+        return self
+
+    @staticmethod
+    def __scan(folder):
+        files = []
+        folders = []
+        try:
+            if scandir is not None:
+                entries = list(scandir(folder))
+            else:
+                entries = [ListdirEntry(folder, name) for name in os.listdir(folder)]
+        except OSError:
+            return files, folders
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    folders.append((entry.name, entry.is_symlink()))
+                else:
+                    files.append(entry.name)
+            except OSError:
+                files.append(entry.name)
+        return files, folders
+
+    def walk(self):
+        """
+        Iterate indexed folders (top-down, same as os.walk).
+        :return: Generator of (folder path, list of file names) tuples.
+        """
+        stack = [self.root]
+        while stack:
+            folder = stack.pop()
+            entry = self.__folders.get(folder)
+            if entry is None:
+                continue
+            yield folder, entry[1]
+            for name, _ in reversed(entry[2]):
+                stack.append(os.path.join(folder, name))
+
+    def find(self, name=None, contains=None, pattern=None, extension=None):
+        """
+        Find files (all specified conditions should match).
+        :param name: Exact file name.
+        :param contains: Part of file name.
+        :param pattern: Glob pattern of file name, for example: '*.aar' or '*.android.js'.
+        :param extension: File extension (with or without dot).
+        :return: List of paths.
+        """
+        if extension is not None and not extension.startswith('.'):
+            extension = '.' + extension
+        matches = []
+        for folder, files in self.walk():
+            for file_name in files:
+                if name is not None and file_name != name:
+                    continue
+                if contains is not None and contains not in file_name:
+                    continue
+                if extension is not None and not file_name.endswith(extension):
+                    continue
+                if pattern is not None and not fnmatch.fnmatch(file_name, pattern):
+                    continue
+                matches.append(os.path.join(folder, file_name))
+        return matches
+
+    def save(self, path):
+        """
+        Save index to json file.
+        :param path: Path to file.
+        """
+        data = {'root': self.root, 'follow_symlinks': self.follow_symlinks, 'refreshed': self.refreshed,
+                'folders': self.__folders}
+        folder = os.path.dirname(path)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        temp_file = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(temp_file, 'w') as index_file:
+            json.dump(data, index_file)
+        if os.name == 'nt' and os.path.isfile(path):
+            os.remove(path)
+        os.rename(temp_file, path)
+
+    @staticmethod
+    def load(path):
+        """
+        Load index saved by `save()`.
+        :param path: Path to file.
+        :return: FileIndex object.
+        """
+        with open(path, 'r') as index_file:
+            data = json.load(index_file)
+        folders = {}
+        for folder, entry in data['folders'].items():
+            folders[folder] = (entry[0], entry[1], [tuple(item) for item in entry[2]])
+        index = FileIndex(root=data['root'], follow_symlinks=data['follow_symlinks'], folders=folders)
+        index.refreshed = data['refreshed']
+        return index
+
+    @staticmethod
+    def get(root, follow_symlinks=False, max_age=0, persist=False):
+        """
+        Get shared index of a folder.
+        :param root: Root folder.
+        :param follow_symlinks: If True index content of symlinked folders as well.
+        :param max_age: Index is not refreshed if it is younger than `max_age` seconds.
+        :param persist: If True index is also saved in `Settings.FILE_INDEX_CACHE` and reused by next test runs
+        (use it only for folders that rarely change, like Android SDK).
+        :return: FileIndex object.
+        """
+        key = (os.path.abspath(root), follow_symlinks)
+        with FileIndex.__lock:
+            index = FileIndex.__indexes.pop(key, None)
+            if index is None and persist:
+                index = FileIndex.__load_persisted(key)
+            if index is None:
+                index = FileIndex(root=root, follow_symlinks=follow_symlinks)
+            if time.time() - index.refreshed >= max_age:
+                index.refresh()
+                if persist:
+                    FileIndex.__save_persisted(key, index)
+            FileIndex.__indexes[key] = index
+            while len(FileIndex.__indexes) > FileIndex.MAX_INDEXES:
+                FileIndex.__indexes.popitem(last=False)
+            return index
+
+    @staticmethod
+    def __get_persisted_path(key):
+        name = hashlib.md5(str(key).encode('utf-8')).hexdigest()
+        return os.path.join(Settings.FILE_INDEX_CACHE, name + '.json')
+
+    @staticmethod
+    def __load_persisted(key):
+        path = FileIndex.__get_persisted_path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            return FileIndex.load(path)
+        except Exception:
+            Log.debug('Failed to load file index {0}.'.format(path))
+            return None
+
+    @staticmethod
+    def __save_persisted(key, index):
+        try:
+            index.save(FileIndex.__get_persisted_path(key))
+        except Exception:
+            Log.debug('Failed to save file index of {0}.'.format(index.root))
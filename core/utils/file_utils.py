@@ -7,7 +7,6 @@ File and Folder utils.
 # pylint: disable=no-name-in-module
 # pylint: disable=import-error
 import errno
-import fnmatch
 import os
 import shutil
 import stat
@@ -18,13 +17,25 @@ from core.base_test.test_context import TestContext
 from core.enums.os_type import OSType
 from core.log.log import Log
 from core.settings import Settings
+from core.utils.archive import Archive
+from core.utils.file_index import FileIndex
+from core.utils.folder_clone import FolderClone
+from core.utils.folder_size import FolderSize
 from core.utils.process import Process
+from core.utils.trash import Trash
 
 
 # noinspection PyBroadException
 class Folder(object):
     @staticmethod
-    def clean(folder):
+    def clean(folder, fast=False):
+        """
+        Delete folder.
+        :param folder: Folder path.
+        :param fast: If True move folder to trash and delete it in background (path can be reused immediately).
+        """
+        if fast and Trash.move(folder):
+            return
         if Folder.exists(folder=folder):
             Log.debug("Clean folder: " + folder)
             try:
@@ -91,18 +102,47 @@ class Folder(object):
                     raise
 
     @staticmethod
-    def get_size(folder):
+    def clone(source, target, clean_target=True, hardlink=True):
+        """
+        Clone folder with copy-on-write clones where file system supports it, otherwise hard link immutable content
+        (node_modules and tarballs) and copy the rest in parallel.
+        Notes: Hard linked files are shared with source folder, do not edit files in node_modules of clones in place.
+        :param source: Source folder.
+        :param target: Target folder.
+        :param clean_target: If True clean target folder before clone.
+        :param hardlink: If False never use hard links.
+        :return: CloneResult object.
+        """
+        if clean_target:
+            Folder.clean(folder=target)
+        result = FolderClone.clone(source=source, target=target, hardlink=hardlink)
+        Log.info(str(result))
+        return result
+
+    @staticmethod
+    def get_size(folder, apparent=True, follow_symlinks=None, dedupe_hardlinks=False, use_cache=False):
         """
         Get folder size in bytes.
         :param folder: Folder path.
+        :param apparent: If True count size of files, otherwise count allocated blocks (same as `du`).
+        :param follow_symlinks: None (default) counts symlinks to files with size of target and skips symlinks to
+        folders (same as `os.walk()`), True follows all symlinks, False counts size of symlinks themselves.
+        :param dedupe_hardlinks: If True count files with several hard links only once.
+        :param use_cache: If True reuse sizes of folders that are not modified since previous call.
         :return: Size in bytes.
         """
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(folder):
-            for file_name in filenames:
-                file_path = os.path.join(dirpath, file_name)
-                total_size += os.path.getsize(file_path)
-        return total_size
+        return FolderSize.measure(folder=folder, apparent=apparent, follow_symlinks=follow_symlinks,
+                                  dedupe_hardlinks=dedupe_hardlinks, use_cache=use_cache).size
+
+    @staticmethod
+    def get_size_breakdown(folder, apparent=True, follow_symlinks=None, dedupe_hardlinks=False, use_cache=False):
+        """
+        Get size of each direct child of the folder (see `get_size()` for description of parameters).
+        :param folder: Folder path.
+        :return: Dict {name: size in bytes}, files directly in the folder are counted as '.'.
+        """
+        return FolderSize.measure(folder=folder, apparent=apparent, follow_symlinks=follow_symlinks,
+                                  dedupe_hardlinks=dedupe_hardlinks, use_cache=use_cache).breakdown
 
 
 # noinspection PyBroadException,PyArgumentList, PyUnresolvedReferences
@@ -130,6 +170,33 @@ class File(object):
             with open(path, 'w+', encoding='utf-8', errors='ignore') as text_file:
                 text_file.write(text)
 
+    @staticmethod
+    def write_atomic(path, content):
+        """
+        Write file atomically (content is written to temp file in same folder and then renamed),
+        so watchers never see half-written file and modification time is changed only once.
+        :param path: Path to file.
+        :param content: Text or bytes.
+        """
+        if not isinstance(content, bytes):
+            content = content.encode('utf-8', 'ignore')
+        folder, name = os.path.split(os.path.abspath(path))
+        temp_file = os.path.join(folder, '.{0}.{1}.tmp'.format(name, os.getpid()))
+        try:
+            with open(temp_file, 'wb') as target_file:
+                target_file.write(content)
+            if os.path.isfile(path):
+                shutil.copymode(path, temp_file)
+            if Settings.PYTHON_VERSION < 3:
+                if os.name == 'nt' and os.path.isfile(path):
+                    os.remove(path)
+                os.rename(temp_file, path)
+            else:
+                os.replace(temp_file, path)
+        finally:
+            if os.path.isfile(temp_file):
+                os.remove(temp_file)
+
     @staticmethod
     def append(path, text):
         if Settings.PYTHON_VERSION < 3:
@@ -222,15 +289,11 @@ class File(object):
         :param match_index: Index of match (all matches are sorted by path len, 0 will return closest to root)
         :return: Path to file.
         """
-        matches = []
-        for root, dirs, files in os.walk(base_path, followlinks=True):
-            for current_file in files:
-                if exact_match:
-                    if file_name == current_file:
-                        matches.append(os.path.join(root, current_file))
-                else:
-                    if file_name in current_file:
-                        matches.append(os.path.join(root, current_file))
+        index = FileIndex.get(root=base_path, follow_symlinks=True)
+        if exact_match:
+            matches = index.find(name=file_name)
+        else:
+            matches = index.find(contains=file_name)
         matches.sort(key=lambda s: len(s))
         return matches[match_index]
 
@@ -242,14 +305,10 @@ class File(object):
         :param pattern: File pattern, for example: '*.aar' or '*.android.js'.
         :return: True if exists, False if does not exist.
         """
-        found = False
-        for root, dirs, files in os.walk(directory):
-            for basename in files:
-                if fnmatch.fnmatch(basename, pattern):
-                    filename = os.path.join(root, basename)
-                    Log.info(pattern + " exists: " + filename)
-                    found = True
-        return found
+        matches = FileIndex.get(root=directory).find(pattern=pattern)
+        for filename in matches:
+            Log.info(pattern + " exists: " + filename)
+        return bool(matches)
 
     @staticmethod
     def find_by_extension(folder, extension):
@@ -259,14 +318,9 @@ class File(object):
         :param extension: File extension.
         :return: List of found files.
         """
-        matches = []
-        if '.' not in extension:
-            extension = '.' + extension
-        for root, dirs, files in os.walk(folder):
-            for f in files:
-                if f.endswith(extension):
-                    Log.debug('File with {0} extension found: {1}'.format(extension, os.path.abspath(f)))
-                    matches.append(os.path.join(root, f))
+        matches = FileIndex.get(root=folder).find(extension=extension)
+        for match in matches:
+            Log.debug('File with {0} extension found: {1}'.format(extension, match))
         return matches
 
     @staticmethod
@@ -329,11 +383,7 @@ class File(object):
 
     @staticmethod
     def is_file_in_zip(zip_file, file_name_to_check):
-        files_list = File.get_files_names_in_zip(zip_file)
-        for current_file in files_list:
-            if file_name_to_check in str(current_file.filename):
-                return True
-        return False
+        return Archive.get(zip_file).contains(file_name_to_check)
 
     @staticmethod
     def download(file_name, url, destination_dir=Settings.TEST_RUN_HOME):
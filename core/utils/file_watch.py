@@ -0,0 +1,122 @@
+"""
+Watch file for changes (inotify on Linux, polling everywhere else).
+"""
+# pylint: disable=broad-except
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from core.log.log import Log
+from core.utils.wait import FileWakeUp, WakeUp
+
+# inotify constants (see /usr/include/linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class FileWatcher(WakeUp):
+    """
+    Wake up as soon as file is written.
+
+    On Linux parent folder is watched with inotify (so file does not need to exist when watcher is created),
+    on other platforms (or if inotify is not available) file is polled with os.stat.
+    Use it as `wake_up` of `Wait.until_adaptive` or call `wait()` directly, call `close()` when done.
+    """
+
+    def __init__(self, path, poll_interval=0.05):
+        """
+        Init watcher.
+        :param path: Path to file.
+        :param poll_interval: Interval between two stat calls when inotify is not available (in seconds).
+        """
+        self.path = os.path.abspath(path)
+        self.name = os.path.basename(self.path)
+        if sys.version_info[0] >= 3:
+            self.name = self.name.encode(sys.getfilesystemencoding())
+        self.__fd = None
+        self.__poll = None
+        if sys.platform.startswith('linux'):
+            self.__fd = FileWatcher.__init_inotify(os.path.dirname(self.path))
+        if self.__fd is None:
+            self.__poll = FileWakeUp(path=self.path, poll_interval=poll_interval)
+
+    @property
+    def backend(self):
+        """
+        :return: 'inotify' or 'poll'.
+        """
+        return 'inotify' if self.__fd is not None else 'poll'
+
+    @staticmethod
+    def __init_inotify(folder):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = IN_MODIFY | IN_MOVED_TO | IN_CREATE
+            watch = libc.inotify_add_watch(fd, folder.encode(sys.getfilesystemencoding()), mask)
+            if watch < 0:
+                os.close(fd)
+                return None
+            return fd
+        except Exception:
+            Log.debug('inotify is not available, fallback to polling.')
+            return None
+
+    def wait(self, timeout):
+        if self.__fd is None:
+            return self.__poll.wait(timeout)
+        end_time = time.time() + max(timeout, 0)
+        while True:
+            readable, _, _ = select.select([self.__fd], [], [], max(end_time - time.time(), 0))
+            if not readable:
+                return False
+            if self.__is_file_event(self.__read_events()):
+                return True
+            # Event is about other file in the same folder, wait for the rest of the timeout.
+            if time.time() >= end_time:
+                return False
+
+    def __read_events(self):
+        # Drain all queued events, single write might produce several of them.
+        data = b''
+        while True:
+            try:
+                chunk = os.read(self.__fd, 64 * 1024)
+            except OSError:
+                break
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def __is_file_event(self, data):
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+            if name == self.name:
+                return True
+        return False
+
+    def close(self):
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
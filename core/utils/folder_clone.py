@@ -0,0 +1,199 @@
+"""
+Fast copy of folders (copy-on-write clones and hard links with fallback to parallel copy).
+"""
+# pylint: disable=broad-except
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import os
+import shutil
+import sys
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl request of Linux reflink (see /usr/include/linux/fs.h)
+FICLONE = 0x40049409
+# Errors that mean reflinks are not supported between two file systems
+UNSUPPORTED_ERRORS = [errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS]
+
+
+class CloneResult(object):
+    """
+    Result of folder clone.
+    """
+
+    def __init__(self, source, target):
+        self.source = source
+        self.target = target
+        # Count of files cloned with each strategy ('clonefile', 'reflink', 'hardlink' and 'copy')
+        self.files = {}
+        self.bytes_copied = 0
+        self.bytes_saved = 0
+        self.duration = 0
+
+    @property
+    def strategy(self):
+        """
+        :return: Strategies used for the clone (for example 'reflink' or 'hardlink+copy').
+        """
+        return '+'.join(sorted(self.files.keys())) or 'none'
+
+    def add(self, strategy, size):
+        self.files[strategy] = self.files.get(strategy, 0) + 1
+        if strategy == 'copy':
+            self.bytes_copied += size
+        else:
+            self.bytes_saved += size
+
+    def __str__(self):
+        return 'Cloned {0} to {1} in {2:.2f}s (strategy: {3}, copied: {4} bytes, saved: {5} bytes)'.format(
+            self.source, self.target, self.duration, self.strategy, self.bytes_copied, self.bytes_saved)
+
+
+class FolderClone(object):
+    """
+    Clone folder with the cheapest available strategy:
+    1. Copy-on-write clone of whole tree (`clonefile` on macOS APFS).
+    2. Copy-on-write clone of each file (FICLONE ioctl on Linux Btrfs, XFS and other reflink capable file systems).
+    3. Hard link of immutable content (see `IMMUTABLE`), clone and source share the file, so it must not be edited.
+    4. Parallel byte copy.
+    """
+    # Patterns (of path parts) of content that is never modified in place by tests
+    IMMUTABLE = ['node_modules', '*.tgz']
+    MAX_WORKERS = 8
+
+    __unsupported = set()
+    __lock = threading.Lock()
+
+    @staticmethod
+    def clone(source, target, hardlink=True, max_workers=MAX_WORKERS):
+        """
+        Clone folder (target should not exist).
+        :param source: Source folder.
+        :param target: Target folder.
+        :param hardlink: If True hard link immutable content when copy-on-write clone is not supported.
+        :param max_workers: Max count of threads.
+        :return: CloneResult object.
+        """
+        start = time.time()
+        result = CloneResult(source=source, target=target)
+        # Support of strategies is remembered per pair of file systems
+        target_parent = os.path.dirname(os.path.abspath(target))
+        if not os.path.isdir(target_parent):
+            os.makedirs(target_parent)
+        devices = (os.stat(source).st_dev, os.stat(target_parent).st_dev)
+        if FolderClone.__clone_tree(source, target, devices):
+            size = sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(target)
+                       for name in files if not os.path.islink(os.path.join(root, name)))
+            result.files['clonefile'] = 1
+            result.bytes_saved = size
+        else:
+            files = FolderClone.__create_tree(source, target)
+            lock = threading.Lock()
+
+            def clone_file(item):
+                strategy, size = FolderClone.__clone_file(item[0], item[1], hardlink, devices)
+                with lock:
+                    result.add(strategy, size)
+
+            if max_workers > 1 and len(files) > 1:
+                pool = ThreadPool(processes=max_workers)
+                try:
+                    pool.map(clone_file, files)
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                for item in files:
+                    clone_file(item)
+        result.duration = time.time() - start
+        return result
+
+    @staticmethod
+    def __create_tree(source, target):
+        """
+        Create folders and symlinks of source in target.
+        :return: List of (source file, target file) tuples.
+        """
+        files = []
+        for root, dirs, names in os.walk(source):
+            target_root = os.path.join(target, os.path.relpath(root, source))
+            os.makedirs(target_root)
+            for name in dirs + names:
+                source_path = os.path.join(root, name)
+                if os.path.islink(source_path):
+                    # Keep symlinks (for example in node_modules/.bin) as symlinks
+                    os.symlink(os.readlink(source_path), os.path.join(target_root, name))
+                elif name in names:
+                    files.append((source_path, os.path.join(target_root, name)))
+            # Do not walk into symlinked folders (os.walk lists them in dirs)
+            dirs[:] = [name for name in dirs if not os.path.islink(os.path.join(root, name))]
+        return files
+
+    @staticmethod
+    def __is_immutable(path):
+        parts = path.replace('\\', '/').split('/')
+        return any(fnmatch.fnmatch(part, pattern) for part in parts for pattern in FolderClone.IMMUTABLE)
+
+    @staticmethod
+    def __clone_file(source, target, hardlink, devices):
+        size = os.path.getsize(source)
+        if FolderClone.__reflink(source, target, devices):
+            shutil.copystat(source, target)
+            return 'reflink', size
+        if hardlink and FolderClone.__is_supported('hardlink', devices) and FolderClone.__is_immutable(source):
+            try:
+                os.link(source, target)
+                return 'hardlink', size
+            except (OSError, AttributeError):
+                # Different file systems or hard links not supported
+                FolderClone.__set_unsupported('hardlink', devices)
+        shutil.copy2(source, target)
+        return 'copy', size
+
+    @staticmethod
+    def __reflink(source, target, devices):
+        if fcntl is None or not sys.platform.startswith('linux') or not FolderClone.__is_supported('reflink', devices):
+            return False
+        try:
+            with open(source, 'rb') as source_file:
+                with open(target, 'wb') as target_file:
+                    fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+            return True
+        except (IOError, OSError) as error:
+            if error.errno in UNSUPPORTED_ERRORS:
+                # File system does not support reflinks, do not try it again
+                FolderClone.__set_unsupported('reflink', devices)
+            if os.path.exists(target):
+                os.remove(target)
+            return False
+
+    @staticmethod
+    def __clone_tree(source, target, devices):
+        if sys.platform != 'darwin' or not FolderClone.__is_supported('clonefile', devices):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            encoding = sys.getfilesystemencoding()
+            if libc.clonefile(source.encode(encoding), target.encode(encoding), 0) == 0:
+                return True
+        except Exception:
+            pass
+        FolderClone.__set_unsupported('clonefile', devices)
+        return False
+
+    @staticmethod
+    def __is_supported(strategy, devices):
+        return (strategy, devices) not in FolderClone.__unsupported
+
+    @staticmethod
+    def __set_unsupported(strategy, devices):
+        with FolderClone.__lock:
+            FolderClone.__unsupported.add((strategy, devices))
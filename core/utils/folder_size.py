@@ -0,0 +1,210 @@
+"""
+Measure size of big folder trees (for example node_modules).
+"""
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+try:
+    from os import scandir
+except ImportError:
+    scandir = None
+
+
+class ListdirEntry(object):
+    """
+    Minimal replacement of os.DirEntry for Python 2 (where os.scandir is not available).
+    """
+
+    def __init__(self, folder, name):
+        self.name = name
+        self.path = os.path.join(folder, name)
+
+    def is_symlink(self):
+        return os.path.islink(self.path)
+
+    def is_dir(self, follow_symlinks=True):
+        if not follow_symlinks and self.is_symlink():
+            return False
+        return os.path.isdir(self.path)
+
+    def stat(self, follow_symlinks=True):
+        return os.stat(self.path) if follow_symlinks else os.lstat(self.path)
+
+
+class SizeInfo(object):
+    """
+    Result of folder size measurement.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.size = 0
+        self.files = 0
+        self.folders = 0
+        # Size of each direct child of the folder (files directly in the folder are counted as '.')
+        self.breakdown = {}
+
+    def __str__(self):
+        return '{0}: {1} bytes in {2} files and {3} folders'.format(self.folder, self.size, self.files, self.folders)
+
+
+class FolderSize(object):
+    """
+    Folder size engine based on os.scandir.
+
+    Folders of each level of the tree are scanned in parallel on thread pool (stat calls release GIL).
+    Optional cache remembers size of files directly in each folder and is valid while modification time of the folder
+    is the same. Notes: Modification time of folder is changed when files are added, removed or renamed,
+    but not when existing file is modified, so do not use cache for folders where files are edited in place.
+    """
+    MAX_WORKERS = 8
+
+    __cache = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def measure(folder, apparent=True, follow_symlinks=None, dedupe_hardlinks=False, use_cache=False,
+                max_workers=MAX_WORKERS):
+        """
+        Measure size of folder.
+        :param folder: Folder path.
+        :param apparent: If True count size of files, otherwise count allocated blocks (same as `du`).
+        :param follow_symlinks: None (default) counts symlinks to files with size of target and skips symlinks to
+        folders (same as `os.walk()` and `os.path.getsize()`), True follows symlinks to files and folders (each folder
+        is counted once), False counts size of symlinks themselves.
+        :param dedupe_hardlinks: If True count files with several hard links only once.
+        :param use_cache: If True use cache keyed by folder modification time.
+        :param max_workers: Max count of threads.
+        :return: SizeInfo object.
+        """
+        info = SizeInfo(folder=folder)
+        options = (apparent, follow_symlinks)
+        # Keys of hard linked files counted so far (None if hard links are not deduplicated)
+        seen_links = set() if dedupe_hardlinks else None
+        # Keys of visited folders (None if symlinks to folders are not followed)
+        visited = set() if follow_symlinks else None
+        # Frontier is list of (folder path, name of top level child of measured folder) tuples
+        frontier = [(folder, '.')]
+        if follow_symlinks and os.path.isdir(folder):
+            stat = os.stat(folder)
+            visited.add((stat.st_dev, stat.st_ino))
+        pool = ThreadPool(processes=max_workers) if max_workers > 1 else None
+        try:
+            while frontier:
+                if pool is not None and len(frontier) > 1:
+                    scans = pool.map(lambda item: FolderSize.__scan(item[0], options, use_cache), frontier)
+                else:
+                    scans = [FolderSize.__scan(item[0], options, use_cache) for item in frontier]
+                next_frontier = []
+                for (_, top), scan in zip(frontier, scans):
+                    next_frontier.extend(FolderSize.__merge(info, top, scan, seen_links, visited))
+                frontier = next_frontier
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return info
+
+    @staticmethod
+    def __merge(info, top, scan, seen_links, visited):
+        """
+        Add result of single folder scan to SizeInfo.
+        :param info: SizeInfo object.
+        :param top: Name of top level child of measured folder that contains scanned folder.
+        :param scan: Result of `__scan()`.
+        :param seen_links: Set of (dev, inode) of counted hard linked files (None if hard links are not deduplicated).
+        :param visited: Set of (dev, inode) of visited folders (None if symlinks to folders are not followed).
+        :return: List of (folder path, name of top level child of measured folder) tuples of sub-folders to scan.
+        """
+        size, files, links, folders = scan
+        for key, link_size in links:
+            if seen_links is not None:
+                if key in seen_links:
+                    continue
+                seen_links.add(key)
+            size += link_size
+        info.size += size
+        info.files += files
+        info.breakdown[top] = info.breakdown.get(top, 0) + size
+        children = []
+        for path, key in folders:
+            if visited is not None:
+                # Symlinks might create cycles, visit each folder only once
+                if key in visited:
+                    continue
+                visited.add(key)
+            info.folders += 1
+            child_top = os.path.basename(path) if top == '.' else top
+            info.breakdown.setdefault(child_top, 0)
+            children.append((path, child_top))
+        return children
+
+    @staticmethod
+    def clear_cache():
+        with FolderSize.__lock:
+            FolderSize.__cache.clear()
+
+    @staticmethod
+    def __scan(folder, options, use_cache):
+        """
+        Scan single folder (not recursive).
+        :return: Tuple (size of files, count of files, list of ((dev, inode), size) of files with several hard links,
+        list of (path, (dev, inode)) of sub-folders).
+        """
+        mtime = None
+        if use_cache:
+            try:
+                mtime = os.stat(folder).st_mtime
+            except OSError:
+                return 0, 0, [], []
+            with FolderSize.__lock:
+                cached = FolderSize.__cache.get((folder, options))
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        result = FolderSize.__scan_entries(folder, options)
+        if use_cache:
+            with FolderSize.__lock:
+                FolderSize.__cache[(folder, options)] = (mtime, result)
+        return result
+
+    @staticmethod
+    def __scan_entries(folder, options):
+        apparent, follow_symlinks = options
+        size = 0
+        files = 0
+        links = []
+        folders = []
+        try:
+            if scandir is not None:
+                entries = list(scandir(folder))
+            else:
+                entries = [ListdirEntry(folder, name) for name in os.listdir(folder)]
+        except OSError:
+            # Folder is removed or not readable
+            return size, files, links, folders
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=bool(follow_symlinks)):
+                    stat = entry.stat(follow_symlinks=True) if follow_symlinks else None
+                    folders.append((entry.path, (stat.st_dev, stat.st_ino) if stat is not None else None))
+                    continue
+                if follow_symlinks is None and entry.is_symlink():
+                    if entry.is_dir(follow_symlinks=True):
+                        continue
+                    stat = entry.stat(follow_symlinks=True)
+                else:
+                    stat = entry.stat(follow_symlinks=bool(follow_symlinks))
+            except OSError:
+                # Broken symlink or file removed while scanning
+                continue
+            files += 1
+            file_size = stat.st_size
+            if not apparent and getattr(stat, 'st_blocks', None) is not None:
+                # st_blocks is always in 512 bytes units (it is not available on Windows)
+                file_size = stat.st_blocks * 512
+            if stat.st_nlink > 1 and stat.st_ino:
+                links.append(((stat.st_dev, stat.st_ino), file_size))
+            else:
+                size += file_size
+        return size, files, links, folders
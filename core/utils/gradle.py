@@ -15,11 +15,16 @@ class Gradle(object):
     @staticmethod
     def kill():
         Log.info("Kill gradle processes.")
+        Process.kill_all(patterns=Gradle.kill_patterns())
+
+    @staticmethod
+    def kill_patterns():
+        """
+        Get patterns of gradle processes (see `Process.kill_all()`).
+        """
         if Settings.HOST_OS is OSType.WINDOWS:
-            Process.kill(proc_name='java.exe', proc_cmdline='gradle')
-        else:
-            command = "ps -ef  | grep '.gradle/wrapper' | grep -v grep | awk '{ print $2 }' | xargs kill -9"
-            run(cmd=command)
+            return [('java.exe', 'gradle')]
+        return [(None, '.gradle/wrapper')]
 
     @staticmethod
     def cache_clean():
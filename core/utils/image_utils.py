@@ -16,50 +16,100 @@ import pytesseract
 from PIL import Image
 
 from core.settings import Settings
+from core.utils.color_histogram import ColorHistogram
+from core.utils.screen_mask import ScreenMasks
 
 
 class ImageUtils(object):
+    # Rows compared at once by image_match (it stops after first tile over tolerance when early_exit is used)
+    TILE_ROWS = 64
+    # Downscale factor of pre-check of image_match
+    PRE_CHECK_FACTOR = 8
+
     @staticmethod
-    def image_match(actual_image, expected_image, tolerance=0.05):
+    def image_match(actual_image, expected_image, tolerance=0.05, mask=None, early_exit=False):
         """
         Compare two images.
+        Pixel is different if sums of its RGB values differ by more than 30.
         :param actual_image: Path to actual image.
         :param expected_image: Path to expected image.
         :param tolerance: Tolerance in percents.
+        :param mask: ScreenMask object (default is `ScreenMasks.DEFAULT`, which ignores top 40 rows).
+        :param early_exit: If True stop as soon as diff is over tolerance, in this case diff_percent is only
+        lower bound of the diff and diff_image is None.
         :return: match (boolean value), diff_percent (diff %), diff_image (diff image)
         """
-        # pylint: disable=too-many-instance-attributes
-        actual_image = Image.open(actual_image)
-        actual_pixels = actual_image.load()
-        expected_image = Image.open(expected_image)
-        expected_pixels = expected_image.load()
+        actual_image = ImageUtils.__open_rgb(actual_image)
+        expected_image = ImageUtils.__open_rgb(expected_image)
         width, height = expected_image.size
-
         total_pixels = width * height
+        compare = (mask or ScreenMasks.DEFAULT).to_array(width=width, height=height)
+        # Images do not match when count of different pixels reaches the budget
+        budget = tolerance * total_pixels / 100.0
+
+        if early_exit:
+            min_diff_pixels = ImageUtils.__get_min_diff_pixels(actual_image, expected_image, compare)
+            if min_diff_pixels >= budget:
+                return False, 100 * float(min_diff_pixels) / total_pixels, None
+
+        actual_pixels = numpy.asarray(actual_image)[:height, :width, :3]
+        expected_pixels = numpy.asarray(expected_image)[:, :, :3]
+        diff_mask = numpy.zeros((height, width), dtype=bool)
         diff_pixels = 0
-        match = False
-        diff_image = actual_image.copy()
-        for x in range(0, width):
-            for y in range(40, height):
-                actual_pixel = actual_pixels[x, y]
-                expected_pixel = expected_pixels[x, y]
-                if actual_pixel != expected_pixel:
-                    actual_r = actual_pixel[0]
-                    actual_g = actual_pixel[1]
-                    actual_b = actual_pixel[2]
-                    expected_r = expected_pixel[0]
-                    expected_g = expected_pixel[1]
-                    expected_b = expected_pixel[2]
-                    if abs(actual_r + actual_g + actual_b - expected_r - expected_g - expected_b) > 30:
-                        diff_pixels += 1
-                        diff_image.load()[x, y] = (255, 0, 0)
+        for top in range(0, height, ImageUtils.TILE_ROWS):
+            rows = slice(top, min(top + ImageUtils.TILE_ROWS, height))
+            # Sum in int32, so uint8 channels do not overflow
+            actual_sums = actual_pixels[rows].sum(axis=2, dtype=numpy.int32)
+            expected_sums = expected_pixels[rows].sum(axis=2, dtype=numpy.int32)
+            tile_mask = (numpy.abs(actual_sums - expected_sums) > 30) & compare[rows]
+            diff_mask[rows] = tile_mask
+            diff_pixels += int(numpy.count_nonzero(tile_mask))
+            if early_exit and diff_pixels >= budget:
+                return False, 100 * float(diff_pixels) / total_pixels, None
+
+        # Diff image is copy of actual image with different pixels marked in red
+        diff_array = numpy.array(actual_image)
+        diff_region = diff_array[:height, :width]
+        diff_region[diff_mask, 0] = 255
+        diff_region[diff_mask, 1:3] = 0
+        if diff_array.shape[2] == 4:
+            diff_region[diff_mask, 3] = 255
+        diff_image = Image.fromarray(diff_array, actual_image.mode)
 
         diff_percent = 100 * float(diff_pixels) / total_pixels
-        if diff_percent < tolerance:
-            match = True
-
+        match = diff_percent < tolerance
         return match, diff_percent, diff_image
 
+    @staticmethod
+    def __get_min_diff_pixels(actual_image, expected_image, compare):
+        """
+        Cheap pre-check on downscaled images.
+        Average of pixel deltas in a block is delta of block averages. If it is `m`, at least `n * (m - 30) / 735`
+        of `n` pixels in the block differ by more than 30 (other pixels differ by 30 and less, none by more than 765).
+        :return: Lower bound of count of different pixels.
+        """
+        factor = ImageUtils.PRE_CHECK_FACTOR
+        width, height = expected_image.size
+        columns, rows = width // factor, height // factor
+        if columns == 0 or rows == 0 or not hasattr(Image.Image, 'reduce'):
+            return 0
+        box = (0, 0, columns * factor, rows * factor)
+        actual_small = numpy.asarray(actual_image.convert('RGB').crop(box).reduce(factor), dtype=numpy.float64)
+        expected_small = numpy.asarray(expected_image.convert('RGB').crop(box).reduce(factor), dtype=numpy.float64)
+        # Averages of channels are rounded to int, so sum of three channels of two images might be off by 3
+        block_diff = numpy.abs(actual_small.sum(axis=2) - expected_small.sum(axis=2)) - 33
+        blocks = compare[:rows * factor, :columns * factor].reshape(rows, factor, columns, factor)
+        block_compared = blocks.all(axis=(1, 3))
+        min_pixels = numpy.ceil(factor * factor * block_diff / 735.0)
+        return int(min_pixels[block_compared & (block_diff > 0)].sum())
+
+    @staticmethod
+    def __open_rgb(image_path):
+        image = Image.open(image_path)
+        if image.mode not in ['RGB', 'RGBA']:
+            image = image.convert('RGB')
+        return image
+
     @staticmethod
     def read_image(image_path):
         """
@@ -78,30 +128,12 @@ class ImageUtils(object):
         :param rdb_tolerance If diff of sums of rgb values is less then specified count pixels will be counted as equal.
         :return: Count of pixels.
         """
-        img = ImageUtils.read_image(image_path=image_path)
-        colors, counts = numpy.unique(img.reshape(-1, 3), axis=0, return_counts=True)
-        max_count = 0
-        for n_color, count in zip(colors, counts):
-            # noinspection PyUnresolvedReferences
-            b_diff = abs(n_color[0] - color[0])
-            g_diff = abs(n_color[1] - color[1])
-            r_diff = abs(n_color[2] - color[2])
-            if b_diff < rdb_tolerance and g_diff < rdb_tolerance and r_diff < rdb_tolerance:
-                if count > max_count:
-                    max_count = count
-        return max_count
+        histogram = ColorHistogram.from_file(image_path)
+        return histogram.get_pixels_by_color(color=color, rdb_tolerance=rdb_tolerance)
 
     @staticmethod
     def get_main_color(image_path):
-        img = ImageUtils.read_image(image_path=image_path)
-        colors, counts = numpy.unique(img.reshape(-1, 3), axis=0, return_counts=True)
-        max_count = 0
-        main_color = None
-        for color, count in zip(colors, counts):
-            if count > max_count:
-                max_count = count
-                main_color = color
-        return main_color
+        return ColorHistogram.from_file(image_path).get_main_color()
 
     @staticmethod
     def get_text(image_path, use_cv2=True):
@@ -1,12 +1,14 @@
 """
 A wrapper around java.
 """
+from core.utils.probe_cache import ProbeCache
 from core.utils.run import run
 from core.utils.version import Version
 
 
 class Java(object):
     @staticmethod
+    @ProbeCache.cached('java.version', disk=True)
     def version():
         """
         Java version.
@@ -0,0 +1,103 @@
+"""
+Incremental reader of growing log files.
+"""
+import codecs
+import os
+
+from core.settings import Settings
+
+
+class LogTail(object):
+    """
+    Read only bytes appended to a file since previous read.
+    """
+
+    def __init__(self, path, offset=0):
+        """
+        Init reader.
+        :param path: Path to file.
+        :param offset: Byte offset where reading starts.
+        """
+        self.path = path
+        self.offset = offset
+        self.__decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+
+    def read(self):
+        """
+        Read text appended since previous read.
+        Multi-byte chars split between two reads are decoded once all their bytes are available
+        (`offset` always points to char boundary, so it is safe to create new reader with it).
+        :return: New text (empty string if file does not exist or nothing is appended).
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return ''
+        if size < self.offset:
+            # File is truncated or recreated, start from the beginning.
+            self.offset = 0
+        if size == self.offset:
+            return ''
+        with open(self.path, 'rb') as log:
+            log.seek(self.offset)
+            data = log.read(size - self.offset)
+        text = self.__decoder.decode(data)
+        pending = self.__decoder.getstate()[0]
+        self.__decoder.reset()
+        self.offset += len(data) - len(pending)
+        if Settings.PYTHON_VERSION < 3:
+            return text.encode('utf8')
+        return text
+
+
+class LogCursor(object):
+    """
+    Position (byte offset) in a log file.
+    Cursors are cheap, several independent cursors can be used on the same log (see `clone()`).
+    """
+
+    def __init__(self, log_file, offset=0):
+        """
+        Init cursor.
+        :param log_file: Path to log file.
+        :param offset: Byte offset (0 means beginning of the log).
+        """
+        self.log_file = log_file
+        self.offset = offset
+
+    def tail(self):
+        """
+        :return: LogTail object that reads the log from cursor position.
+        """
+        return LogTail(path=self.log_file, offset=self.offset)
+
+    def peek(self):
+        """
+        Get text written after cursor position (cursor is not moved).
+        :return: Text.
+        """
+        return self.tail().read()
+
+    def read(self):
+        """
+        Get text written after cursor position and move the cursor to the end of the log.
+        :return: Text.
+        """
+        tail = self.tail()
+        text = tail.read()
+        self.offset = tail.offset
+        return text
+
+    def checkpoint(self):
+        """
+        Move cursor to the end of the log.
+        :return: Self.
+        """
+        self.read()
+        return self
+
+    def clone(self):
+        """
+        :return: New LogCursor object at the same position (moving it does not affect this cursor).
+        """
+        return LogCursor(log_file=self.log_file, offset=self.offset)
@@ -6,7 +6,8 @@ import os
 from core.log.log import Log
 from core.settings import Settings
 from core.utils.file_utils import File
-from core.utils.run import run
+from core.utils.probe_cache import ProbeCache
+from core.utils.run import run, run_all, get_async_engine
 from core.utils.version import Version
 
 
@@ -20,11 +21,22 @@ class Npm(object):
             assert result.exit_code == 0, '" + command + " exited with non zero exit code!: \n' + result.output
         return result.output.strip()
 
+    @staticmethod
+    def run_npm_command_async(cmd, folder=Settings.TEST_RUN_HOME):
+        """
+        Same as `run_npm_command(verify=False)`, but returns awaitable of ProcessInfo (Python 3 only).
+        """
+        run_async = get_async_engine().run_async
+        command = 'npm {0}'.format(cmd).strip()
+        Log.info(command + " (at " + str(folder) + ").")
+        return run_async(cmd=command, cwd=folder, timeout=300)
+
     @staticmethod
     def cache_clean():
         Npm.run_npm_command(cmd='cache clean -f')
 
     @staticmethod
+    @ProbeCache.cached('npm.version', disk=True)
     def version():
         version = Npm.run_npm_command(cmd='-v')
         return Version.get(version)
@@ -65,3 +77,14 @@ class Npm(object):
     @staticmethod
     def get_version(package):
         return Npm.run_npm_command('show {0} version'.format(package))
+
+    @staticmethod
+    def get_versions(packages):
+        """
+        Get versions of multiple packages (npm commands are executed concurrently).
+        :param packages: List of packages (for example ['tns-core-modules@next', 'tns-android@rc']).
+        :return: Dict with packages as keys and versions as values.
+        """
+        commands = ['npm show {0} version'.format(package) for package in packages]
+        results = run_all(commands=commands, timeout=300)
+        return dict((package, result.output.strip()) for package, result in zip(packages, results))
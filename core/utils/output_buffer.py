@@ -0,0 +1,84 @@
+"""
+Bounded buffer for output of long living commands.
+"""
+import collections
+import threading
+
+
+class OutputBuffer(object):
+    """
+    Keep the tail of command output in memory and spill the full output to file once it gets too big.
+    """
+
+    def __init__(self, max_size=1024 * 1024, spill_size=4 * 1024 * 1024, spill_file=None):
+        """
+        Init buffer.
+        :param max_size: Max count of chars kept in memory (older chunks are dropped once the limit is reached).
+        :param spill_size: When total output exceeds this size it is written to `spill_file` (None disables spill).
+        :param spill_file: Path to file where complete output is stored once `spill_size` is exceeded.
+        """
+        self.max_size = max_size
+        self.spill_size = spill_size
+        self.spill_file = spill_file
+        self.spilled = False
+        self.total_size = 0
+        self.__size = 0
+        self.__chunks = collections.deque()
+        self.__pending = []
+        self.__lock = threading.Lock()
+
+    def write(self, text):
+        """
+        Append text to the buffer.
+        :param text: Text (usually single line of output).
+        """
+        if not text:
+            return
+        with self.__lock:
+            self.total_size += len(text)
+            self.__chunks.append(text)
+            self.__size += len(text)
+            while self.__size > self.max_size and len(self.__chunks) > 1:
+                self.__size -= len(self.__chunks.popleft())
+            self.__spill(text)
+
+    def get_text(self):
+        """
+        Get text kept in memory (the tail of the output if part of it is dropped).
+        :return: Text as string.
+        """
+        with self.__lock:
+            return ''.join(self.__chunks)
+
+    def is_truncated(self):
+        """
+        :return: True if part of the output is not available in memory anymore.
+        """
+        return self.total_size > self.__size
+
+    def close(self):
+        """
+        Flush pending output to spill file (if output is spilled).
+        """
+        with self.__lock:
+            self.__flush()
+
+    def __spill(self, text):
+        if self.spill_file is None or self.spill_size is None:
+            return
+        self.__pending.append(text)
+        if not self.spilled:
+            if self.total_size <= self.spill_size:
+                return
+            # Threshold exceeded, dump everything received so far (including chunks already dropped from memory).
+            self.spilled = True
+            self.__flush()
+        elif len(self.__pending) >= 100:
+            self.__flush()
+
+    def __flush(self):
+        if not self.spilled or not self.__pending:
+            return
+        with open(self.spill_file, mode='ab') as spill:
+            spill.write(''.join(self.__pending).encode('utf-8'))
+        self.__pending = []
@@ -1,7 +1,12 @@
+import math
+
 from core.log.log import Log
 
 
 class PerfUtils(object):
+    # Exponents returned by get_marginal_scaling_exponent() are capped
+    MAX_SCALING_EXPONENT = 5.0
+
     @staticmethod
     def is_value_in_range(actual, expected, tolerance=0.25):
         """
@@ -28,3 +33,136 @@ class PerfUtils(object):
         for _ in range(0, retry_count):
             total_time = total_time + operation(*args, **kwargs).duration
         return total_time / retry_count
+
+    @staticmethod
+    def get_average_resources(operation, retry_count=3, *args, **kwargs):
+        """
+        Get average resource usage of Run.command(profile=True) operation.
+        :param operation: lambda function that returns ProcessInfo object with resources
+        (for example Run.command("ls", profile=True)).
+        :param retry_count: Retry count.
+        :param args:
+        :param kwargs:
+        :return: Dict with average duration, peak_rss, cpu_user, cpu_system, read_bytes, write_bytes, peak_threads
+        and peak_processes.
+        """
+        total = {}
+        for _ in range(0, retry_count):
+            result = operation(*args, **kwargs)
+            assert result.resources is not None, 'Resources not recorded, please run the command with profile=True.'
+            for key, value in result.resources.to_dict().items():
+                total[key] = total.get(key, 0) + value
+        return dict((key, value / float(retry_count)) for key, value in total.items())
+
+    @staticmethod
+    def is_value_below(actual, limit, tolerance=0.25):
+        """
+        Check if value is not bigger than limit (useful for memory and CPU usage, where less is always better).
+        :param actual: Number value.
+        :param limit: Number value.
+        :param tolerance: Tolerance as percent.
+        """
+        Log.info("Actual value: " + str(actual))
+        Log.info("Limit: " + str(limit))
+        return actual <= limit + (limit * tolerance)
+
+    @staticmethod
+    def get_percentile(values, percentile):
+        """
+        Get percentile of values (linear interpolation between closest ranks).
+        :param values: List of numbers.
+        :param percentile: Percentile (0-100).
+        :return: Number (None if values are empty).
+        """
+        if not values:
+            return None
+        ordered = sorted(values)
+        rank = (len(ordered) - 1) * percentile / 100.0
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    @staticmethod
+    def get_latency_stats(values):
+        """
+        Get summary of latencies.
+        :param values: List of numbers (seconds).
+        :return: Dict with p50, p95 and max.
+        """
+        return {'p50': PerfUtils.get_percentile(values, 50), 'p95': PerfUtils.get_percentile(values, 95),
+                'max': max(values) if values else None}
+
+    @staticmethod
+    def get_scaling_exponent(sizes, values):
+        """
+        Get exponent k of best fit `value = c * size^k` (slope of least squares line in log-log scale).
+        Exponent close to 1 means linear scaling, bigger than 1 means super-linear scaling.
+        :param sizes: List of sizes (positive numbers).
+        :param values: List of measured values (positive numbers), same length as sizes.
+        :return: Number (None if there are less than two different sizes).
+        """
+        points = [(math.log(size), math.log(value)) for size, value in zip(sizes, values) if size > 0 and value > 0]
+        if len(set(x for x, _ in points)) < 2:
+            return None
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+        variance = sum((x - mean_x) ** 2 for x, _ in points)
+        return covariance / variance
+
+    @staticmethod
+    def get_marginal_scaling_exponent(sizes, samples, min_signal=3.0, confidence=3.0, step=0.05):
+        """
+        Get lower bound of exponent k of `value = a + c * size^k` (fixed cost `a` hides super-linear growth in
+        `get_scaling_exponent()`, so it is fitted as well).
+        Fit uses medians of samples, each median may differ from the model by `confidence` times its standard error
+        (estimated from spread of all samples), so noise alone can not produce big exponent.
+        :param sizes: List of sizes (at least three different sizes are needed).
+        :param samples: List of lists of values measured several times for each size, same length as sizes.
+        :param min_signal: Size dependent part (median of biggest size minus median of smallest size) should be
+        `min_signal` times bigger than spread of samples of single size, otherwise it is treated as noise.
+        :param confidence: Allowed difference of medians and the model in standard errors.
+        :param step: Step of exponent search.
+        :return: Number (None if size dependent part can not be distinguished from noise).
+        """
+        points = sorted(zip(sizes, samples))
+        if len(set(size for size, _ in points)) < 3 or min(len(values) for _, values in points) < 2:
+            return None
+        medians = [PerfUtils.get_percentile(values, 50) for _, values in points]
+        spread = max(max(values) - min(values) for _, values in points)
+        if medians[-1] - medians[0] <= min_signal * spread:
+            return None
+
+        # Pooled standard deviation of samples, standard error of median is about 1.25 * sigma / sqrt(n)
+        deviations = 0.0
+        for _, values in points:
+            mean = sum(values) / float(len(values))
+            deviations += sum((value - mean) ** 2 for value in values)
+        sigma = math.sqrt(deviations / sum(len(values) - 1 for _, values in points))
+        tolerance = confidence * 1.2533 * sigma / math.sqrt(min(len(values) for _, values in points))
+
+        base = float(points[0][0])
+        exponent = 0.0
+        while exponent < PerfUtils.MAX_SCALING_EXPONENT:
+            if PerfUtils.__fits([(size / base) ** exponent for size, _ in points], medians, tolerance):
+                return round(exponent, 2)
+            exponent += step
+        return PerfUtils.MAX_SCALING_EXPONENT
+
+    @staticmethod
+    def __fits(xs, ys, tolerance):
+        """
+        Check if there is line `y = a + c * x` (c >= 0) not farther than tolerance from all points.
+        Width of residuals `y - c * x` is convex piecewise linear function of c, so minimum is at c = 0 or at slope
+        of line through two of the points.
+        """
+        slopes = [0.0]
+        for i in range(len(xs)):
+            for j in range(i + 1, len(xs)):
+                if xs[i] != xs[j] and (ys[i] - ys[j]) / (xs[i] - xs[j]) > 0:
+                    slopes.append((ys[i] - ys[j]) / (xs[i] - xs[j]))
+        for slope in slopes:
+            residuals = [y - slope * x for x, y in zip(xs, ys)]
+            if max(residuals) - min(residuals) <= 2 * tolerance:
+                return True
+        return False
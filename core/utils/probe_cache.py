@@ -0,0 +1,167 @@
+"""
+Cache for results of environment probes (versions of tools, device properties, etc.).
+"""
+# pylint: disable=broad-except
+import functools
+import json
+import os
+import threading
+import time
+
+from core.log.log import Log
+from core.settings import Settings
+
+
+class ProbeCache(object):
+    """
+    Process wide cache with TTL and optional disk layer.
+
+    Disk layer is enabled by `PROBE_CACHE_FILE` environment variable and is shared by all processes of the CI run
+    (only probes registered with disk=True are persisted, their values should be json serializable).
+    """
+    DEFAULT_TTL = 600
+    DISK_FILE = Settings.PROBE_CACHE_FILE
+    DISK_TTL = Settings.PROBE_CACHE_TTL
+
+    hits = 0
+    misses = 0
+    __entries = {}
+    __lock = threading.RLock()
+
+    @staticmethod
+    def get(key, probe, ttl=DEFAULT_TTL, disk=False):
+        """
+        Get cached value or execute probe and cache the result.
+        :param key: Cache key.
+        :param probe: Function without arguments that returns the value.
+        :param ttl: Time to live of in-memory value (in seconds).
+        :param disk: If True also use disk layer (if enabled).
+        :return: Value (empty values like None, '' or {} are returned, but not cached).
+        """
+        now = time.time()
+        with ProbeCache.__lock:
+            entry = ProbeCache.__entries.get(key)
+            if entry is None and disk:
+                entry = ProbeCache.__read_disk(key=key, now=now)
+                if entry is not None:
+                    ProbeCache.__entries[key] = entry
+            if entry is not None and entry[0] > now:
+                ProbeCache.hits += 1
+                return entry[1]
+            ProbeCache.misses += 1
+
+        # Execute probe outside of the lock, probes are slow and other keys should not wait for it.
+        value = probe()
+        if ProbeCache.__is_empty(value):
+            # Failed probes usually return None or empty output, do not remember failures until TTL expires.
+            Log.debug('Probe {0} returned empty value, it is not cached.'.format(key))
+            return value
+        with ProbeCache.__lock:
+            ProbeCache.__entries[key] = (time.time() + ttl, value)
+            if disk:
+                ProbeCache.__write_disk(key=key, value=value)
+        return value
+
+    @staticmethod
+    def invalidate(prefix=None):
+        """
+        Remove cached values (both in-memory and disk).
+        :param prefix: Remove only keys that start with prefix (remove all if None).
+        """
+        with ProbeCache.__lock:
+            for key in list(ProbeCache.__entries.keys()):
+                if prefix is None or key.startswith(prefix):
+                    del ProbeCache.__entries[key]
+            disk = ProbeCache.__load_disk()
+            if disk:
+                for key in list(disk.keys()):
+                    if prefix is None or key.startswith(prefix):
+                        del disk[key]
+                ProbeCache.__save_disk(disk)
+        Log.debug('Probe cache invalidated (prefix: {0}).'.format(prefix))
+
+    @staticmethod
+    def stats():
+        """
+        :return: Dict with hits, misses and count of cached entries.
+        """
+        with ProbeCache.__lock:
+            return {'hits': ProbeCache.hits, 'misses': ProbeCache.misses, 'entries': len(ProbeCache.__entries)}
+
+    @staticmethod
+    def reset_stats():
+        with ProbeCache.__lock:
+            ProbeCache.hits = 0
+            ProbeCache.misses = 0
+
+    @staticmethod
+    def cached(name, ttl=DEFAULT_TTL, disk=False):
+        """
+        Decorator that caches results of a probe function.
+        Cache key is `name` plus arguments of the call, so `invalidate(prefix=name)` invalidates all calls.
+        :param name: Name of the probe.
+        :param ttl: Time to live of in-memory value (in seconds).
+        :param disk: If True also use disk layer (if enabled).
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = name
+                if args or kwargs:
+                    key = '{0}:{1}:{2}'.format(name, ','.join(str(arg) for arg in args),
+                                               ','.join('{0}={1}'.format(k, kwargs[k]) for k in sorted(kwargs)))
+                return ProbeCache.get(key=key, probe=lambda: func(*args, **kwargs), ttl=ttl, disk=disk)
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def __is_empty(value):
+        if value is None:
+            return True
+        try:
+            return len(value) == 0
+        except TypeError:
+            return False
+
+    @staticmethod
+    def __read_disk(key, now):
+        entry = ProbeCache.__load_disk().get(key)
+        if entry is None or entry['expires'] <= now:
+            return None
+        return entry['expires'], entry['value']
+
+    @staticmethod
+    def __write_disk(key, value):
+        if ProbeCache.DISK_FILE is None:
+            return
+        disk = ProbeCache.__load_disk()
+        disk[key] = {'expires': time.time() + ProbeCache.DISK_TTL, 'value': value}
+        ProbeCache.__save_disk(disk)
+
+    @staticmethod
+    def __load_disk():
+        if ProbeCache.DISK_FILE is None or not os.path.isfile(ProbeCache.DISK_FILE):
+            return {}
+        try:
+            with open(ProbeCache.DISK_FILE, 'r') as cache_file:
+                return json.load(cache_file)
+        except Exception:
+            Log.debug('Failed to read probe cache {0}.'.format(ProbeCache.DISK_FILE))
+            return {}
+
+    @staticmethod
+    def __save_disk(disk):
+        # Write to temp file and rename, so parallel runs never read half written file.
+        temp_file = '{0}.{1}.tmp'.format(ProbeCache.DISK_FILE, os.getpid())
+        try:
+            with open(temp_file, 'w') as cache_file:
+                json.dump(disk, cache_file)
+            if os.name == 'nt' and os.path.isfile(ProbeCache.DISK_FILE):
+                # os.rename can not overwrite files on Windows (and os.replace is not available on Python 2).
+                os.remove(ProbeCache.DISK_FILE)
+            os.rename(temp_file, ProbeCache.DISK_FILE)
+        except Exception:
+            Log.debug('Failed to write probe cache {0}.'.format(ProbeCache.DISK_FILE))
@@ -2,6 +2,7 @@
 # pylint: disable=broad-except
 import logging
 import os
+import signal
 import time
 
 import psutil
@@ -10,6 +11,113 @@ from core.base_test.test_context import TestContext
 from core.enums.os_type import OSType
 from core.log.log import Log
 from core.settings import Settings
+from core.utils.wait import Wait
+
+
+# noinspection PyBroadException
+class ProcessSnapshot(object):
+    """
+    Index of running processes collected in single pass over the process table.
+    """
+
+    def __init__(self, ports=False):
+        """
+        Collect name, commandline and parent pid of all running processes.
+        :param ports: If True also collect local ports of inet connections of each process.
+        """
+        self.processes = []
+        self.ports = {}
+        for proc in psutil.process_iter(attrs=['pid', 'name', 'cmdline', 'ppid']):
+            info = proc.info
+            info['name'] = str(info['name'] or '')
+            info['cmdline'] = str(info['cmdline'] or [])
+            self.processes.append(proc)
+        if ports:
+            self.__collect_ports()
+
+    def __collect_ports(self):
+        try:
+            connections = psutil.net_connections(kind='inet')
+            for connection in connections:
+                if connection.pid is not None and connection.laddr:
+                    self.ports.setdefault(connection.pid, set()).add(connection.laddr.port)
+        except psutil.AccessDenied:
+            # System wide connections require root on macOS, fallback to connections of each process
+            for proc in self.processes:
+                try:
+                    for connection in proc.connections(kind='inet'):
+                        if connection.laddr:
+                            self.ports.setdefault(proc.pid, set()).add(connection.laddr.port)
+                except Exception:
+                    continue
+
+    @staticmethod
+    def __normalize_name(proc_name):
+        if proc_name is not None and Settings.HOST_OS is OSType.WINDOWS and not proc_name.endswith('.exe'):
+            proc_name += '.exe'
+        return proc_name
+
+    @staticmethod
+    def __is_match(proc, proc_name=None, proc_cmdline=None):
+        name = proc.info['name']
+        cmdline = proc.info['cmdline']
+        if proc_name is not None:
+            if proc_name != name:
+                return False
+            if Settings.HOST_OS == OSType.WINDOWS:
+                cmdline = cmdline.replace('\\\\', '\\')
+        return proc_cmdline is None or proc_cmdline in cmdline
+
+    def find(self, proc_name=None, proc_cmdline=None):
+        """
+        Find processes.
+        :param proc_name: Exact name of the process (None matches any name).
+        :param proc_cmdline: Sub string of process commandline (None matches any commandline).
+        :return: List of psutil.Process objects.
+        """
+        proc_name = ProcessSnapshot.__normalize_name(proc_name)
+        return [proc for proc in self.processes if ProcessSnapshot.__is_match(proc, proc_name, proc_cmdline)]
+
+    def find_all(self, patterns):
+        """
+        Find processes that match any of the patterns.
+        :param patterns: List of (proc_name, proc_cmdline) tuples (see `find()`).
+        :return: List of (psutil.Process, pattern) tuples.
+        """
+        patterns = [(ProcessSnapshot.__normalize_name(name), cmdline) for name, cmdline in patterns]
+        matches = []
+        for proc in self.processes:
+            for pattern in patterns:
+                if ProcessSnapshot.__is_match(proc, pattern[0], pattern[1]):
+                    matches.append((proc, pattern))
+                    break
+        return matches
+
+    def find_by_port(self, port):
+        """
+        Find processes listening on port (requires snapshot created with ports=True).
+        :param port: Port as int.
+        :return: List of psutil.Process objects.
+        """
+        return [proc for proc in self.processes if port in self.ports.get(proc.pid, ())]
+
+    def children(self, pid):
+        """
+        Get all descendants of process.
+        :param pid: Process id.
+        :return: List of psutil.Process objects.
+        """
+        result = []
+        parents = set([pid])
+        found = True
+        while found:
+            found = False
+            for proc in self.processes:
+                if proc.info['ppid'] in parents and proc.pid not in parents:
+                    parents.add(proc.pid)
+                    result.append(proc)
+                    found = True
+        return result
 
 
 # noinspection PyBroadException,PyUnusedLocal
@@ -27,12 +135,10 @@ class Process(object):
         """
         Check if process is running.
         """
-        result = False
-        for proc in psutil.process_iter():
-            if proc_name in str(proc):
-                result = True
-                break
-        return result
+        for proc in ProcessSnapshot().processes:
+            if proc_name in proc.info['name']:
+                return True
+        return False
 
     @staticmethod
     def is_running_by_commandline(commandline):
@@ -49,17 +155,10 @@ class Process(object):
         :param commandline: Sub string of process commandline.
         :return: Process.
         """
-        result = None
-        for proc in psutil.process_iter():
-            cmdline = ""
-            try:
-                cmdline = str(proc.cmdline())
-            except Exception:
-                continue
-            if commandline in cmdline:
-                result = proc
-                break
-        return result
+        processes = ProcessSnapshot().find(proc_cmdline=commandline)
+        if processes:
+            return processes[0]
+        return None
 
     @staticmethod
     def wait_until_running(proc_name, timeout=60):
@@ -69,74 +168,51 @@ class Process(object):
         :param timeout: Timeout in seconds.
         :return: True if running, false if not running.
         """
-        running = False
-        end_time = time.time() + timeout
-        while not running:
-            time.sleep(5)
-            running = Process.is_running_by_name(proc_name)
-            if running:
-                running = True
-                break
-            if (running is False) and (time.time() > end_time):
-                error = "{0} not running in {1} seconds.", proc_name, timeout
-                raise Exception(error)
+        running = Wait.until_adaptive(lambda: Process.is_running_by_name(proc_name), timeout=timeout, period=5)
+        if not running:
+            raise Exception('{0} not running in {1} seconds.'.format(proc_name, timeout))
         return running
 
     @staticmethod
     def kill(proc_name, proc_cmdline=None):
-        if Settings.HOST_OS is OSType.WINDOWS:
-            proc_name += ".exe"
-        result = False
-        for proc in psutil.process_iter():
-            name = ""
-            cmdline = ""
-            try:
-                name = str(proc.name())
-                cmdline = str(proc.cmdline())
-            except Exception:
-                continue
-            if proc_name == name:
-                if Settings.HOST_OS == OSType.WINDOWS:
-                    cmdline = cmdline.replace('\\\\', '\\')
-                if (proc_cmdline is None) or (proc_cmdline is not None and proc_cmdline in cmdline):
-                    try:
-                        proc.kill()
-                        Log.log(level=logging.DEBUG, msg="Process {0} has been killed.".format(proc_name))
-                        result = True
-                    except psutil.NoSuchProcess:
-                        continue
-        return result
+        return Process.kill_all(patterns=[(proc_name, proc_cmdline)])
 
     @staticmethod
     def kill_by_commandline(cmdline):
+        return Process.kill_all(patterns=[(None, cmdline)])
+
+    @staticmethod
+    def kill_all(patterns, snapshot=None):
+        """
+        Kill all processes that match any of the patterns (with single pass over the process table).
+        :param patterns: List of (proc_name, proc_cmdline) tuples.
+        proc_name is exact process name and proc_cmdline is sub string of commandline (None matches anything).
+        :param snapshot: ProcessSnapshot object (new snapshot is created if not specified).
+        :return: True if at least one process is killed.
+        """
+        if snapshot is None:
+            snapshot = ProcessSnapshot()
         result = False
-        for proc in psutil.process_iter():
-            cmd = ""
+        for proc, pattern in snapshot.find_all(patterns=patterns):
             try:
-                cmd = str(proc.cmdline())
-            except Exception:
+                proc.kill()
+                name = pattern[0] if pattern[0] is not None else pattern[1]
+                Log.log(level=logging.DEBUG, msg="Process {0} has been killed.".format(name))
+                result = True
+            except psutil.NoSuchProcess:
                 continue
-            if cmdline in cmd:
-                try:
-                    proc.kill()
-                    Log.log(level=logging.DEBUG, msg="Process {0} has been killed.".format(cmdline))
-                    result = True
-                except psutil.NoSuchProcess:
-                    continue
+            except Exception:
+                Log.debug('Failed to kill process {0}.'.format(proc.pid))
         return result
 
     @staticmethod
     def kill_by_port(port):
-        for proc in psutil.process_iter():
+        for proc in ProcessSnapshot(ports=True).find_by_port(port=port):
             try:
-                connections = proc.connections(kind='inet')
-                if connections:
-                    for connection in connections:
-                        if connection.laddr.port == port:
-                            cmd = ''.join(proc.cmdline())
-                            proc.kill()
-                            Log.info('Kill processes listening on port {0}.'.format(str(port)))
-                            Log.debug('Kill process: ' + cmd)
+                cmd = proc.info['cmdline']
+                proc.kill()
+                Log.info('Kill processes listening on port {0}.'.format(str(port)))
+                Log.debug('Kill process: ' + cmd)
             except Exception:
                 pass
 
@@ -161,8 +237,163 @@ class Process(object):
             except Exception:
                 continue
 
+    @staticmethod
+    def get_pgid(pid):
+        """
+        Get process group id of a process.
+        :param pid: Process id.
+        :return: Process group id (None on Windows or if process does not exist anymore).
+        """
+        if Settings.HOST_OS == OSType.WINDOWS:
+            return None
+        try:
+            return os.getpgid(pid)
+        except OSError:
+            return None
+
+    @staticmethod
+    def get_create_time(pid):
+        """
+        Get create time of a process (pid and create time identify the process even if pid is reused).
+        :param pid: Process id.
+        :return: Create time (None if process does not exist anymore).
+        """
+        try:
+            return psutil.Process(pid).create_time()
+        except Exception:
+            return None
+
+    @staticmethod
+    def is_same_process(pid, create_time):
+        """
+        Check if process is still running and pid is not reused by other process.
+        :param pid: Process id.
+        :param create_time: Create time of the process (result of `get_create_time()`).
+        :return: True if process with `pid` and `create_time` is running.
+        """
+        return create_time is not None and Process.get_create_time(pid) == create_time
+
+    @staticmethod
+    def is_same_group(pgid, create_time):
+        """
+        Check if process group is still the group of process we started (its leader with `create_time`).
+        Process group id is not reused while the group has members, so group is the same if its leader still runs
+        or if no other process uses the id of the leader (group of exited leader might still have members).
+        :param pgid: Process group id.
+        :param create_time: Create time of the group leader.
+        :return: True if the group is the same.
+        """
+        if pgid is None or create_time is None:
+            return False
+        leader_create_time = Process.get_create_time(pgid)
+        return leader_create_time is None or leader_create_time == create_time
+
+    @staticmethod
+    def kill_tree(pid, pgid=None, timeout=5):
+        """
+        Kill process, all its children and all members of its process group.
+        Processes are terminated first and killed only if they are still alive after `timeout` seconds.
+        :param pid: Process id (pass None to kill only members of the process group).
+        :param pgid: Process group id (pass None if process is not started in own process group).
+        :param timeout: Time to wait processes to terminate gracefully (in seconds).
+        :return: List of pids of processes that were still alive after graceful termination.
+        """
+        # Never signal own process group (processes might be started with the group of the test runner).
+        if pgid is not None and (pgid <= 1 or pgid == Process.get_pgid(os.getpid())):
+            pgid = None
+
+        # Collect the tree before terminating anything, children are re-parented once parent dies.
+        procs = []
+        try:
+            if pid is not None:
+                parent = psutil.Process(pid)
+                procs = [parent] + parent.children(recursive=True)
+        except psutil.NoSuchProcess:
+            pass
+        except Exception:
+            Log.debug('Failed to get children of process {0}.'.format(pid))
+
+        # Terminate gracefully
+        Process.__signal_group(pgid=pgid, sig=signal.SIGTERM)
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                continue
+            except Exception:
+                Log.debug('Failed to terminate process {0}.'.format(proc.pid))
+        alive = Process.__wait_procs(procs=procs, timeout=timeout)
+
+        # Kill processes that ignore termination
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                continue
+            except Exception:
+                Log.debug('Failed to kill process {0}.'.format(proc.pid))
+        if pgid is not None and hasattr(signal, 'SIGKILL'):
+            Process.__signal_group(pgid=pgid, sig=signal.SIGKILL)
+        if alive:
+            Process.__wait_procs(procs=alive, timeout=timeout)
+        terminated = len(procs) - len(alive)
+        Log.debug('Process tree of {0} killed ({1} terminated, {2} killed).'.format(pid, terminated, len(alive)))
+        return [proc.pid for proc in alive]
+
+    @staticmethod
+    def __wait_procs(procs, timeout):
+        """
+        Wait until processes exit.
+        Zombies are treated as gone, orphans are reaped by init and it might take a while.
+        :return: List of processes still alive after timeout.
+        """
+        end_time = time.time() + timeout
+        alive = procs
+        while alive:
+            _, alive = psutil.wait_procs(alive, timeout=0.1)
+            alive = [proc for proc in alive if not Process.__is_zombie(proc)]
+            if time.time() > end_time:
+                break
+        return alive
+
+    @staticmethod
+    def __is_zombie(proc):
+        try:
+            return proc.status() == psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def __signal_group(pgid, sig):
+        if pgid is None:
+            return
+        try:
+            os.killpg(pgid, sig)
+        except OSError:
+            # Group is empty (all processes already exited).
+            pass
+
     @staticmethod
     def kill_all_in_context():
+        """
+        Kill processes started by current test (and all processes they started).
+        Processes and groups are signaled only if they still belong to the process we started (pids are reused),
+        otherwise processes are found by name under TEST_RUN_HOME.
+        """
+        patterns = []
         for process in TestContext.STARTED_PROCESSES:
-            name = process.commandline.split(' ')[0]
-            Process.kill(proc_name=name, proc_cmdline=Settings.TEST_RUN_HOME)
+            same_process = Process.is_same_process(pid=process.pid, create_time=process.create_time)
+            same_group = process.pgid == process.pid and \
+                Process.is_same_group(pgid=process.pgid, create_time=process.create_time)
+            if same_process or same_group:
+                Process.kill_tree(pid=process.pid if same_process else None,
+                                  pgid=process.pgid if same_group else None)
+            if not same_group and process.commandline:
+                # Process group is not known (Windows) or reused, so fallback to name matching.
+                name = process.commandline.split(' ')[0]
+                patterns.append((name, Settings.TEST_RUN_HOME))
+        TestContext.STARTED_PROCESSES = []
+        if patterns:
+            Process.kill_all(patterns=patterns)
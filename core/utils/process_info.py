@@ -1,9 +1,14 @@
 class ProcessInfo(object):
-    def __init__(self, cmd=None, pid=None, exit_code=None, output='', log_file=None, complete=True, duration=None):
+    def __init__(self, cmd=None, pid=None, exit_code=None, output='', log_file=None, complete=True, duration=None,
+                 pgid=None, resources=None, log_cursor=None, create_time=None):
         self.commandline = cmd
         self.pid = pid
+        self.pgid = pgid
+        self.create_time = create_time
         self.output = output
         self.exit_code = exit_code
         self.log_file = log_file
         self.complete = complete
         self.duration = duration
+        self.resources = resources
+        self.log_cursor = log_cursor
@@ -0,0 +1,176 @@
+"""
+Sample resource usage of process tree.
+"""
+# pylint: disable=broad-except
+import threading
+import time
+
+import psutil
+
+
+class ResourceUsage(object):
+    """
+    Resource usage of process tree (summary and compact time series).
+    """
+
+    def __init__(self):
+        self.peak_rss = 0
+        self.cpu_user = 0.0
+        self.cpu_system = 0.0
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.peak_threads = 0
+        self.peak_processes = 0
+        self.duration = 0.0
+        # List of (seconds since start, rss, cpu seconds, threads, processes) tuples.
+        self.samples = []
+
+    @property
+    def cpu_time(self):
+        return self.cpu_user + self.cpu_system
+
+    @property
+    def peak_rss_mb(self):
+        return self.peak_rss / 1024.0 / 1024.0
+
+    def to_dict(self, samples=False):
+        """
+        Get usage as dict (for example to store it in json file with results).
+        :param samples: If True include time series.
+        :return: Dict.
+        """
+        result = {
+            'peak_rss': self.peak_rss,
+            'cpu_user': self.cpu_user,
+            'cpu_system': self.cpu_system,
+            'read_bytes': self.read_bytes,
+            'write_bytes': self.write_bytes,
+            'peak_threads': self.peak_threads,
+            'peak_processes': self.peak_processes,
+            'duration': self.duration,
+        }
+        if samples:
+            result['samples'] = self.samples
+        return result
+
+    def __str__(self):
+        return 'peak rss: {0:.1f} MB, cpu: {1:.2f}s user / {2:.2f}s system, io: {3} read / {4} written bytes, ' \
+               'peak threads: {5}, peak processes: {6}'.format(self.peak_rss_mb, self.cpu_user, self.cpu_system,
+                                                               self.read_bytes, self.write_bytes, self.peak_threads,
+                                                               self.peak_processes)
+
+
+class ResourceSampler(object):
+    """
+    Sample resource usage of process and all its children in background thread.
+
+    Notes: CPU and IO counters of each process are remembered from last sample in which process was alive,
+    so processes that live shorter than `interval` are not counted.
+    """
+
+    def __init__(self, pid, interval=0.5, max_samples=500):
+        """
+        Init sampler.
+        :param pid: Pid of root process.
+        :param interval: Interval between samples (in seconds).
+        :param max_samples: Max length of time series (once reached every second sample is dropped and
+        interval is doubled).
+        """
+        self.pid = pid
+        self.interval = interval
+        self.max_samples = max_samples
+        self.usage = ResourceUsage()
+        self.__counters = {}
+        self.__processes = {}
+        self.__start = None
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def start(self):
+        """
+        Start sampling.
+        :return: Self.
+        """
+        self.__start = time.time()
+        self.__thread = threading.Thread(target=self.__run)
+        self.__thread.daemon = True
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop sampling.
+        :return: ResourceUsage object.
+        """
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+        self.usage.duration = time.time() - self.__start
+        return self.usage
+
+    def __run(self):
+        while not self.__stop.is_set():
+            if not self.sample():
+                break
+            self.__stop.wait(self.interval)
+
+    def __get_tree(self):
+        try:
+            root = psutil.Process(self.pid)
+            tree = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+        processes = []
+        for proc in tree:
+            try:
+                key = (proc.pid, proc.create_time())
+            except psutil.Error:
+                continue
+            # Reuse Process objects, so cpu counters are read from same instance.
+            processes.append(self.__processes.setdefault(key, proc))
+        return processes
+
+    def sample(self):
+        """
+        Take one sample.
+        :return: False if process tree does not exist anymore, otherwise True.
+        """
+        processes = self.__get_tree()
+        if not processes:
+            return False
+        rss = 0
+        threads = 0
+        for proc in processes:
+            try:
+                with proc.oneshot():
+                    rss += proc.memory_info().rss
+                    threads += proc.num_threads()
+                    cpu = proc.cpu_times()
+                    io_read, io_write = self.__get_io(proc)
+                self.__counters[(proc.pid, proc.create_time())] = (cpu.user, cpu.system, io_read, io_write)
+            except psutil.Error:
+                continue
+
+        usage = self.usage
+        usage.cpu_user = sum(counters[0] for counters in self.__counters.values())
+        usage.cpu_system = sum(counters[1] for counters in self.__counters.values())
+        usage.read_bytes = sum(counters[2] for counters in self.__counters.values())
+        usage.write_bytes = sum(counters[3] for counters in self.__counters.values())
+        usage.peak_rss = max(usage.peak_rss, rss)
+        usage.peak_threads = max(usage.peak_threads, threads)
+        usage.peak_processes = max(usage.peak_processes, len(processes))
+        usage.samples.append((round(time.time() - self.__start, 3), rss, round(usage.cpu_time, 3), threads,
+                              len(processes)))
+        if len(usage.samples) > self.max_samples:
+            usage.samples = usage.samples[::2]
+            self.interval = self.interval * 2
+        return True
+
+    @staticmethod
+    def __get_io(proc):
+        # io_counters() is not available on macOS and might be denied for processes of other users.
+        try:
+            counters = proc.io_counters()
+            return counters.read_bytes, counters.write_bytes
+        except (AttributeError, psutil.AccessDenied, NotImplementedError):
+            return 0, 0
@@ -2,8 +2,10 @@
 # pylint: disable=too-many-branches
 # pylint: disable=broad-except
 # pylint: disable=unused-variable
+import importlib
 import logging
 import os
+import threading
 import time
 from datetime import datetime
 
@@ -14,7 +16,11 @@ from core.enums.os_type import OSType
 from core.log.log import Log
 from core.settings import Settings
 from core.utils.file_utils import File, Folder
+from core.utils.output_buffer import OutputBuffer
+from core.utils.process import Process
 from core.utils.process_info import ProcessInfo
+from core.utils.resource_sampler import ResourceSampler
+from core.utils.trace import Trace
 
 if os.name == 'posix' and Settings.PYTHON_VERSION < 3:
     # Import subprocess32 on Posix when Python2 is detected
@@ -25,13 +31,39 @@ else:
 
 
 def run(cmd, cwd=Settings.TEST_RUN_HOME, wait=True, timeout=600, fail_safe=False, register=True,
-        log_level=logging.DEBUG):
+        log_level=logging.DEBUG, stream=False, on_output=None, profile=False):
+    """
+    Execute shell command.
+    :param cmd: Command as string.
+    :param cwd: Working directory.
+    :param wait: If True wait until command is complete, otherwise redirect output to log file and return.
+    :param timeout: Timeout in seconds (respected only if wait=True).
+    :param fail_safe: If True do not raise exception when command timeouts.
+    :param register: If True register the process in TestContext.
+    :param log_level: Log level.
+    :param stream: If True drain stdout and stderr while command is running (recommended for chatty commands).
+    Output is kept in bounded in-memory buffer and complete output is spilled to `log_file` when it gets too big.
+    :param on_output: Callback called with each line of output while command is running (only when stream=True).
+    :param profile: If True sample memory, CPU, IO and threads of the process tree while command is running
+    and store the usage in `resources` of the result (respected only if wait=True).
+    :return: ProcessInfo object.
+    :rtype: core.utils.process_info.ProcessInfo
+    """
+    with Trace.span(name=cmd.split(' ')[0], category='run', cmd=cmd, wait=wait) as span:
+        result = __run(cmd=cmd, cwd=cwd, wait=wait, timeout=timeout, fail_safe=fail_safe, register=register,
+                       log_level=log_level, stream=stream, on_output=on_output, profile=profile)
+        span.set(exit_code=result.exit_code, complete=result.complete, output_bytes=len(result.output or ''))
+    return result
+
+
+def __run(cmd, cwd, wait, timeout, fail_safe, register, log_level, stream, on_output, profile):
     # Init result values
     time_string = datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')
     log_file = os.path.join(Settings.TEST_OUT_LOGS, 'command_{0}.txt'.format(time_string))
     complete = False
     duration = None
     output = ''
+    resources = None
 
     # Ensure logs folder exists
     dir_path = os.path.dirname(os.path.realpath(log_file))
@@ -50,44 +82,80 @@ def run(cmd, cwd=Settings.TEST_RUN_HOME, wait=True, timeout=600, fail_safe=False
     # Execute command:
     if wait:
         start = time.time()
-        with open(log_file, mode='w') as log:
-            if Settings.HOST_OS == OSType.WINDOWS:
-                process = subprocess.Popen(cmd, cwd=cwd, shell=True, stdout=log, stderr=log)
-            else:
-                process = subprocess.Popen(cmd, cwd=cwd, shell=True, stdout=subprocess.PIPE, stderr=log)
+        if stream:
+            buffer = OutputBuffer(spill_file=log_file)
+            process = subprocess.Popen(cmd, cwd=cwd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       **get_process_group_options())
+            reader = threading.Thread(target=__read_output, args=(process.stdout, buffer, on_output))
+            reader.daemon = True
+            reader.start()
+        else:
+            with open(log_file, mode='w') as log:
+                if Settings.HOST_OS == OSType.WINDOWS:
+                    process = subprocess.Popen(cmd, cwd=cwd, shell=True, stdout=log, stderr=log,
+                                               **get_process_group_options())
+                else:
+                    process = subprocess.Popen(cmd, cwd=cwd, shell=True, stdout=subprocess.PIPE, stderr=log,
+                                               **get_process_group_options())
+        pgid = Process.get_pgid(process.pid)
+        create_time = Process.get_create_time(process.pid)
+        sampler = ResourceSampler(pid=process.pid).start() if profile else None
 
         # Wait until command complete
         try:
-            process.wait(timeout=timeout)
+            if stream:
+                process.wait(timeout=timeout)
+            else:
+                # communicate() drains the pipe while waiting, so chatty commands can not block on full pipe buffer
+                out, err = process.communicate(timeout=timeout)
+                if out is not None:
+                    if Settings.PYTHON_VERSION < 3:
+                        output = str(out.decode('utf8').encode('utf8')).strip()
+                    else:
+                        output = out.decode("utf-8").strip()
             complete = True
-            out, err = process.communicate()
-            if out is not None:
-                if Settings.PYTHON_VERSION < 3:
-                    output = str(out.decode('utf8').encode('utf8')).strip()
-                else:
-                    output = out.decode("utf-8").strip()
         except subprocess.TimeoutExpired:
-            process.kill()
+            # Kill the whole tree, killing just the shell leaves its children (gradle, node, ...) running
+            Process.kill_tree(pid=process.pid, pgid=pgid)
             if fail_safe:
                 Log.error('Command "{0}" timeout after {1} seconds.'.format(cmd, timeout))
             else:
                 raise
-
-        # Append stderr to output
-        stderr = File.read(path=log_file)
-        if stderr:
-            output = output + os.linesep + File.read(path=log_file)
-
-        # noinspection PyBroadException
-        try:
-            File.delete(path=log_file)
-        except Exception:
-            Log.debug('Failed to clean log file: {0}'.format(log_file))
-        log_file = None
+        finally:
+            if sampler is not None:
+                resources = sampler.stop()
+                Log.log(level=log_level, msg='RESOURCES: ' + str(resources))
+
+        if stream:
+            # Child processes may still hold the pipe, so do not wait forever for EOF
+            reader.join(timeout=5)
+            buffer.close()
+            if complete:
+                output = buffer.get_text().strip()
+            if buffer.spilled:
+                Log.debug('Output of "{0}" is too big, complete output is available at {1}'.format(cmd, log_file))
+            else:
+                File.delete(path=log_file)
+                log_file = None
+        else:
+            # Append stderr to output
+            stderr = File.read(path=log_file)
+            if stderr:
+                output = output + os.linesep + File.read(path=log_file)
+
+            # noinspection PyBroadException
+            try:
+                File.delete(path=log_file)
+            except Exception:
+                Log.debug('Failed to clean log file: {0}'.format(log_file))
+            log_file = None
         end = time.time()
         duration = end - start
     else:
-        process = psutil.Popen(cmd, cwd=cwd, shell=True, stdin=None, stdout=None, stderr=None, close_fds=True)
+        process = psutil.Popen(cmd, cwd=cwd, shell=True, stdin=None, stdout=None, stderr=None, close_fds=True,
+                               **get_process_group_options())
+        pgid = Process.get_pgid(process.pid)
+        create_time = Process.get_create_time(process.pid)
 
     # Get result
     pid = process.pid
@@ -95,13 +163,16 @@ def run(cmd, cwd=Settings.TEST_RUN_HOME, wait=True, timeout=600, fail_safe=False
 
     # Log output of the process
     if wait:
-        Log.log(level=log_level, msg='OUTPUT: ' + os.linesep + output + os.linesep)
+        if stream and log_file is not None:
+            Log.log(level=log_level, msg='OUTPUT (TAIL): ' + os.linesep + output + os.linesep)
+        else:
+            Log.log(level=log_level, msg='OUTPUT: ' + os.linesep + output + os.linesep)
     else:
         Log.log(level=log_level, msg='OUTPUT REDIRECTED: ' + log_file + os.linesep)
 
     # Construct result
     result = ProcessInfo(cmd=cmd, pid=pid, exit_code=exit_code, output=output, log_file=log_file, complete=complete,
-                         duration=duration)
+                         duration=duration, pgid=pgid, resources=resources, create_time=create_time)
 
     # Register in TestContext
     if psutil.pid_exists(result.pid) and register:
@@ -109,3 +180,65 @@ def run(cmd, cwd=Settings.TEST_RUN_HOME, wait=True, timeout=600, fail_safe=False
 
     # Return the result
     return result
+
+
+def get_process_group_options():
+    """
+    Get Popen options that start command in its own process group (so whole tree can be killed later).
+    :return: Dict with Popen keyword arguments.
+    """
+    if Settings.HOST_OS == OSType.WINDOWS:
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    if Settings.PYTHON_VERSION < 3:
+        # Background processes are started with standard subprocess module, which has no start_new_session on Python 2
+        return {'preexec_fn': os.setsid}
+    return {'start_new_session': True}
+
+
+def run_all(commands, cwd=Settings.TEST_RUN_HOME, timeout=600, fail_safe=False, max_concurrency=8,
+            log_level=logging.DEBUG):
+    """
+    Execute independent commands concurrently (on Python 3) and wait until all of them are complete.
+    :param commands: List of commands.
+    :param cwd: Working directory.
+    :param timeout: Timeout in seconds (per command).
+    :param fail_safe: If True do not raise exception when command timeouts.
+    :param max_concurrency: Max count of commands executed at the same time.
+    :param log_level: Log level.
+    :return: List of ProcessInfo objects (in the same order as commands).
+    """
+    if Settings.PYTHON_VERSION < 3:
+        return [run(cmd=cmd, cwd=cwd, timeout=timeout, fail_safe=fail_safe, log_level=log_level) for cmd in commands]
+    engine = get_async_engine()
+    return engine.run_parallel(commands=commands, max_concurrency=max_concurrency, cwd=cwd, timeout=timeout,
+                               fail_safe=fail_safe, log_level=log_level)
+
+
+def __read_output(pipe, buffer, on_output=None):
+    """
+    Read output of the process line by line until EOF.
+    :param pipe: stdout of the process.
+    :param buffer: OutputBuffer object.
+    :param on_output: Callback called with each line.
+    """
+    for line in iter(pipe.readline, b''):
+        text = line.decode('utf-8', 'ignore')
+        buffer.write(text)
+        if on_output is not None:
+            try:
+                on_output(text)
+            except Exception:
+                Log.debug('Failed to process output line: ' + text)
+    pipe.close()
+
+
+def get_async_engine():
+    """
+    Get asyncio based command engine.
+    Notes: `core.utils.run_async` uses async/await syntax, so it is never imported on Python 2 (and it is excluded
+    from flake8 and pylint checks that run on Python 2).
+    :return: `core.utils.run_async` module.
+    """
+    if Settings.PYTHON_VERSION < 3:
+        raise NotImplementedError('Asyncio based command execution requires Python 3.')
+    return importlib.import_module('core.utils.run_async')
@@ -0,0 +1,131 @@
+"""
+Asyncio based command execution.
+
+Notes: Available only on Python 3, use `core.utils.run.run_all` when code should also work on Python 2.
+Never import this module directly, use `core.utils.run.get_async_engine()` (Python 2 can not parse it, so it is
+also excluded from flake8 and pylint checks in .travis.yml).
+"""
+# pylint: disable=broad-except
+import asyncio
+import logging
+import os
+import subprocess
+import time
+import warnings
+
+import psutil
+
+from core.base_test.test_context import TestContext
+from core.enums.os_type import OSType
+from core.log.log import Log
+from core.settings import Settings
+from core.utils.process import Process
+from core.utils.process_info import ProcessInfo
+from core.utils.run import get_process_group_options
+
+
+async def run_async(cmd, cwd=Settings.TEST_RUN_HOME, timeout=600, fail_safe=False, register=True,
+                    log_level=logging.DEBUG):
+    """
+    Execute shell command without blocking the event loop.
+    :param cmd: Command as string.
+    :param cwd: Working directory.
+    :param timeout: Timeout in seconds.
+    :param fail_safe: If True do not raise exception when command timeouts.
+    :param register: If True register the process in TestContext.
+    :param log_level: Log level.
+    :return: ProcessInfo object (same as `core.utils.run.run` with wait=True).
+    :rtype: core.utils.process_info.ProcessInfo
+    """
+    Log.log(level=log_level, msg='Execute command: ' + cmd)
+    Log.log(level=logging.DEBUG, msg='CWD: ' + cwd)
+
+    start = time.time()
+    complete = False
+    output = ''
+    process = await asyncio.create_subprocess_shell(cmd, cwd=cwd, stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.PIPE, **get_process_group_options())
+    pgid = Process.get_pgid(process.pid)
+    create_time = Process.get_create_time(process.pid)
+    try:
+        out, err = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        complete = True
+        output = out.decode('utf-8', 'ignore').strip()
+        stderr = err.decode('utf-8', 'ignore')
+        if stderr:
+            output = output + os.linesep + stderr
+    except asyncio.TimeoutError:
+        Process.kill_tree(pid=process.pid, pgid=pgid)
+        await process.wait()
+        if fail_safe:
+            Log.error('Command "{0}" timeout after {1} seconds.'.format(cmd, timeout))
+        else:
+            raise subprocess.TimeoutExpired(cmd=cmd, timeout=timeout)
+    duration = time.time() - start
+
+    # Log output of the process
+    Log.log(level=log_level, msg='OUTPUT: ' + os.linesep + output + os.linesep)
+
+    # Construct result
+    exit_code = process.returncode if complete else None
+    result = ProcessInfo(cmd=cmd, pid=process.pid, exit_code=exit_code, output=output, log_file=None,
+                         complete=complete, duration=duration, pgid=pgid, create_time=create_time)
+
+    # Register in TestContext
+    if psutil.pid_exists(result.pid) and register:
+        TestContext.STARTED_PROCESSES.append(result)
+
+    return result
+
+
+async def gather_limited(awaitables, max_concurrency=8):
+    """
+    Await all awaitables, but do not run more than `max_concurrency` of them at the same time.
+    :param awaitables: List of awaitables (for example results of `run_async()`).
+    :param max_concurrency: Max count of awaitables executed at the same time.
+    :return: List of results (in the same order as awaitables).
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __limited(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*[__limited(awaitable) for awaitable in awaitables])
+
+
+def run_parallel(commands, max_concurrency=8, **kwargs):
+    """
+    Execute commands concurrently and wait until all of them are complete.
+    :param commands: List of commands.
+    :param max_concurrency: Max count of commands executed at the same time.
+    :param kwargs: Arguments passed to `run_async()` for each command.
+    :return: List of ProcessInfo objects (in the same order as commands).
+    """
+    if Settings.HOST_OS == OSType.WINDOWS:
+        loop = asyncio.ProactorEventLoop()
+    else:
+        loop = asyncio.new_event_loop()
+    previous_loop = __get_current_loop()
+    # Child watcher of subprocesses (Unix, Python < 3.8) works only with loop set as current
+    asyncio.set_event_loop(loop)
+    try:
+        awaitables = [run_async(cmd=cmd, **kwargs) for cmd in commands]
+        return loop.run_until_complete(gather_limited(awaitables, max_concurrency=max_concurrency))
+    finally:
+        asyncio.set_event_loop(previous_loop)
+        loop.close()
+
+
+def __get_current_loop():
+    """
+    :return: Current event loop of the thread (None if there is no such loop).
+    """
+    try:
+        with warnings.catch_warnings():
+            # Python 3.12+ warns when there is no current loop
+            warnings.simplefilter('ignore', DeprecationWarning)
+            loop = asyncio.get_event_loop_policy().get_event_loop()
+    except RuntimeError:
+        return None
+    return None if loop.is_closed() else loop
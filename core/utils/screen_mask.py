@@ -0,0 +1,131 @@
+"""
+Regions of device screens compared (or ignored) by image comparison.
+"""
+import fnmatch
+
+import numpy
+
+
+class Region(object):
+    def __init__(self, x=0, y=0, width=None, height=None, relative=False):
+        """
+        Rectangle on screen.
+        :param x: Left edge (negative values are counted from right edge of the screen).
+        :param y: Top edge (negative values are counted from bottom edge of the screen).
+        :param width: Width (None means to the right edge of the screen).
+        :param height: Height (None means to the bottom edge of the screen).
+        :param relative: If True all values are fractions of screen size (for example 0.05 is 5% of screen height),
+        otherwise values are pixels.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.relative = relative
+
+    @staticmethod
+    def top(height, relative=False):
+        """
+        :return: Region of full width at the top of the screen (for example status bar).
+        """
+        return Region(y=0, height=height, relative=relative)
+
+    @staticmethod
+    def bottom(height, relative=False):
+        """
+        :return: Region of full width at the bottom of the screen (for example navigation bar).
+        """
+        return Region(y=-height, height=height, relative=relative)
+
+    def get_slices(self, width, height):
+        """
+        Resolve region on screen of specific size.
+        :param width: Screen width in pixels.
+        :param height: Screen height in pixels.
+        :return: Tuple (rows slice, columns slice).
+        """
+        def resolve(value, size):
+            if value is None:
+                return None
+            pixels = int(round(value * size)) if self.relative else int(value)
+            return size + pixels if pixels < 0 else pixels
+
+        left = resolve(self.x, width)
+        top = resolve(self.y, height)
+        right = width if self.width is None else left + resolve(self.width, width)
+        bottom = height if self.height is None else top + resolve(self.height, height)
+        return slice(max(top, 0), min(bottom, height)), slice(max(left, 0), min(right, width))
+
+    def __str__(self):
+        return 'Region(x={0}, y={1}, width={2}, height={3}{4})'.format(
+            self.x, self.y, self.width, self.height, ', relative' if self.relative else '')
+
+
+class ScreenMask(object):
+    def __init__(self, ignore=None, include=None):
+        """
+        Mask of compared pixels.
+        :param ignore: List of Region objects that are never compared (status bar, clock, blinking cursor...).
+        :param include: List of Region objects that are compared (if empty whole screen is compared).
+        """
+        self.ignore = ignore or []
+        self.include = include or []
+
+    def merge(self, other):
+        """
+        :return: New ScreenMask with regions of both masks.
+        """
+        return ScreenMask(ignore=self.ignore + other.ignore, include=self.include + other.include)
+
+    def to_array(self, width, height):
+        """
+        :return: Boolean numpy array (height x width), True for pixels that should be compared.
+        """
+        if self.include:
+            compare = numpy.zeros((height, width), dtype=bool)
+            for region in self.include:
+                compare[region.get_slices(width, height)] = True
+        else:
+            compare = numpy.ones((height, width), dtype=bool)
+        for region in self.ignore:
+            compare[region.get_slices(width, height)] = False
+        return compare
+
+
+class ScreenMasks(object):
+    """
+    Masks of device models (matched by `Device.model`, which is model of Android devices and name of iOS simulators).
+    """
+    # Status bar of iPhone 7 (20pt @2x), historically ignored for all devices
+    DEFAULT = ScreenMask(ignore=[Region.top(40)])
+
+    # Masks of models always include DEFAULT, so they never compare more than before
+    # Android status bar (24dp) and navigation bar (48dp) on 1080x1920 screens are 63 and 126 pixels
+    ANDROID = DEFAULT.merge(ScreenMask(ignore=[Region.top(0.033, relative=True),
+                                               Region.bottom(0.066, relative=True)]))
+    # Status bar (44pt) and home indicator (34pt) of iPhones with notch
+    IPHONE_NOTCH = DEFAULT.merge(ScreenMask(ignore=[Region.top(0.05, relative=True),
+                                                    Region.bottom(0.04, relative=True)]))
+
+    MODELS = [
+        ('iPhone7*', DEFAULT),
+        ('iPhone 7*', DEFAULT),
+        ('iPhoneX*', IPHONE_NOTCH),
+        ('iPhone X*', IPHONE_NOTCH),
+        ('iPhone1[1-9]*', IPHONE_NOTCH),
+        ('Android SDK built for*', ANDROID),
+        ('sdk_gphone*', ANDROID),
+        ('Pixel*', ANDROID),
+    ]
+
+    @staticmethod
+    def get(model):
+        """
+        Get mask of device model.
+        :param model: Device model.
+        :return: ScreenMask object (DEFAULT if model is not known).
+        """
+        for pattern, mask in ScreenMasks.MODELS:
+            if model is not None and fnmatch.fnmatch(model, pattern):
+                return mask
+        return ScreenMasks.DEFAULT
@@ -0,0 +1,207 @@
+"""
+Record nested spans (commands, adb calls, screenshots, waits) of a test run.
+
+Notes: Tracing is enabled by `TRACE=true` environment variable. Spans are appended to `trace.jsonl` in
+`Settings.TEST_OUT_LOGS` (one json object per line) and can be converted to Chrome trace-event format
+(open in chrome://tracing or https://ui.perfetto.dev) with `Trace.export_chrome()` or:
+    python -m core.utils.trace out/logs/trace.jsonl out/logs/trace.json
+"""
+# pylint: disable=broad-except
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+from core.base_test.test_context import TestContext
+from core.settings import Settings
+
+
+class Span(object):
+    """
+    Single traced operation, use it as context manager.
+    """
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.id = None
+        self.parent = None
+        self.start = None
+
+    def set(self, **kwargs):
+        """
+        Add arguments to the span (for example exit code or size of output).
+        """
+        self.args.update(kwargs)
+
+    def __enter__(self):
+        Trace.start_span(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        Trace.end_span(self)
+        return False
+
+
+class NoopSpan(object):
+    """
+    Span used when tracing is disabled.
+    """
+
+    def set(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class Trace(object):
+    ENABLED = Settings.TRACE
+    TRACE_FILE = os.path.join(Settings.TEST_OUT_LOGS, 'trace.jsonl')
+
+    __ids = itertools.count(1)
+    __local = threading.local()
+    __lock = threading.Lock()
+    __noop = NoopSpan()
+
+    @staticmethod
+    def span(name, category, **kwargs):
+        """
+        Create span.
+        :param name: Name of the span (short, for example first word of the command).
+        :param category: Category of the span (for example 'run', 'adb', 'tns', 'device', 'wait').
+        :param kwargs: Additional arguments stored with the span.
+        :return: Span object (use it as context manager).
+        """
+        if not Trace.ENABLED:
+            return Trace.__noop
+        return Span(name=name, category=category, args=kwargs)
+
+    @staticmethod
+    def traced(name, category):
+        """
+        Decorator that traces each call of a function.
+        :param name: Name of the span.
+        :param category: Category of the span.
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with Trace.span(name=name, category=category):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def start_span(span):
+        stack = Trace.__get_stack()
+        span.id = next(Trace.__ids)
+        span.parent = stack[-1].id if stack else None
+        span.start = time.time()
+        stack.append(span)
+
+    @staticmethod
+    def end_span(span):
+        end = time.time()
+        stack = Trace.__get_stack()
+        if span in stack:
+            stack.remove(span)
+        record = {
+            'id': span.id,
+            'parent': span.parent,
+            'name': span.name,
+            'cat': span.category,
+            'start': span.start,
+            'end': end,
+            'duration': end - span.start,
+            'pid': os.getpid(),
+            'tid': threading.current_thread().name,
+            'class': TestContext.CLASS_NAME,
+            'test': TestContext.TEST_NAME,
+            'args': span.args,
+        }
+        Trace.__write(record)
+
+    @staticmethod
+    def __get_stack():
+        if not hasattr(Trace.__local, 'stack'):
+            Trace.__local.stack = []
+        return Trace.__local.stack
+
+    @staticmethod
+    def __write(record):
+        try:
+            line = json.dumps(record, default=str)
+            with Trace.__lock:
+                folder = os.path.dirname(Trace.TRACE_FILE)
+                if not os.path.isdir(folder):
+                    os.makedirs(folder)
+                with open(Trace.TRACE_FILE, 'a') as trace_file:
+                    trace_file.write(line + '\n')
+        except Exception:
+            # Tracing should never break the tests.
+            pass
+
+    @staticmethod
+    def read(trace_file=None):
+        """
+        Read spans from trace file.
+        :param trace_file: Path to trace file (default is `Trace.TRACE_FILE`).
+        :return: List of dicts (one per span).
+        """
+        trace_file = trace_file or Trace.TRACE_FILE
+        spans = []
+        with open(trace_file, 'r') as lines:
+            for line in lines:
+                line = line.strip()
+                if line:
+                    try:
+                        spans.append(json.loads(line))
+                    except ValueError:
+                        # Last line might be incomplete if process is killed while writing.
+                        continue
+        return spans
+
+    @staticmethod
+    def export_chrome(trace_file=None, output_file=None):
+        """
+        Convert trace file to Chrome trace-event format.
+        :param trace_file: Path to trace file (default is `Trace.TRACE_FILE`).
+        :param output_file: Path to result json file (default is trace file with .json extension).
+        :return: Path to result json file.
+        """
+        trace_file = trace_file or Trace.TRACE_FILE
+        output_file = output_file or os.path.splitext(trace_file)[0] + '.json'
+        spans = Trace.read(trace_file)
+        origin = min([span['start'] for span in spans]) if spans else 0
+        thread_ids = {}
+        events = []
+        for span in spans:
+            tid = thread_ids.setdefault((span['pid'], span['tid']), len(thread_ids) + 1)
+            args = dict(span['args'])
+            args['class'] = span['class']
+            args['test'] = span['test']
+            events.append({'name': span['name'], 'cat': span['cat'], 'ph': 'X', 'pid': span['pid'], 'tid': tid,
+                           'ts': int((span['start'] - origin) * 1000000),
+                           'dur': int(span['duration'] * 1000000), 'args': args})
+        for (pid, thread_name), tid in thread_ids.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}})
+        with open(output_file, 'w') as output:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, output)
+        return output_file
+
+
+if __name__ == '__main__':
+    print(Trace.export_chrome(*sys.argv[1:3]))
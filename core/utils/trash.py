@@ -0,0 +1,125 @@
+"""
+Background deletion of folders.
+"""
+# pylint: disable=broad-except
+import atexit
+import os
+import shutil
+import stat
+import threading
+import time
+import uuid
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from core.log.log import Log
+from core.settings import Settings
+
+
+class Trash(object):
+    """
+    Folders are deleted in two steps:
+    1. Folder is renamed into trash folder (atomic and cheap when both are on same file system),
+    so its path can be reused immediately.
+    2. Trash content is deleted by single background thread.
+
+    Call `drain()` to wait until trash is empty (it is also called on exit of the test process).
+    """
+    __queue = queue.Queue()
+    __lock = threading.Lock()
+    __worker = None
+
+    @staticmethod
+    def move(folder, trash=None):
+        """
+        Move folder to trash and schedule its deletion.
+        :param folder: Folder path.
+        :param trash: Trash folder (default is `Settings.TRASH_HOME`).
+        :return: True if folder is moved, False if folder should be deleted synchronously
+        (it is on different file system than trash or rename failed).
+        """
+        folder = os.path.abspath(folder)
+        trash = os.path.abspath(trash or Settings.TRASH_HOME)
+        if not os.path.isdir(folder) or os.path.islink(folder):
+            return False
+        if trash == folder or trash.startswith(folder + os.sep):
+            return False
+        try:
+            Trash.__init_trash(trash)
+            if os.stat(trash).st_dev != os.stat(folder).st_dev:
+                # Rename between file systems is actually a copy
+                return False
+            target = os.path.join(trash, '{0}-{1}'.format(os.path.basename(folder), uuid.uuid4().hex))
+            os.rename(folder, target)
+        except Exception as error:
+            Log.debug('Failed to move {0} to trash: {1}'.format(folder, error))
+            return False
+        Log.debug('Folder {0} moved to trash.'.format(folder))
+        Trash.__queue.put(target)
+        return True
+
+    @staticmethod
+    def drain(timeout=None):
+        """
+        Wait until all folders in trash are deleted.
+        :param timeout: Max seconds to wait (None means no timeout).
+        :return: True if trash is empty, False if timeout is reached.
+        """
+        if timeout is None:
+            Trash.__queue.join()
+            return True
+        end_time = time.time() + timeout
+        while Trash.__queue.unfinished_tasks > 0:
+            if time.time() > end_time:
+                Log.debug('Trash is not drained in {0} seconds.'.format(timeout))
+                return False
+            time.sleep(0.05)
+        return True
+
+    @staticmethod
+    def __init_trash(trash):
+        with Trash.__lock:
+            if Trash.__worker is not None and os.path.isdir(trash):
+                return
+            if not os.path.isdir(trash):
+                os.makedirs(trash)
+            if Trash.__worker is None:
+                # Delete leftovers of previous runs killed before their trash was empty
+                for name in os.listdir(trash):
+                    Trash.__queue.put(os.path.join(trash, name))
+                Trash.__worker = threading.Thread(target=Trash.__work, name='Trash')
+                Trash.__worker.daemon = True
+                Trash.__worker.start()
+                atexit.register(Trash.drain)
+
+    @staticmethod
+    def __work():
+        while True:
+            path = Trash.__queue.get()
+            try:
+                Trash.__delete(path)
+            finally:
+                Trash.__queue.task_done()
+
+    @staticmethod
+    def __delete(path):
+        def on_error(function, failed_path, _):
+            # Read-only files (for example in .git folders) can not be removed on Windows
+            try:
+                os.chmod(failed_path, stat.S_IWUSR | stat.S_IRUSR)
+                function(failed_path)
+            except Exception:
+                pass
+
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, onerror=on_error)
+            elif os.path.lexists(path):
+                os.remove(path)
+        except Exception as error:
+            Log.debug('Failed to delete {0}: {1}'.format(path, error))
+        if os.path.lexists(path):
+            Log.debug('Trash item {0} is not deleted.'.format(path))
@@ -1,5 +1,109 @@
+import os
+import random
+import select
+import threading
 import time
 
+from core.log.log import Log
+from core.utils.trace import Trace
+
+
+class WaitStats(object):
+    """
+    Statistics of single wait.
+    """
+
+    def __init__(self):
+        self.attempts = 0
+        self.success = False
+        self.elapsed = 0
+        self.condition_time = 0
+        self.sleep_time = 0
+        self.wake_ups = 0
+
+    def __str__(self):
+        return 'success: {0}, attempts: {1}, elapsed: {2:.2f}s, in condition: {3:.2f}s, wake-ups: {4}'.format(
+            self.success, self.attempts, self.elapsed, self.condition_time, self.wake_ups)
+
+
+class WakeUp(object):
+    """
+    Source of events that interrupt sleep between two checks of wait condition.
+    """
+
+    def wait(self, timeout):
+        """
+        Block until event occurs or timeout expires.
+        :param timeout: Timeout in seconds.
+        :return: True if event occurs before timeout, otherwise False.
+        """
+        raise NotImplementedError()
+
+
+class EventWakeUp(WakeUp):
+    """
+    Wake up when `set()` is called (for example by thread that reads logs).
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def set(self):
+        self.event.set()
+
+    def wait(self, timeout):
+        woken = self.event.wait(timeout)
+        self.event.clear()
+        return bool(woken)
+
+
+class FileWakeUp(WakeUp):
+    """
+    Wake up when file is modified (size or modification time is changed).
+    """
+
+    def __init__(self, path, poll_interval=0.05):
+        """
+        Init wake up source.
+        :param path: Path to file.
+        :param poll_interval: Interval between two stat calls (in seconds).
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self.state = self.__get_state()
+
+    def __get_state(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_size, stat.st_mtime
+        except OSError:
+            return None
+
+    def wait(self, timeout):
+        end_time = time.time() + timeout
+        while True:
+            state = self.__get_state()
+            if state != self.state:
+                self.state = state
+                return True
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+
+
+class SocketWakeUp(WakeUp):
+    """
+    Wake up when socket is readable (new data or new connection is available).
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        return bool(readable)
+
 
 class Wait(object):
     @staticmethod
@@ -10,8 +114,63 @@ class Wait(object):
         :returns: True if condition is satisfied before timeout, otherwise False.
         """
         end_time = time.time() + timeout
-        while time.time() < end_time:
-            if condition(*args, **kwargs):
-                return True
-            time.sleep(period)
+        with Trace.span(name='wait', category='wait'):
+            while time.time() < end_time:
+                if condition(*args, **kwargs):
+                    return True
+                time.sleep(period)
         return False
+
+    @staticmethod
+    def until_adaptive(condition, timeout=100, period=1, min_period=0.1, backoff=2.0, jitter=0.1, wake_up=None,
+                       stats=None):
+        """
+        Wait until condition is satisfied.
+        First checks are done fast (every `min_period` seconds), then delay grows `backoff` times up to `period`.
+        :param condition: Function without arguments, wait is complete when it returns True.
+        :param timeout: Timeout in seconds.
+        :param period: Max delay between two checks (in seconds).
+        :param min_period: Delay after first check (in seconds).
+        :param backoff: Multiplier of delay after each unsuccessful check.
+        :param jitter: Random +/- part of delay (0.1 means +/- 10%), so parallel waits do not check at same time.
+        :param wake_up: WakeUp object, when it fires condition is checked immediately and delay is reset.
+        :param stats: WaitStats object that will be filled with statistics of the wait.
+        :rtype: bool
+        :returns: True if condition is satisfied before timeout, otherwise False.
+        """
+        if stats is None:
+            stats = WaitStats()
+        with Trace.span(name='wait', category='wait') as span:
+            Wait.__wait(condition=condition, timeout=timeout, period=period, min_period=min_period, backoff=backoff,
+                        jitter=jitter, wake_up=wake_up, stats=stats)
+            span.set(success=stats.success, attempts=stats.attempts, condition_time=stats.condition_time)
+        Log.debug('Wait complete ({0}).'.format(stats))
+        return stats.success
+
+    @staticmethod
+    def __wait(condition, timeout, period, min_period, backoff, jitter, wake_up, stats):
+        start = time.time()
+        end_time = start + timeout
+        delay = min(min_period, period)
+        while True:
+            before = time.time()
+            satisfied = condition()
+            after = time.time()
+            stats.attempts += 1
+            stats.condition_time += after - before
+            if satisfied:
+                stats.success = True
+                break
+            remaining = end_time - after
+            if remaining <= 0:
+                break
+            sleep = min(delay * (1 + random.uniform(-jitter, jitter)), remaining)
+            if wake_up is not None and wake_up.wait(sleep):
+                stats.wake_ups += 1
+                delay = min(min_period, period)
+            else:
+                if wake_up is None:
+                    time.sleep(sleep)
+                delay = min(delay * backoff, period)
+            stats.sleep_time += time.time() - after
+        stats.elapsed = time.time() - start
@@ -1,6 +1,7 @@
 """
 A wrapper around Xcode.
 """
+from core.utils.probe_cache import ProbeCache
 from core.utils.run import run
 from core.utils.version import Version
 
@@ -14,6 +15,7 @@ class Xcode(object):
         run(cmd="rm -rf ~/Library/Developer/Xcode/DerivedData/*")
 
     @staticmethod
+    @ProbeCache.cached('xcode.version', disk=True)
     def get_version():
         """
         Get Xcode version
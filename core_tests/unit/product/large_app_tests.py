@@ -0,0 +1,70 @@
+import json
+import os
+import unittest
+
+from core.enums.app_type import AppType
+from core.settings import Settings
+from core.utils.file_utils import File, Folder
+from data.changes import Sync
+from data.large_app import LargeApp, LargeAppInfo
+
+
+# noinspection PyMethodMayBeStatic
+class LargeAppTests(unittest.TestCase):
+    app_name = 'LargeApp'
+    app_path = os.path.join(Settings.TEST_RUN_HOME, app_name)
+    info = LargeAppInfo(pages=3, modules=4, css_size=3000, images=2, dependencies=2, image_size=8)
+
+    def setUp(self):
+        Folder.clean(self.app_path)
+        Folder.create(os.path.join(self.app_path, 'app'))
+        Folder.create(os.path.join(self.app_path, 'src', 'app'))
+        File.write(os.path.join(self.app_path, 'package.json'), json.dumps({'name': self.app_name}))
+        File.write(os.path.join(self.app_path, 'app', 'app.js'), 'application.run();\n')
+        File.write(os.path.join(self.app_path, 'src', 'app', 'app.module.ts'),
+                   '@NgModule({\n    imports: [\n        NativeScriptModule\n    ]\n})\nexport class AppModule { }\n')
+
+    def tearDown(self):
+        Folder.clean(self.app_path)
+
+    def test_01_generate_js(self):
+        folder = LargeApp.generate(app_path=self.app_path, app_type=AppType.JS, info=self.info)
+        pages = sorted(name for name in os.listdir(folder) if name.startswith('page'))
+        assert pages == ['page0', 'page1', 'page2']
+        page_files = os.listdir(os.path.join(folder, 'page1'))
+        assert len([name for name in page_files if name.startswith('module')]) == 4
+        assert 'page1-page.xml' in page_files and 'page1-page.js' in page_files
+        assert "require('./module3')" in File.read(os.path.join(folder, 'page1', 'page1-page.js'))
+        assert "require('./module2')" in File.read(os.path.join(folder, 'page1', 'module3.js'))
+        assert len(os.listdir(os.path.join(folder, 'images'))) == 2
+        css_size = sum(File.get_size(os.path.join(folder, page, page + '-page.css')) for page in pages)
+        assert 3000 <= css_size < 3500, 'Actual CSS size: {0}'.format(css_size)
+
+        # Generated code is imported from app entry and local packages are added as dependencies
+        assert File.read(os.path.join(self.app_path, 'app', 'app.js')).startswith("require('./generated');")
+        dependencies = json.loads(File.read(os.path.join(self.app_path, 'package.json')))['dependencies']
+        assert dependencies['generated-package1'] == 'file:generated_packages/generated-package1'
+
+        # Same seed generates same app
+        content = File.read(os.path.join(folder, 'page2', 'module1.js'))
+        LargeApp.generate(app_path=self.app_path, app_type=AppType.JS, info=self.info)
+        assert File.read(os.path.join(folder, 'page2', 'module1.js')) == content
+        assert File.read(os.path.join(self.app_path, 'app', 'app.js')).count("require('./generated');") == 1
+
+        # Generated change can be applied
+        Sync.replace(app_name=self.app_name, change_set=LargeApp.get_change(app_type=AppType.JS, page=2, module=1))
+        assert "'page2-module1-changed'" in File.read(os.path.join(folder, 'page2', 'module1.js'))
+
+    def test_02_generate_ng(self):
+        folder = LargeApp.generate(app_path=self.app_path, app_type=AppType.NG, info=self.info)
+        assert folder == os.path.join(self.app_path, 'src', 'app', 'generated')
+        assert File.exists(os.path.join(folder, 'page0', 'page0.component.ts'))
+        assert File.exists(os.path.join(folder, 'page0', 'module3.ts'))
+        assert 'Page2Component' in File.read(os.path.join(folder, 'generated.module.ts'))
+        app_module = File.read(os.path.join(self.app_path, 'src', 'app', 'app.module.ts'))
+        assert "import { GeneratedModule } from './generated/generated.module';" in app_module
+        assert 'imports: [\n        GeneratedModule,' in app_module
+
+
+if __name__ == '__main__':
+    unittest.main()
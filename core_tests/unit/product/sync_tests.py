@@ -0,0 +1,84 @@
+import os
+import threading
+import unittest
+
+from nose.tools import timed
+
+from core.settings import Settings
+from core.utils.file_utils import File, Folder
+from data.changes import ChangeSet, Sync
+from products.nativescript.tns_logs import TnsLogs
+
+
+# noinspection PyMethodMayBeStatic
+class SyncLatencyTests(unittest.TestCase):
+    app_name = 'SyncLatencyApp'
+    app_folder = os.path.join(Settings.TEST_RUN_HOME, app_name)
+    log_file = os.path.join(Settings.TEST_OUT_TEMP, 'sync_latency.txt')
+    change = ChangeSet(file_path=os.path.join('app', 'main-page.xml'), old_value='TAP', new_value='HIT',
+                       old_text='TAP', new_text='HIT')
+
+    def setUp(self):
+        Folder.create(Settings.TEST_OUT_TEMP)
+        Folder.clean(self.app_folder)
+        Folder.create(os.path.join(self.app_folder, 'app'))
+        File.write(path=os.path.join(self.app_folder, 'app', 'main-page.xml'), text='<Button text="TAP" />')
+        File.write(path=self.log_file, text='Successfully synced application org.nativescript.SyncLatencyApp\n')
+        TnsLogs.get_cursor(self.log_file).checkpoint()
+
+    def tearDown(self):
+        Folder.clean(self.app_folder)
+
+    @timed(10)
+    def test_01_replace_and_measure(self):
+        threading.Timer(0.2, lambda: File.append(self.log_file, 'File change detected.\n')).start()
+        threading.Timer(0.3, lambda: File.append(self.log_file, 'Successfully transferred main-page.xml\n')).start()
+        threading.Timer(0.5, lambda: File.append(self.log_file, 'Successfully synced application on device\n')).start()
+        latency = Sync.replace_and_measure(app_name=self.app_name, change_set=self.change, log_file=self.log_file)
+        assert 'HIT' in File.read(os.path.join(self.app_folder, 'app', 'main-page.xml'))
+        assert 0.1 < latency.to_log < latency.to_synced < 2, str(latency)
+        assert latency.to_frame is None, 'Frame is not measured without device.'
+        assert latency.to_dict()['file'] == self.change.file_path
+
+        # Default cursor is not moved, so logs are still available for TnsLogs.wait_for_log
+        TnsLogs.wait_for_log(log_file=self.log_file, string_list=['main-page.xml', 'Successfully synced'], timeout=1)
+
+    @timed(10)
+    def test_02_sync_not_detected(self):
+        with self.assertRaises(AssertionError):
+            Sync.replace_and_measure(app_name=self.app_name, change_set=self.change, log_file=self.log_file,
+                                     timeout=0.5)
+
+    def test_03_transaction(self):
+        xml = os.path.join(self.app_folder, 'app', 'main-page.xml')
+        css = os.path.join(self.app_folder, 'app', 'app.css')
+        File.write(path=css, text='.btn { font-size: 18; }')
+        original_css = os.stat(css)
+        css_change = ChangeSet(file_path=os.path.join('app', 'app.css'), old_value='font-size: 18',
+                               new_value='font-size: 20')
+        text_change = ChangeSet(file_path=os.path.join('app', 'main-page.xml'), old_value='Button',
+                                new_value='Label')
+
+        with Sync.replace_all(app_name=self.app_name, change_sets=[self.change, text_change, css_change]) as changes:
+            assert File.read(xml) == '<Label text="HIT" />'
+            assert File.read(css) == '.btn { font-size: 20; }'
+            assert os.stat(css).st_ino != original_css.st_ino, 'File should be replaced with rename.'
+            assert len(changes.originals) == 2
+            assert not [name for name in os.listdir(os.path.dirname(xml)) if name.endswith('.tmp')]
+        assert File.read(xml) == '<Button text="TAP" />'
+        assert File.read(css) == '.btn { font-size: 18; }'
+
+        # Failed transaction does not modify any file
+        missing = ChangeSet(file_path=os.path.join('app', 'app.css'), old_value='color: red', new_value='color: blue')
+        with self.assertRaises(AssertionError):
+            Sync.replace_all(app_name=self.app_name, change_sets=[self.change, missing])
+        assert File.read(xml) == '<Button text="TAP" />'
+        Sync.replace_all(app_name=self.app_name, change_sets=[self.change, missing], fail_safe=True)
+        assert File.read(xml) == '<Button text="HIT" />'
+
+        Sync.revert(app_name=self.app_name, change_set=self.change)
+        assert File.read(xml) == '<Button text="TAP" />'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+import unittest
+
+from nose.tools import timed
+
+from core.settings import Settings
+from core.utils.file_utils import File, Folder
+from products.nativescript.tns_logs import TnsLogs
+
+
+# noinspection PyMethodMayBeStatic
+class WaitForLogTests(unittest.TestCase):
+    log_file = os.path.join(Settings.TEST_OUT_TEMP, 'tns_logs.txt')
+
+    def setUp(self):
+        Folder.create(Settings.TEST_OUT_TEMP)
+        File.write(path=self.log_file, text='Preparing project...\n')
+        TnsLogs.get_cursor(self.log_file).checkpoint()
+
+    @timed(5)
+    def test_01_wait_for_log(self):
+        threading.Timer(0.3, lambda: File.append(self.log_file, 'Successfully synced application\n')).start()
+        File.append(self.log_file, 'Building project...\n')
+        TnsLogs.wait_for_log(log_file=self.log_file, string_list=['Building project', 'Successfully synced'],
+                             not_existing_string_list=['Preparing project'], timeout=3, check_interval=0.1)
+
+        # Second wait should see only new part of the log
+        File.append(self.log_file, 'Refreshing application...\n')
+        TnsLogs.wait_for_log(log_file=self.log_file, string_list=['Refreshing application'],
+                             not_existing_string_list=['Successfully synced'], timeout=1, check_interval=0.1)
+        assert '[VERIFIED]' not in File.read(self.log_file), 'Log file should not be modified.'
+
+    @timed(5)
+    def test_02_wait_for_log_wake_up(self):
+        threading.Timer(0.3, lambda: File.append(self.log_file, 'Successfully synced application\n')).start()
+        start = time.time()
+        TnsLogs.wait_for_log(log_file=self.log_file, string_list=['Successfully synced'], timeout=10,
+                             check_interval=10)
+        assert time.time() - start < 2, 'Wait should not sleep whole check interval when log is written.'
+        assert TnsLogs.MATCH_LATENCIES[-1] < 1, 'Match should be detected right after log is written.'
+
+    @timed(5)
+    def test_03_wait_for_log_fail_fast(self):
+        File.append(self.log_file, 'BUILD FAILED\n')
+        start = time.time()
+        with self.assertRaises(AssertionError):
+            TnsLogs.wait_for_log(log_file=self.log_file, string_list=['Successfully synced'], timeout=30,
+                                 check_interval=0.1)
+        assert time.time() - start < 1, 'Wait should stop when build fails.'
+
+    def test_04_wait_for_log_not_existing(self):
+        File.append(self.log_file, 'Successfully synced\nError: something went wrong\n')
+        with self.assertRaises(AssertionError):
+            TnsLogs.wait_for_log(log_file=self.log_file, string_list=['Successfully synced'],
+                                 not_existing_string_list=['Error:'], timeout=1, check_interval=0.1)
+
+    def test_05_cursors(self):
+        default = TnsLogs.get_cursor(self.log_file)
+        assert TnsLogs.get_cursor(self.log_file) is default, 'Default cursor should be shared.'
+        File.append(self.log_file, 'first\n')
+        assert default.peek() == 'first\n'
+        assert default.read() == 'first\n'
+        assert default.read() == ''
+
+        # Independent consumers
+        other = default.clone()
+        File.append(self.log_file, 'Successfully synced\n')
+        TnsLogs.wait_for_log(log_file=None, string_list=['Successfully synced'], timeout=1, check_interval=0.1,
+                             cursor=other)
+        assert default.read() == 'Successfully synced\n', 'Other cursor should not move default cursor.'
+        with self.assertRaises(AssertionError):
+            TnsLogs.wait_for_log(log_file=None, string_list=['Successfully synced'], timeout=0.5, check_interval=0.1,
+                                 cursor=other)
+
+    @timed(5)
+    def test_06_expectation_order(self):
+        expectation = TnsLogs.expect(string_list=['Project successfully built'],
+                                     ordered=[('Successfully installed', 'Successfully synced')])
+        File.append(self.log_file, 'Project successfully built\nSuccessfully installed\nSuccessfully synced\n')
+        TnsLogs.wait_for_log(log_file=self.log_file, string_list=expectation, timeout=1, check_interval=0.1)
+
+        # Same expectation is reused, wrong order should abort the wait
+        File.append(self.log_file, 'Project successfully built\nSuccessfully synced\n')
+        start = time.time()
+        with self.assertRaises(AssertionError):
+            TnsLogs.wait_for_log(log_file=self.log_file, string_list=expectation, timeout=30, check_interval=0.1)
+        assert time.time() - start < 1, 'Wait should stop when order is wrong.'
+
+    @timed(5)
+    def test_07_expectation_fail_fast(self):
+        expectation = TnsLogs.expect(string_list=['Successfully synced'], not_existing_string_list=['Error:'],
+                                     fail_strings=[('Cannot find module', 'Module not found.')])
+        for text in ['Error: something went wrong\n', 'Cannot find module "foo"\n']:
+            File.append(self.log_file, text)
+            start = time.time()
+            with self.assertRaises(AssertionError):
+                TnsLogs.wait_for_log(log_file=self.log_file, string_list=expectation, timeout=30,
+                                     check_interval=0.1)
+            assert time.time() - start < 1, 'Wait should stop when {0} is found.'.format(text.strip())
+
+        # Default fail strings are not used when fail strings are specified
+        File.append(self.log_file, 'BUILD FAILED\nSuccessfully synced\n')
+        TnsLogs.wait_for_log(log_file=self.log_file, string_list=expectation, timeout=1, check_interval=0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tarfile
+import unittest
+import zipfile
+
+from core.settings import Settings
+from core.utils.archive import Archive
+from core.utils.file_utils import File, Folder
+
+
+# noinspection PyMethodMayBeStatic
+class ArchiveTests(unittest.TestCase):
+    root = os.path.join(Settings.TEST_OUT_TEMP, 'archive')
+    apk = os.path.join(root, 'app.apk')
+    tgz = os.path.join(root, 'app.tgz')
+    content = {'lib/x86/libNativeScript.so': 'x' * 1000, 'lib/arm64-v8a/libNativeScript.so': 'x' * 2000,
+               'assets/snapshots/x86/snapshot.blob': 'y' * 300, 'assets/app/bundle.js': 'z' * 50}
+
+    def setUp(self):
+        Folder.clean(self.root)
+        source = os.path.join(self.root, 'source')
+        for name, text in self.content.items():
+            Folder.create(os.path.dirname(os.path.join(source, name)))
+            File.write(os.path.join(source, name), text)
+        with zipfile.ZipFile(self.apk, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for name in self.content.keys():
+                zip_file.write(os.path.join(source, name), name)
+        with tarfile.open(self.tgz, 'w:gz') as tar_file:
+            tar_file.add(source, arcname='package')
+
+    def tearDown(self):
+        Folder.clean(self.root)
+
+    def test_01_query_zip(self):
+        apk = Archive.get(self.apk)
+        assert apk.exists('lib/x86/libNativeScript.so')
+        assert apk.exists(os.path.join('assets', 'snapshots'))
+        assert not apk.exists('lib/x86_64/libNativeScript.so')
+        assert not apk.exists('lib/x8'), 'Prefix should match only whole path parts.'
+        assert apk.contains(os.path.join('arm64-v8a', 'libNativeScript.so'))
+        assert File.is_file_in_zip(self.apk, os.path.join('x86', 'libNativeScript.so'))
+        assert apk.get_size('lib') == 3000
+        assert apk.get_size() == 3350
+        assert apk.get_size('lib', compressed=True) < 3000
+        assert apk.get_size_breakdown('lib') == {'x86': 1000, 'arm64-v8a': 2000}
+        assert apk.find('*.blob') == ['assets/snapshots/x86/snapshot.blob']
+        assert Archive.get(self.apk) is apk, 'Member list should be read only once.'
+
+    def test_02_query_tgz(self):
+        tgz = Archive.get(self.tgz)
+        assert tgz.exists('package/lib/arm64-v8a/libNativeScript.so')
+        assert tgz.get_size('package/assets') == 350
+        assert tgz.get_size_breakdown('package') == {'lib': 3000, 'assets': 350}
+        with self.assertRaises(IOError):
+            tgz.get_size(compressed=True)
+
+    def test_03_extract(self):
+        dest = os.path.join(self.root, 'extracted')
+        extracted = Archive.get(self.apk).extract(dest, members=['assets/app/bundle.js'], prefix='lib/x86')
+        assert sorted(extracted) == sorted([os.path.join(dest, 'assets', 'app', 'bundle.js'),
+                                            os.path.join(dest, 'lib', 'x86', 'libNativeScript.so')])
+        assert not Folder.exists(os.path.join(dest, 'lib', 'arm64-v8a')), 'Only requested members should be extracted.'
+        assert File.read(os.path.join(dest, 'lib', 'x86', 'libNativeScript.so')) == 'x' * 1000
+
+        tgz = Archive.get(self.tgz)
+        tgz.extract(dest, members=['package/assets/snapshots/x86/snapshot.blob'])
+        assert File.read(os.path.join(dest, 'package', 'assets', 'snapshots', 'x86', 'snapshot.blob')) == 'y' * 300
+        assert tgz.read('package/assets/app/bundle.js') == b'z' * 50
+
+
+if __name__ == '__main__':
+    unittest.main()
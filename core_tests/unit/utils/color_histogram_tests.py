@@ -0,0 +1,109 @@
+"""
+Tests for color histogram.
+
+Notes: OpenCV color order is:
+0 - blue
+1 - green
+2 - red
+"""
+import os
+import time
+import unittest
+
+import numpy
+
+from core.log.log import Log
+from core.utils.color_histogram import ColorHistogram
+from core.utils.image_utils import ImageUtils
+
+
+# noinspection PyMethodMayBeStatic
+class ColorHistogramTests(unittest.TestCase):
+    current_folder = os.path.dirname(os.path.realpath(__file__))
+
+    app_image = os.path.join(current_folder, 'resources', 'app.png')
+    app_image_ng = os.path.join(current_folder, 'resources', 'app_ng.png')
+    iphone_image = os.path.join(current_folder, 'resources', 'screenshot.png')
+    blue = numpy.array([255, 188, 48])
+    white = numpy.array([255, 255, 255])
+
+    def test_01_get_pixels_by_color(self):
+        histogram = ColorHistogram.from_file(self.app_image)
+        assert histogram.get_pixels_by_color(color=self.blue) == 18604
+        assert histogram.get_pixels_by_color(color=numpy.array([0, 0, 255])) == 0
+        assert histogram.get_pixels_by_colors(colors=[self.blue, self.white]) == \
+            [18604, histogram.get_pixels_by_color(color=self.white)]
+
+    def test_02_same_as_unique_rows(self):
+        colors = [self.blue, self.white, numpy.array([117, 117, 117]), numpy.array([0, 0, 0]),
+                  numpy.array([48, 188, 255]), numpy.array([20, 230, 10])]
+        for image_path in [self.app_image, self.app_image_ng]:
+            histogram = ColorHistogram.from_file(image_path)
+            unique_colors = Helpers.get_unique_colors(image_path)
+            for color in colors:
+                for tolerance in [1, 25, 60]:
+                    expected = Helpers.get_pixels_by_color(unique_colors, color, tolerance)
+                    actual = histogram.get_pixels_by_color(color=color, rdb_tolerance=tolerance)
+                    assert actual == expected, 'Actual: {0}, Expected: {1}'.format(actual, expected)
+            assert numpy.array_equal(histogram.get_main_color(), Helpers.get_main_color(unique_colors))
+
+    def test_03_main_color_tie(self):
+        # First color in BGR order wins if colors have same count
+        pixels = numpy.array([[[0, 0, 255], [255, 0, 0], [0, 255, 0], [255, 0, 0], [0, 0, 255]]], dtype=numpy.uint8)
+        main_color = ColorHistogram(pixels).get_main_color()
+        assert main_color.dtype == numpy.uint8
+        assert (main_color == numpy.array([0, 0, 255])).all()
+
+    def test_04_benchmark(self):
+        start = time.time()
+        expected = Helpers.get_main_color(Helpers.get_unique_colors(self.iphone_image))
+        unique_rows_time = time.time() - start
+        start = time.time()
+        actual = ImageUtils.get_main_color(image_path=self.iphone_image)
+        histogram_time = time.time() - start
+        Log.info('get_main_color: {0:.3f}s unique rows, {1:.3f}s histogram ({2:.0f}x faster).'.format(
+            unique_rows_time, histogram_time, unique_rows_time / max(histogram_time, 0.0001)))
+        assert numpy.array_equal(actual, expected)
+        assert histogram_time * 5 < unique_rows_time, 'Histogram should be much faster.'
+
+
+class Helpers(object):
+    @staticmethod
+    def get_unique_colors(image_path):
+        """
+        Unique colors found by lexicographic sort of pixel rows.
+        :return: Tuple (colors, counts).
+        """
+        img = ImageUtils.read_image(image_path=image_path)
+        return numpy.unique(img.reshape(-1, 3), axis=0, return_counts=True)
+
+    @staticmethod
+    def get_pixels_by_color(unique_colors, color, rdb_tolerance):
+        """
+        Reference implementation of ColorHistogram.get_pixels_by_color.
+        """
+        colors, counts = unique_colors
+        max_count = 0
+        for n_color, count in zip(colors, counts):
+            diff = numpy.abs(n_color.astype(int) - color)
+            if (diff < rdb_tolerance).all() and count > max_count:
+                max_count = count
+        return max_count
+
+    @staticmethod
+    def get_main_color(unique_colors):
+        """
+        Reference implementation of ColorHistogram.get_main_color.
+        """
+        colors, counts = unique_colors
+        max_count = 0
+        main_color = None
+        for color, count in zip(colors, counts):
+            if count > max_count:
+                max_count = count
+                main_color = color
+        return main_color
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import unittest
+
+from core.settings import Settings
+from core.utils.file_index import FileIndex
+from core.utils.file_utils import File, Folder
+
+
+# noinspection PyMethodMayBeStatic
+class FileIndexTests(unittest.TestCase):
+    root = os.path.join(Settings.TEST_OUT_TEMP, 'file_index')
+
+    def setUp(self):
+        Folder.clean(self.root)
+        for path in [os.path.join('app', 'main-page.xml'), os.path.join('app', 'main-page.js'),
+                     os.path.join('app', 'views', 'item.android.js'), os.path.join('libs', 'plugin.aar')]:
+            Folder.create(os.path.dirname(os.path.join(self.root, path)))
+            File.write(os.path.join(self.root, path), 'test')
+
+    def tearDown(self):
+        Folder.clean(self.root)
+
+    def test_01_find(self):
+        index = FileIndex(self.root).refresh()
+        assert index.find(name='main-page.xml') == [os.path.join(self.root, 'app', 'main-page.xml')]
+        assert sorted(os.path.basename(path) for path in index.find(contains='main')) == ['main-page.js',
+                                                                                          'main-page.xml']
+        assert index.find(pattern='*.android.*') == [os.path.join(self.root, 'app', 'views', 'item.android.js')]
+        assert len(index.find(extension='js')) == 2
+        assert index.find(extension='.aar', contains='plugin') == [os.path.join(self.root, 'libs', 'plugin.aar')]
+        assert index.find(name='missing.js') == []
+
+    def test_02_refresh(self):
+        index = FileIndex(self.root).refresh()
+        assert index.scanned == 4
+        index.refresh()
+        assert index.scanned == 0, 'Not modified folders should not be scanned again.'
+
+        File.write(os.path.join(self.root, 'app', 'views', 'new.js'), 'test')
+        Folder.clean(os.path.join(self.root, 'libs'))
+        index.refresh()
+        assert index.scanned == 2, 'Only modified folders should be scanned.'
+        assert len(index.find(extension='js')) == 3
+        assert index.find(extension='aar') == []
+
+    def test_03_persist(self):
+        index_file = os.path.join(Settings.TEST_OUT_TEMP, 'file_index.json')
+        FileIndex(self.root).refresh().save(index_file)
+        index = FileIndex.load(index_file)
+        assert index.find(pattern='*.aar') == [os.path.join(self.root, 'libs', 'plugin.aar')]
+        index.refresh()
+        assert index.scanned == 0, 'Loaded index should be valid if files are not changed.'
+        File.delete(index_file)
+
+    def test_04_file_utils(self):
+        assert File.find(base_path=self.root, file_name='item', exact_match=False).endswith('item.android.js')
+        assert File.pattern_exists(self.root, '*.aar')
+        assert not File.pattern_exists(self.root, '*.plist')
+        assert len(File.find_by_extension(self.root, 'xml')) == 1
+        File.write(os.path.join(self.root, 'app', 'app.xml'), 'test')
+        assert len(File.find_by_extension(self.root, 'xml')) == 2, 'Shared index should see new files.'
+
+
+if __name__ == '__main__':
+    unittest.main()
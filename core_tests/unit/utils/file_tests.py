@@ -5,6 +5,7 @@ from core.base_test.test_context import TestContext
 from core.base_test.tns_test import TnsTest
 from core.settings import Settings
 from core.utils.file_utils import File, Folder
+from core.utils.trash import Trash
 
 
 # noinspection PyMethodMayBeStatic
@@ -285,6 +286,101 @@ class FileUtilsTests(unittest.TestCase):
         Folder.clean(folder_name_new3)
         Folder.clean(folder_name_new4)
 
+    def test_20_get_size(self):
+        folder = os.path.join(Settings.TEST_OUT_TEMP, 'size')
+        Folder.clean(folder)
+        Folder.create(os.path.join(folder, 'a', 'nested'))
+        Folder.create(os.path.join(folder, 'b'))
+        File.write(os.path.join(folder, 'root.txt'), 'x' * 10)
+        File.write(os.path.join(folder, 'a', 'one.txt'), 'x' * 100)
+        File.write(os.path.join(folder, 'a', 'nested', 'two.txt'), 'x' * 1000)
+        File.write(os.path.join(folder, 'b', 'three.txt'), 'x' * 5)
+        assert Folder.get_size(folder) == 1115
+        assert Folder.get_size_breakdown(folder) == {'.': 10, 'a': 1100, 'b': 5}
+        assert Folder.get_size(folder, apparent=False) >= 1115, 'Allocated size should not be smaller.'
+
+        if hasattr(os, 'link') and hasattr(os, 'symlink'):
+            os.link(os.path.join(folder, 'a', 'one.txt'), os.path.join(folder, 'b', 'hard.txt'))
+            assert Folder.get_size(folder) == 1215
+            assert Folder.get_size(folder, dedupe_hardlinks=True) == 1115
+
+            # Symlink to parent folder should not cause endless loop
+            os.symlink(folder, os.path.join(folder, 'b', 'loop'))
+            assert Folder.get_size(folder, dedupe_hardlinks=True, follow_symlinks=True) == 1115
+            assert Folder.get_size(folder, dedupe_hardlinks=True, follow_symlinks=False) == 1115 + len(folder)
+            assert Folder.get_size(folder, dedupe_hardlinks=True) == 1115
+
+            # By default symlinks to files are counted with size of target and symlinks to folders are skipped
+            os.symlink(os.path.join(folder, 'a', 'nested', 'two.txt'), os.path.join(folder, 'b', 'two_link.txt'))
+            os.link(os.path.join(folder, 'b', 'three.txt'), os.path.join(folder, 'b', 'three_hard.txt'))
+            expected = 0
+            for dir_path, _, file_names in os.walk(folder):
+                expected += sum(os.path.getsize(os.path.join(dir_path, name)) for name in file_names)
+            assert Folder.get_size(folder) == expected == 2220
+
+        Folder.clean(folder)
+
+    def test_21_get_size_cache(self):
+        folder = os.path.join(Settings.TEST_OUT_TEMP, 'size_cache')
+        Folder.clean(folder)
+        Folder.create(os.path.join(folder, 'a'))
+        File.write(os.path.join(folder, 'a', 'one.txt'), 'x' * 100)
+        assert Folder.get_size(folder, use_cache=True) == 100
+        File.write(os.path.join(folder, 'a', 'two.txt'), 'x' * 10)
+        assert Folder.get_size(folder, use_cache=True) == 110, 'Cache should be invalidated when file is added.'
+        Folder.clean(folder)
+
+    def test_22_clone(self):
+        source = os.path.join(Settings.TEST_OUT_TEMP, 'clone_source')
+        target = os.path.join(Settings.TEST_OUT_TEMP, 'clone_target')
+        Folder.clean(source)
+        Folder.create(os.path.join(source, 'app'))
+        Folder.create(os.path.join(source, 'node_modules', 'pkg'))
+        File.write(os.path.join(source, 'app', 'app.js'), 'x' * 10)
+        File.write(os.path.join(source, 'node_modules', 'pkg', 'index.js'), 'x' * 100)
+        File.write(os.path.join(source, 'template.tgz'), 'x' * 1000)
+
+        result = Folder.clone(source=source, target=target)
+        assert File.read(os.path.join(target, 'node_modules', 'pkg', 'index.js')) == 'x' * 100
+        assert sum(result.files.values()) == 3, str(result)
+        assert result.bytes_copied + result.bytes_saved == 1110, str(result)
+        app_js = os.path.join(target, 'app', 'app.js')
+        assert os.stat(app_js).st_ino != os.stat(os.path.join(source, 'app', 'app.js')).st_ino, \
+            'Mutable files should never be hard linked.'
+        if 'hardlink' in result.files:
+            assert result.files['hardlink'] == 2
+            assert result.bytes_saved == 1100
+
+        # Without hard links
+        result = Folder.clone(source=source, target=target, hardlink=False)
+        assert 'hardlink' not in result.files, str(result)
+        index_js = os.path.join(target, 'node_modules', 'pkg', 'index.js')
+        assert os.stat(index_js).st_ino != os.stat(os.path.join(source, 'node_modules', 'pkg', 'index.js')).st_ino
+
+        Folder.clean(source)
+        Folder.clean(target)
+
+    def test_23_clean_fast(self):
+        folder = os.path.join(Settings.TEST_OUT_TEMP, 'clean_fast')
+        trash = os.path.join(Settings.TEST_OUT_TEMP, 'trash')
+        Folder.create(os.path.join(folder, 'node_modules', 'pkg'))
+        File.write(os.path.join(folder, 'node_modules', 'pkg', 'index.js'), 'x' * 100)
+
+        assert Trash.move(folder, trash=trash), 'Folder on same file system should be moved to trash.'
+        assert not Folder.exists(folder), 'Path should be free right after fast clean.'
+        Folder.create(folder)
+        File.write(os.path.join(folder, 'new.txt'), 'new')
+        assert Trash.drain(timeout=30), 'Trash is not drained.'
+        assert os.listdir(trash) == []
+        assert File.read(os.path.join(folder, 'new.txt')) == 'new'
+
+        # Trash inside cleaned folder can not be used
+        assert not Trash.move(Settings.TEST_OUT_TEMP, trash=trash)
+
+        Folder.clean(folder, fast=True)
+        assert not Folder.exists(folder)
+        assert Trash.drain(timeout=30)
+
 
 if __name__ == '__main__':
     unittest.main()
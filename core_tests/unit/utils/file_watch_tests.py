@@ -0,0 +1,46 @@
+import os
+import threading
+import time
+import unittest
+
+from nose.tools import timed
+
+from core.enums.os_type import OSType
+from core.settings import Settings
+from core.utils.file_utils import File, Folder
+from core.utils.file_watch import FileWatcher
+
+
+# noinspection PyMethodMayBeStatic
+class FileWatchTests(unittest.TestCase):
+    watched_file = os.path.join(Settings.TEST_OUT_TEMP, 'file_watch.txt')
+    other_file = os.path.join(Settings.TEST_OUT_TEMP, 'file_watch_other.txt')
+
+    def setUp(self):
+        Folder.create(Settings.TEST_OUT_TEMP)
+        File.delete(self.watched_file)
+
+    @timed(5)
+    def test_01_wait(self):
+        File.write(self.watched_file, '')
+        with FileWatcher(path=self.watched_file) as watcher:
+            if Settings.HOST_OS == OSType.LINUX:
+                assert watcher.backend == 'inotify'
+            threading.Timer(0.3, lambda: File.append(self.watched_file, 'text')).start()
+            start = time.time()
+            assert watcher.wait(timeout=3), 'Watcher should wake up when file is written.'
+            assert time.time() - start < 1, 'Watcher should wake up as soon as file is written.'
+            assert not watcher.wait(timeout=0.3), 'Watcher should not wake up when file is not changed.'
+
+    @timed(5)
+    def test_02_ignore_other_files(self):
+        with FileWatcher(path=self.watched_file) as watcher:
+            threading.Timer(0.1, lambda: File.write(self.other_file, 'text')).start()
+            threading.Timer(0.5, lambda: File.write(self.watched_file, 'text')).start()
+            start = time.time()
+            assert watcher.wait(timeout=3)
+            assert time.time() - start >= 0.4, 'Changes of other files should be ignored.'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,12 +8,17 @@ Notes: OpenCV color order is:
 2 - red
 """
 import os
+import time
 import unittest
 
 import numpy
+from PIL import Image
 
 from core.log.log import Log
+from core.settings import Settings
+from core.utils.file_utils import Folder
 from core.utils.image_utils import ImageUtils
+from core.utils.screen_mask import Region, ScreenMask
 
 
 # noinspection PyMethodMayBeStatic,PyUnresolvedReferences
@@ -82,6 +87,120 @@ class ImageUtilsTests(unittest.TestCase):
         assert 'Ter Stegen' in text
         assert 'Piqué' in text
 
+    def test_06_image_match(self):
+        match, diff_percent, _ = ImageUtils.image_match(actual_image=self.app_image, expected_image=self.app_image)
+        assert match and diff_percent == 0
+
+        # Result should be identical to pixel by pixel comparison
+        expected = Helpers.image_match_per_pixel(actual_image=self.app_image, expected_image=self.app_image_ng)
+        actual = ImageUtils.image_match(actual_image=self.app_image, expected_image=self.app_image_ng)
+        assert actual[0] == expected[0]
+        assert actual[1] == expected[1], 'Actual diff: {0}, expected diff: {1}'.format(actual[1], expected[1])
+        assert numpy.array_equal(numpy.asarray(actual[2]), numpy.asarray(expected[2])), 'Diff images are different.'
+
+        # Changes in top 40 rows (status bar) are ignored
+        Folder.create(Settings.TEST_OUT_TEMP)
+        changed_image = os.path.join(Settings.TEST_OUT_TEMP, 'status_bar_changed.png')
+        image = Image.open(self.app_image)
+        image.paste((0, 0, 0, 255), (0, 0, image.size[0], 40))
+        image.save(changed_image)
+        match, diff_percent, _ = ImageUtils.image_match(actual_image=changed_image, expected_image=self.app_image)
+        assert match and diff_percent == 0
+
+    def test_07_image_match_benchmark(self):
+        start = time.time()
+        expected = Helpers.image_match_per_pixel(actual_image=self.iphone_image, expected_image=self.app_image_ios)
+        per_pixel_time = time.time() - start
+        start = time.time()
+        actual = ImageUtils.image_match(actual_image=self.iphone_image, expected_image=self.app_image_ios)
+        vectorized_time = time.time() - start
+        Log.info('image_match: {0:.3f}s per pixel, {1:.3f}s vectorized ({2:.0f}x faster).'.format(
+            per_pixel_time, vectorized_time, per_pixel_time / max(vectorized_time, 0.0001)))
+        assert actual[1] == expected[1]
+        assert vectorized_time * 5 < per_pixel_time, 'Vectorized image_match should be much faster.'
+
+    def test_08_image_match_early_exit(self):
+        full = ImageUtils.image_match(actual_image=self.app_image, expected_image=self.app_image_ng)
+        fast = ImageUtils.image_match(actual_image=self.app_image, expected_image=self.app_image_ng, early_exit=True)
+        assert not full[0] and not fast[0]
+        assert 0 < fast[1] <= full[1], 'Early exit diff should be lower bound of the diff.'
+        assert fast[2] is None
+
+        # Pre-check on downscaled images never reports more than real diff
+        for tolerance in [0.05, 1, 5, 20, 50]:
+            full = ImageUtils.image_match(actual_image=self.iphone_image, expected_image=self.app_image_ios,
+                                          tolerance=tolerance)
+            fast = ImageUtils.image_match(actual_image=self.iphone_image, expected_image=self.app_image_ios,
+                                          tolerance=tolerance, early_exit=True)
+            assert full[0] == fast[0], 'Early exit changed result for tolerance {0}.'.format(tolerance)
+            assert fast[1] <= full[1]
+
+        # Same images still match
+        match, diff_percent, _ = ImageUtils.image_match(actual_image=self.app_image, expected_image=self.app_image,
+                                                        early_exit=True)
+        assert match and diff_percent == 0
+
+    def test_09_image_match_mask(self):
+        Folder.create(Settings.TEST_OUT_TEMP)
+        changed_image = os.path.join(Settings.TEST_OUT_TEMP, 'bottom_changed.png')
+        image = Image.open(self.app_image)
+        width, height = image.size
+        image.paste((0, 0, 0, 255), (0, height - 100, width, height))
+        image.save(changed_image)
+        match, diff_percent, _ = ImageUtils.image_match(actual_image=changed_image, expected_image=self.app_image)
+        assert not match and diff_percent > 0
+
+        # Ignored regions are not compared
+        mask = ScreenMask(ignore=[Region.top(40), Region.bottom(100)])
+        match, diff_percent, diff_image = ImageUtils.image_match(actual_image=changed_image,
+                                                                 expected_image=self.app_image, mask=mask)
+        assert match and diff_percent == 0
+        assert diff_image.getpixel((0, height - 1))[:3] == (0, 0, 0), 'Ignored pixels should not be marked.'
+
+        # Only included regions are compared
+        mask = ScreenMask(include=[Region(y=40, height=height - 140)])
+        match, diff_percent, _ = ImageUtils.image_match(actual_image=changed_image, expected_image=self.app_image,
+                                                        mask=mask, early_exit=True)
+        assert match and diff_percent == 0
+
+    def test_10_image_match_early_exit_benchmark(self):
+        start = time.time()
+        full = ImageUtils.image_match(actual_image=self.iphone_image, expected_image=self.app_image_ios)
+        full_time = time.time() - start
+        start = time.time()
+        fast = ImageUtils.image_match(actual_image=self.iphone_image, expected_image=self.app_image_ios,
+                                      early_exit=True)
+        early_exit_time = time.time() - start
+        Log.info('image_match of different screens: {0:.3f}s full, {1:.3f}s with early exit.'.format(
+            full_time, early_exit_time))
+        assert not full[0] and not fast[0]
+        assert early_exit_time < full_time, 'Early exit should be faster for different screens.'
+
+
+class Helpers(object):
+    @staticmethod
+    def image_match_per_pixel(actual_image, expected_image, tolerance=0.05):
+        """
+        Reference pixel by pixel implementation of ImageUtils.image_match.
+        """
+        actual_image = Image.open(actual_image)
+        actual_pixels = actual_image.load()
+        expected_image = Image.open(expected_image)
+        expected_pixels = expected_image.load()
+        width, height = expected_image.size
+        diff_pixels = 0
+        diff_image = actual_image.copy()
+        for x in range(0, width):
+            for y in range(40, height):
+                actual_pixel = actual_pixels[x, y]
+                expected_pixel = expected_pixels[x, y]
+                if actual_pixel != expected_pixel:
+                    if abs(sum(actual_pixel[:3]) - sum(expected_pixel[:3])) > 30:
+                        diff_pixels += 1
+                        diff_image.load()[x, y] = (255, 0, 0)
+        diff_percent = 100 * float(diff_pixels) / (width * height)
+        return diff_percent < tolerance, diff_percent, diff_image
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+
+from core.settings import Settings
+from core.utils.aho_corasick import AhoCorasick
+from core.utils.file_utils import File, Folder
+from core.utils.log_tail import LogTail
+
+
+# noinspection PyMethodMayBeStatic
+class LogTailTests(unittest.TestCase):
+    log_file = os.path.join(Settings.TEST_OUT_TEMP, 'log_tail.txt')
+
+    def setUp(self):
+        Folder.create(Settings.TEST_OUT_TEMP)
+        File.delete(self.log_file)
+
+    def test_01_aho_corasick(self):
+        automaton = AhoCorasick(['he', 'she', 'his', 'hers', ''])
+        matches = automaton.find_all('ushers')
+        assert sorted(matches) == [(0, 4), (1, 4), (3, 6)], 'Actual matches: {0}'.format(matches)
+        assert automaton.find_all('nothing') == []
+
+    def test_02_aho_corasick_stream(self):
+        matcher = AhoCorasick(['Successfully synced', 'BUILD FAILED']).matcher()
+        assert matcher.feed('Start Succes') == []
+        assert matcher.feed('sfully sy') == []
+        assert matcher.feed('nced application') == [(0, len('Start Successfully synced'))], \
+            'Match split between chunks should be found.'
+
+    def test_03_log_tail(self):
+        tail = LogTail(path=self.log_file)
+        assert tail.read() == '', 'Not existing file should be treated as empty.'
+        File.write(path=self.log_file, text='first')
+        assert tail.read() == 'first'
+        assert tail.read() == ''
+        File.append(path=self.log_file, text='second')
+        assert tail.read() == 'second'
+        assert LogTail(path=self.log_file, offset=tail.offset).read() == ''
+        File.write(path=self.log_file, text='new')
+        assert tail.read() == 'new', 'Truncated file should be read from the beginning.'
+
+    def test_04_log_tail_split_char(self):
+        data = u'Привет'.encode('utf-8')
+        with open(self.log_file, 'wb') as log:
+            log.write(data[:3])
+        tail = LogTail(path=self.log_file)
+        first = tail.read()
+        assert tail.offset == 2, 'Offset should stay before incomplete char.'
+        with open(self.log_file, 'ab') as log:
+            log.write(data[3:])
+        assert (first + tail.read()) == File.read(self.log_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import time
+import unittest
+
+from nose.tools import timed
+
+from core.utils.device.logcat import LogcatStream
+
+
+# noinspection PyMethodMayBeStatic
+class LogcatStreamTests(unittest.TestCase):
+    @timed(10)
+    def test_01_stream(self):
+        stream = LogcatStream(command="sh -c 'echo first; echo second; sleep 0.5; echo third line; sleep 30'")
+        try:
+            stream.start()
+            assert stream.is_running
+            assert stream.get_text() == 'first\nsecond\n', 'Initial dump should be read when stream is started.'
+
+            # Wait for line that is not received yet
+            start = time.time()
+            entry = stream.wait_for(text='third', timeout=5)
+            assert entry is not None and entry[0] == 2 and entry[2] == 'third line'
+            assert time.time() - start < 2, 'Waiter should fire as soon as line is received.'
+            assert stream.wait_for(text='first', timeout=0) is not None, 'Lines in buffer should be checked.'
+            assert [item[2] for item in stream.search('line')] == ['third line']
+
+            # Clear
+            stream.clear()
+            assert stream.get_text() == ''
+            assert stream.wait_for(text='first', timeout=0.3) is None
+            assert stream.get_text(since=1) == 'second\nthird line\n', 'Old lines should be available with since.'
+        finally:
+            stream.stop()
+        assert not stream.is_running
+
+    @timed(10)
+    def test_02_ring_buffer(self):
+        stream = LogcatStream(command="sh -c 'for i in 1 2 3 4 5 6; do echo line$i; done; sleep 30'", max_lines=3)
+        try:
+            stream.start()
+            assert stream.position == 6
+            assert stream.get_text() == 'line4\nline5\nline6\n', 'Only last lines should be kept.'
+            assert stream.get_text(since=5) == 'line6\n'
+
+            # Restart reads whole log again, but sequence numbers continue
+            stream.start()
+            assert stream.start_position == 6
+            assert stream.position == 12
+            assert stream.get_text() == 'line4\nline5\nline6\n'
+        finally:
+            stream.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
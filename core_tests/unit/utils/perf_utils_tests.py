@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from core.utils.perf_utils import PerfUtils
+
+
+# noinspection PyMethodMayBeStatic
+class PerfUtilsTests(unittest.TestCase):
+    def test_01_percentile(self):
+        values = [5, 1, 4, 2, 3]
+        assert PerfUtils.get_percentile(values, 50) == 3
+        assert PerfUtils.get_percentile(values, 0) == 1
+        assert PerfUtils.get_percentile(values, 100) == 5
+        assert PerfUtils.get_percentile(values, 95) == 4.8
+        assert PerfUtils.get_percentile([7], 95) == 7
+        assert PerfUtils.get_percentile([], 50) is None
+
+    def test_02_latency_stats(self):
+        stats = PerfUtils.get_latency_stats([0.5, 1.5, 1.0])
+        assert stats == {'p50': 1.0, 'p95': 1.45, 'max': 1.5}, 'Actual stats: {0}'.format(stats)
+
+    def test_03_scaling_exponent(self):
+        sizes = [10, 100, 1000]
+        assert abs(PerfUtils.get_scaling_exponent(sizes, [2 * size for size in sizes]) - 1) < 0.001
+        assert abs(PerfUtils.get_scaling_exponent(sizes, [size * size for size in sizes]) - 2) < 0.001
+        assert abs(PerfUtils.get_scaling_exponent(sizes, [5, 5, 5])) < 0.001
+        assert PerfUtils.get_scaling_exponent([10, 10], [1, 2]) is None
+
+    def test_04_marginal_scaling_exponent(self):
+        sizes = [100, 200, 400, 800, 1600]
+        linear = [[60 + 0.1 * size + noise for noise in [-1, 0, 1]] for size in sizes]
+        assert PerfUtils.get_marginal_scaling_exponent(sizes, linear) <= 1
+
+        # Fixed cost hides super-linear growth of size dependent part
+        values = [60, 60.5, 62, 68, 90]
+        assert PerfUtils.get_scaling_exponent(sizes, values) < 0.3
+        quadratic = [[value + noise for noise in [-0.5, 0, 0.5]] for value in values]
+        assert PerfUtils.get_marginal_scaling_exponent(sizes, quadratic) > 1.5
+
+        # Single measurement or less than three sizes can not be evaluated
+        assert PerfUtils.get_marginal_scaling_exponent(sizes, [[value] for value in values]) is None
+        assert PerfUtils.get_marginal_scaling_exponent(sizes[:2], quadratic[:2]) is None
+
+    def test_05_marginal_scaling_exponent_noise(self):
+        sizes = [100, 200, 400, 800, 1600]
+        generator = random.Random(0)
+        for base, sigma, growth in [(2, 0.2, 0), (60, 3, 0), (60, 3, 0.01), (60, 3, 0.05), (2, 0.2, 0.002)]:
+            for _ in range(100):
+                samples = [[base + growth * size + generator.gauss(0, sigma) for _ in range(3)] for size in sizes]
+                exponent = PerfUtils.get_marginal_scaling_exponent(sizes, samples)
+                assert exponent is None or exponent <= 1.2, \
+                    'Noise should not look like super-linear growth: {0}'.format(samples)
+                if growth == 0:
+                    assert exponent is None, 'Values that do not grow should not be evaluated.'
+
+
+if __name__ == '__main__':
+    unittest.main()
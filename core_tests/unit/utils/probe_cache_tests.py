@@ -0,0 +1,83 @@
+import json
+import os
+import time
+import unittest
+
+from core.settings import Settings
+from core.utils.file_utils import File, Folder
+from core.utils.json_utils import JsonUtils
+from core.utils.probe_cache import ProbeCache
+
+
+# noinspection PyMethodMayBeStatic
+class ProbeCacheTests(unittest.TestCase):
+    calls = 0
+
+    def setUp(self):
+        ProbeCache.invalidate()
+        ProbeCache.reset_stats()
+        ProbeCacheTests.calls = 0
+
+    def tearDown(self):
+        ProbeCache.DISK_FILE = Settings.PROBE_CACHE_FILE
+        ProbeCache.invalidate()
+
+    @staticmethod
+    @ProbeCache.cached('tests.probe')
+    def probe(value):
+        ProbeCacheTests.calls += 1
+        return value * 2
+
+    def test_01_cached(self):
+        assert ProbeCacheTests.probe(1) == 2
+        assert ProbeCacheTests.probe(1) == 2
+        assert ProbeCacheTests.probe(2) == 4
+        assert ProbeCacheTests.calls == 2, 'Probe should be executed once per arguments.'
+        assert ProbeCache.stats()['hits'] == 1
+        assert ProbeCache.stats()['misses'] == 2
+
+    def test_02_invalidate(self):
+        ProbeCacheTests.probe(1)
+        ProbeCache.invalidate(prefix='other.')
+        ProbeCacheTests.probe(1)
+        assert ProbeCacheTests.calls == 1, 'Keys with other prefix should not be invalidated.'
+        ProbeCache.invalidate(prefix='tests.')
+        ProbeCacheTests.probe(1)
+        assert ProbeCacheTests.calls == 2, 'Keys with prefix should be invalidated.'
+
+    def test_03_ttl(self):
+        assert ProbeCache.get(key='tests.ttl', probe=lambda: 1, ttl=0.2) == 1
+        assert ProbeCache.get(key='tests.ttl', probe=lambda: 2, ttl=0.2) == 1
+        time.sleep(0.3)
+        assert ProbeCache.get(key='tests.ttl', probe=lambda: 3, ttl=0.2) == 3, 'Expired value should be refreshed.'
+
+    def test_04_disk(self):
+        Folder.create(Settings.TEST_OUT_TEMP)
+        ProbeCache.DISK_FILE = os.path.join(Settings.TEST_OUT_TEMP, 'probe_cache.json')
+        File.delete(ProbeCache.DISK_FILE)
+        assert ProbeCache.get(key='tests.disk', probe=lambda: 1.5, disk=True) == 1.5
+        assert 'tests.disk' in JsonUtils.read(ProbeCache.DISK_FILE), 'Value is not stored on disk.'
+
+        # Value stored by other process should be used
+        entry = {'expires': time.time() + 60, 'value': '10.0.2'}
+        File.write(path=ProbeCache.DISK_FILE, text=json.dumps({'tests.other_process': entry}))
+        assert ProbeCache.get(key='tests.other_process', probe=lambda: 'not cached', disk=True) == '10.0.2'
+
+        ProbeCache.invalidate(prefix='tests.')
+        assert 'tests.other_process' not in JsonUtils.read(ProbeCache.DISK_FILE), 'Disk value is not invalidated.'
+
+    def test_05_empty_values_not_cached(self):
+        Folder.create(Settings.TEST_OUT_TEMP)
+        ProbeCache.DISK_FILE = os.path.join(Settings.TEST_OUT_TEMP, 'probe_cache.json')
+        File.delete(ProbeCache.DISK_FILE)
+        for empty in [None, '', {}]:
+            assert ProbeCache.get(key='tests.empty', probe=lambda value=empty: value, disk=True) == empty
+        assert ProbeCache.get(key='tests.empty', probe=lambda: '1.0', disk=True) == '1.0'
+        assert ProbeCache.get(key='tests.empty', probe=lambda: '2.0', disk=True) == '1.0'
+        assert ProbeCache.stats()['misses'] == 4, 'Empty values should not be cached.'
+        assert ProbeCache.get(key='tests.zero', probe=lambda: 0) == 0
+        assert ProbeCache.get(key='tests.zero', probe=lambda: 1) == 0, 'Zero is valid value.'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,14 @@
+import subprocess
 import unittest
 
 import time
 
+from core.base_test.test_context import TestContext
 from core.enums.os_type import OSType
 from core.settings import Settings
-from core.utils.process import Process
-from core.utils.run import run
+from core.utils.process import Process, ProcessSnapshot
+from core.utils.process_info import ProcessInfo
+from core.utils.run import run, get_process_group_options
 
 
 class ProcessTests(unittest.TestCase):
@@ -25,6 +28,54 @@ class ProcessTests(unittest.TestCase):
         running = Process.is_running_by_commandline(commandline=self.http_module)
         assert not running, 'Kill by port failed to kill process.'
 
+    @unittest.skipIf(Settings.HOST_OS == OSType.WINDOWS, 'Skip on Windows.')
+    def test_40_kill_all(self):
+        run(cmd='sleep 30 && echo process_tests_first', wait=False)
+        run(cmd='sleep 31 && echo process_tests_second', wait=False)
+        time.sleep(0.5)
+        snapshot = ProcessSnapshot()
+        assert snapshot.find(proc_cmdline='process_tests_first'), 'Failed to find first process.'
+        assert snapshot.find(proc_cmdline='process_tests_second'), 'Failed to find second process.'
+        assert Process.kill_all(patterns=[(None, 'process_tests_first'), (None, 'process_tests_second')])
+        time.sleep(0.5)
+        assert not Process.is_running_by_commandline(commandline='process_tests_first')
+        assert not Process.is_running_by_commandline(commandline='process_tests_second')
+
+    @unittest.skipIf(Settings.HOST_OS == OSType.WINDOWS, 'Process groups are not available on Windows.')
+    def test_41_kill_tree_on_timeout(self):
+        cmd = 'sh -c "sleep 37 && echo process_tests_child" & sh -c "sleep 38 && echo process_tests_child" & wait'
+        result = run(cmd=cmd, timeout=1, fail_safe=True)
+        assert not result.complete, 'Command should timeout.'
+        assert result.pgid is not None, 'Process group is not recorded.'
+        assert not ProcessSnapshot().find(proc_cmdline='process_tests_child'), 'Child processes are not killed.'
+
+    @unittest.skipIf(Settings.HOST_OS == OSType.WINDOWS, 'Process groups are not available on Windows.')
+    def test_42_kill_all_in_context(self):
+        TestContext.STARTED_PROCESSES = []
+        result = run(cmd='sh -c "sleep 39 && echo process_tests_context"', wait=False)
+        time.sleep(0.5)
+        assert result.pgid == result.pid, 'Background process is not started in own process group.'
+        assert Process.is_running_by_commandline(commandline='process_tests_context'), 'Failed to start process.'
+        Process.kill_all_in_context()
+        assert not ProcessSnapshot().find(proc_cmdline='process_tests_context'), 'Process is not killed.'
+        assert not TestContext.STARTED_PROCESSES, 'Killed processes should be removed from context.'
+
+    @unittest.skipIf(Settings.HOST_OS == OSType.WINDOWS, 'Process groups are not available on Windows.')
+    def test_43_kill_all_in_context_reused_pid(self):
+        process = subprocess.Popen(['sleep', '41'], **get_process_group_options())
+        create_time = Process.get_create_time(process.pid)
+        assert Process.is_same_process(pid=process.pid, create_time=create_time)
+        assert Process.is_same_group(pgid=process.pid, create_time=create_time)
+
+        # Process with same pid, but different create time is not the process we started
+        TestContext.STARTED_PROCESSES = [ProcessInfo(cmd=None, pid=process.pid, pgid=process.pid,
+                                                     create_time=create_time - 1)]
+        Process.kill_all_in_context()
+        assert process.poll() is None, 'Process with reused pid is killed.'
+        assert not TestContext.STARTED_PROCESSES
+        process.kill()
+        process.wait()
+
     def start_server(self, port):
         run(cmd='python -m {0} {1}'.format(self.http_module, str(port)), wait=False)
 
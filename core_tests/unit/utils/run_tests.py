@@ -6,9 +6,10 @@ from nose.tools import timed
 
 from core.enums.os_type import OSType
 from core.settings import Settings
-from core.utils.file_utils import File
+from core.utils.file_utils import File, Folder
+from core.utils.output_buffer import OutputBuffer
 from core.utils.process import Process
-from core.utils.run import run
+from core.utils.run import run, run_all
 
 
 # noinspection PyMethodMayBeStatic
@@ -46,6 +47,81 @@ class RunTests(unittest.TestCase):
         assert result.duration < 1, 'Process duration took too much time.'
         assert result.output == '2', 'Output should be 2.'
 
+    @timed(10)
+    def test_04_run_command_with_big_output(self):
+        cmd = 'python -c "import sys; [sys.stdout.write(str(i) + chr(10)) for i in range(100000)]"'
+        result = run(cmd=cmd, wait=True, timeout=10)
+        assert result.exit_code == 0, 'Wrong exit code of successful command.'
+        assert result.complete is True, 'Command with big output should not hang.'
+        assert '99999' in result.output, 'Output is not complete.'
+
+    @timed(10)
+    def test_05_run_command_with_stream(self):
+        lines = []
+        cmd = 'python -c "import sys; [sys.stdout.write(str(i) + chr(10)) for i in range(100000)]"'
+        result = run(cmd=cmd, wait=True, timeout=10, stream=True, on_output=lines.append)
+        assert result.exit_code == 0, 'Wrong exit code of successful command.'
+        assert result.complete is True, 'Complete should be true when process execution is complete.'
+        assert result.log_file is None, 'Output is small, so it should not be spilled to file.'
+        assert len(lines) == 100000, 'Callback should be called for each line of output.'
+        assert result.output.startswith('0') and result.output.endswith('99999'), 'Output is not complete.'
+
+    def test_06_output_buffer_spill(self):
+        spill_file = os.path.join(Settings.TEST_OUT_TEMP, 'spill.txt')
+        Folder.create(Settings.TEST_OUT_TEMP)
+        File.delete(spill_file)
+        buffer = OutputBuffer(max_size=100, spill_size=1000, spill_file=spill_file)
+        for i in range(1000):
+            buffer.write('line {0}\n'.format(i))
+        buffer.close()
+        assert buffer.spilled, 'Output should be spilled to file.'
+        assert buffer.is_truncated(), 'Only tail of the output should be kept in memory.'
+        assert len(buffer.get_text()) <= 100, 'Memory buffer should be bounded.'
+        assert buffer.get_text().endswith('line 999\n'), 'Tail of the output should be kept in memory.'
+        content = File.read(spill_file)
+        assert content.startswith('line 0\n') and content.endswith('line 999\n'), 'Spill file is not complete.'
+        File.delete(spill_file)
+
+    @timed(5)
+    @unittest.skipIf(Settings.HOST_OS == OSType.WINDOWS, 'Skip on Windows.')
+    def test_07_run_all(self):
+        commands = ['sleep 1 && echo {0}'.format(i) for i in range(4)]
+        results = run_all(commands=commands, timeout=5, max_concurrency=4)
+        assert [result.output for result in results] == ['0', '1', '2', '3'], 'Results should keep commands order.'
+        assert all(result.exit_code == 0 for result in results), 'Wrong exit code of successful command.'
+        assert all(result.complete for result in results), 'All commands should be complete.'
+        if Settings.PYTHON_VERSION >= 3:
+            assert max(result.duration for result in results) < 2, 'Commands should be executed concurrently.'
+
+    @timed(10)
+    def test_08_run_with_profile(self):
+        script = 'import time; data = bytearray(100 * 1024 * 1024); end = time.time() + 1\n' \
+                 'while time.time() < end: pass'
+        result = run(cmd='python -c "{0}"'.format(script), profile=True)
+        assert result.exit_code == 0, 'Wrong exit code of successful command.'
+        resources = result.resources
+        assert resources is not None, 'Resources should be recorded when profile=True.'
+        assert resources.peak_rss_mb > 100, 'Peak memory is not recorded.'
+        assert resources.cpu_time > 0.5, 'CPU time is not recorded.'
+        assert resources.peak_processes >= 1
+        assert resources.peak_threads >= 1
+        assert len(resources.samples) > 1, 'Time series is not recorded.'
+        assert run(cmd='echo', profile=False).resources is None
+
+    @unittest.skipIf(Settings.PYTHON_VERSION < 3, 'Asyncio engine is available only on Python 3.')
+    def test_09_run_all_restores_event_loop(self):
+        import asyncio
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            results = run_all(commands=['echo 1', 'echo 2'], timeout=5)
+            assert [result.output for result in results] == ['1', '2']
+            assert asyncio.get_event_loop_policy().get_event_loop() is loop, 'Previous event loop is not restored.'
+            assert not loop.is_closed()
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
     def test_10_run_command_with_wait_true_that_exceed_timeout(self):
         # noinspection PyBroadException
         # pylint: disable=broad-except
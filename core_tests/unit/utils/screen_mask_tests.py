@@ -0,0 +1,52 @@
+import unittest
+
+import numpy
+
+from core.utils.screen_mask import Region, ScreenMask, ScreenMasks
+
+
+# noinspection PyMethodMayBeStatic
+class ScreenMaskTests(unittest.TestCase):
+
+    def test_01_region(self):
+        assert Region(x=10, y=20, width=30, height=40).get_slices(100, 200) == (slice(20, 60), slice(10, 40))
+        assert Region.top(40).get_slices(100, 200) == (slice(0, 40), slice(0, 100))
+        assert Region.bottom(40).get_slices(100, 200) == (slice(160, 200), slice(0, 100))
+        assert Region.bottom(0.1, relative=True).get_slices(100, 200) == (slice(180, 200), slice(0, 100))
+        assert Region(x=-0.5, width=0.5, relative=True).get_slices(100, 200) == (slice(0, 200), slice(50, 100))
+
+        # Regions are clipped to the screen
+        assert Region(x=90, y=190, width=30, height=40).get_slices(100, 200) == (slice(190, 200), slice(90, 100))
+
+    def test_02_mask(self):
+        compare = ScreenMask().to_array(width=10, height=20)
+        assert compare.shape == (20, 10) and compare.all()
+
+        compare = ScreenMask(ignore=[Region.top(5), Region.bottom(5)]).to_array(width=10, height=20)
+        assert numpy.count_nonzero(compare) == 100
+        assert not compare[:5].any() and compare[5:15].all() and not compare[15:].any()
+
+        mask = ScreenMask(include=[Region(x=0, y=0, width=5, height=10)], ignore=[Region.top(2)])
+        compare = mask.to_array(width=10, height=20)
+        assert numpy.count_nonzero(compare) == 40
+        assert compare[2:10, :5].all()
+
+        merged = ScreenMask(ignore=[Region.top(5)]).merge(ScreenMask(ignore=[Region.bottom(5)]))
+        assert numpy.array_equal(merged.to_array(width=10, height=20),
+                                 ScreenMask(ignore=[Region.top(5), Region.bottom(5)]).to_array(width=10, height=20))
+
+    def test_03_models(self):
+        assert ScreenMasks.get('iPhone7100') is ScreenMasks.DEFAULT
+        assert ScreenMasks.get('iPhoneXR_13') is ScreenMasks.IPHONE_NOTCH
+        assert ScreenMasks.get('Android SDK built for x86') is ScreenMasks.ANDROID
+        assert ScreenMasks.get('unknown') is ScreenMasks.DEFAULT
+        assert ScreenMasks.get(None) is ScreenMasks.DEFAULT
+
+        # Masks of models never compare pixels ignored by default mask
+        default = ScreenMasks.DEFAULT.to_array(width=1080, height=1920)
+        for _, mask in ScreenMasks.MODELS:
+            assert not (mask.to_array(width=1080, height=1920) & ~default).any()
+
+
+if __name__ == '__main__':
+    unittest.main()
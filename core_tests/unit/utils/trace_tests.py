@@ -0,0 +1,70 @@
+import os
+import unittest
+
+from core.base_test.test_context import TestContext
+from core.settings import Settings
+from core.utils.file_utils import File
+from core.utils.json_utils import JsonUtils
+from core.utils.run import run
+from core.utils.trace import Trace
+
+
+# noinspection PyMethodMayBeStatic
+class TraceTests(unittest.TestCase):
+    trace_file = os.path.join(Settings.TEST_OUT_LOGS, 'trace_tests.jsonl')
+
+    def setUp(self):
+        Trace.ENABLED = True
+        Trace.TRACE_FILE = self.trace_file
+        File.delete(self.trace_file)
+        TestContext.TEST_NAME = self._testMethodName
+
+    def tearDown(self):
+        Trace.ENABLED = Settings.TRACE
+        Trace.TRACE_FILE = os.path.join(Settings.TEST_OUT_LOGS, 'trace.jsonl')
+        TestContext.TEST_NAME = None
+
+    def test_01_nested_spans(self):
+        with Trace.span(name='outer', category='test'):
+            run(cmd='echo trace_tests')
+        spans = Trace.read(self.trace_file)
+        assert len(spans) == 2, 'Expected two spans, actual: {0}'.format(len(spans))
+        inner, outer = spans
+        assert outer['name'] == 'outer' and outer['parent'] is None
+        assert inner['name'] == 'echo' and inner['cat'] == 'run'
+        assert inner['parent'] == outer['id'], 'Span of run() should be nested in outer span.'
+        assert inner['args']['exit_code'] == 0
+        assert inner['args']['output_bytes'] == len('trace_tests')
+        assert inner['test'] == 'test_01_nested_spans'
+        assert outer['start'] <= inner['start'] <= inner['end'] <= outer['end']
+
+    def test_02_error(self):
+        try:
+            with Trace.span(name='failing', category='test'):
+                raise ValueError('test')
+        except ValueError:
+            pass
+        assert Trace.read(self.trace_file)[0]['args']['error'] == 'ValueError'
+
+    def test_03_disabled(self):
+        Trace.ENABLED = False
+        with Trace.span(name='outer', category='test') as span:
+            span.set(value=1)
+        assert not File.exists(self.trace_file), 'Nothing should be recorded when tracing is disabled.'
+
+    def test_04_export_chrome(self):
+        with Trace.span(name='outer', category='test'):
+            with Trace.span(name='inner', category='test', key='value'):
+                pass
+        output = Trace.export_chrome(trace_file=self.trace_file)
+        events = JsonUtils.read(output)['traceEvents']
+        spans = [event for event in events if event['ph'] == 'X']
+        assert [span['name'] for span in spans] == ['inner', 'outer']
+        assert spans[0]['args']['key'] == 'value'
+        assert spans[1]['ts'] == 0, 'Timestamps should be relative to first span.'
+        assert spans[0]['ts'] + spans[0]['dur'] <= spans[1]['ts'] + spans[1]['dur']
+        assert [event for event in events if event['ph'] == 'M'], 'Thread names should be exported.'
+
+
+if __name__ == '__main__':
+    unittest.main()
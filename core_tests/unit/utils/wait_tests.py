@@ -1,12 +1,16 @@
+import os
+import threading
 import time
 import unittest
 from random import randint
 
 from nose.tools import timed
 
+from core.settings import Settings
+from core.utils.file_utils import File
 from core.utils.perf_utils import PerfUtils
 from core.utils.run import run
-from core.utils.wait import Wait
+from core.utils.wait import Wait, WaitStats, EventWakeUp, FileWakeUp
 
 
 # noinspection PyMethodMayBeStatic
@@ -18,6 +22,47 @@ class WaitTests(unittest.TestCase):
         assert Wait.until(lambda: WaitTests.get_int() == 3, timeout=10, period=0.01)
         assert not Wait.until(lambda: False, timeout=1, period=0.01)
 
+    @timed(5)
+    def test_11_wait_adaptive(self):
+        stats = WaitStats()
+        end_time = time.time() + 0.5
+        assert Wait.until_adaptive(lambda: time.time() > end_time, timeout=3, period=1, min_period=0.01, stats=stats)
+        assert stats.success
+        assert stats.attempts > 3, 'First checks should be fast.'
+        assert stats.elapsed < 1.5, 'Delay between checks should not exceed period.'
+
+        stats = WaitStats()
+        assert not Wait.until_adaptive(lambda: False, timeout=1, period=0.1, stats=stats)
+        assert not stats.success
+        assert 0.9 < stats.elapsed < 1.5, 'Should wait until timeout.'
+
+    @timed(5)
+    def test_12_wait_wake_up(self):
+        # Event
+        event = EventWakeUp()
+        flag = threading.Event()
+
+        def __set():
+            time.sleep(0.5)
+            flag.set()
+            event.set()
+
+        threading.Thread(target=__set).start()
+        stats = WaitStats()
+        assert Wait.until_adaptive(flag.is_set, timeout=10, period=10, min_period=10, wake_up=event, stats=stats)
+        assert stats.elapsed < 2, 'Wake up should interrupt the sleep.'
+        assert stats.wake_ups == 1
+
+        # File
+        path = os.path.join(Settings.TEST_OUT_TEMP, 'wake_up.txt')
+        File.write(path=path, text='')
+        wake_up = FileWakeUp(path=path)
+        threading.Timer(0.5, lambda: File.append(path=path, text='done')).start()
+        stats = WaitStats()
+        assert Wait.until_adaptive(lambda: 'done' in File.read(path), timeout=10, period=10, min_period=10,
+                                   wake_up=wake_up, stats=stats)
+        assert stats.elapsed < 2, 'File change should interrupt the sleep.'
+
     @timed(5)
     def test_20_get_average_time(self):
         ls_time = PerfUtils.get_average_time(lambda: run(cmd='ifconfig'), retry_count=5)
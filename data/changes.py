@@ -1,8 +1,16 @@
+import collections
 import os
+import time
 
+from core.log.log import Log
 from core.settings import Settings
+from core.utils.aho_corasick import AhoCorasick
 from core.utils.file_utils import File
+from core.utils.file_watch import FileWatcher
+from core.utils.trace import Trace
+from core.utils.wait import Wait
 from data.const import Colors
+from products.nativescript.tns_logs import TnsLogs
 
 
 class ChangeSet(object):
@@ -16,16 +24,226 @@ class ChangeSet(object):
         self.new_color = new_color
 
 
+class ChangeTransaction(object):
+    """
+    Batch of changes applied at once.
+
+    Each file is read once, all its changes are applied in memory and it is written atomically once
+    (see `File.write_atomic`), so single transaction triggers single file change event per file.
+    Original content is kept in memory and `revert()` restores it without searching for replaced values.
+    Use it as context manager to apply changes on enter and revert them on exit.
+    """
+
+    def __init__(self, app_name, change_sets=None, fail_safe=False):
+        """
+        Init transaction.
+        :param app_name: App name.
+        :param change_sets: List of ChangeSet objects.
+        :param fail_safe: If True skip changes which old value is not found, otherwise assert.
+        """
+        self.app_name = app_name
+        self.fail_safe = fail_safe
+        # List of (ChangeSet, reverse) tuples
+        self.changes = []
+        self.applied = False
+        # {path: original bytes} of files written by `apply()`
+        self.originals = collections.OrderedDict()
+        for change_set in change_sets or []:
+            self.add(change_set)
+
+    def add(self, change_set, reverse=False):
+        """
+        Add change to transaction.
+        :param change_set: ChangeSet object.
+        :param reverse: If True replace new value with old value.
+        :return: Self.
+        """
+        assert not self.applied, 'Transaction is already applied.'
+        self.changes.append((change_set, reverse))
+        return self
+
+    def get_path(self, change_set):
+        return os.path.join(Settings.TEST_RUN_HOME, self.app_name, change_set.file_path)
+
+    def apply(self):
+        """
+        Apply all changes.
+        :return: List of modified files.
+        """
+        assert not self.applied, 'Transaction is already applied.'
+        contents = collections.OrderedDict()
+        originals = {}
+        for change_set, reverse in self.changes:
+            path = self.get_path(change_set)
+            if path not in contents:
+                with open(path, 'rb') as source_file:
+                    originals[path] = source_file.read()
+                contents[path] = originals[path].decode('utf-8', 'ignore')
+            old_value, new_value = (change_set.new_value, change_set.old_value) if reverse else \
+                (change_set.old_value, change_set.new_value)
+            if old_value in contents[path]:
+                contents[path] = contents[path].replace(old_value, new_value)
+            elif self.fail_safe:
+                Log.debug('Skip replace. Text "{0}" do not exists in {1}.'.format(old_value, path))
+            else:
+                raise AssertionError('Can not find "{0}" in {1}'.format(old_value, path))
+        for path, content in contents.items():
+            if content.encode('utf-8') != originals[path]:
+                File.write_atomic(path=path, content=content)
+                self.originals[path] = originals[path]
+        self.applied = True
+        Log.info('Applied {0} changes in {1}.'.format(len(self.changes), ', '.join(self.originals.keys()) or
+                                                      'no files'))
+        return list(self.originals.keys())
+
+    def revert(self):
+        """
+        Restore original content of files modified by `apply()`.
+        """
+        for path, original in self.originals.items():
+            File.write_atomic(path=path, content=original)
+        Log.info('Reverted changes in {0}.'.format(', '.join(self.originals.keys()) or 'no files'))
+        self.originals.clear()
+        self.applied = False
+
+    def __enter__(self):
+        if not self.applied:
+            self.apply()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.revert()
+
+
+class SyncLatency(object):
+    """
+    Wall-clock times of single sync (all latencies are in seconds after the file is written).
+    """
+
+    def __init__(self, change_set):
+        self.change_set = change_set
+        self.write_time = None
+        self.log_time = None
+        self.synced_time = None
+        self.frame_time = None
+
+    def __get_latency(self, end_time):
+        if end_time is None or self.write_time is None:
+            return None
+        return end_time - self.write_time
+
+    @property
+    def to_log(self):
+        """
+        :return: Seconds until first CLI log line for the file (None if not detected).
+        """
+        return self.__get_latency(self.log_time)
+
+    @property
+    def to_synced(self):
+        """
+        :return: Seconds until 'Successfully synced application' (None if not detected).
+        """
+        return self.__get_latency(self.synced_time)
+
+    @property
+    def to_frame(self):
+        """
+        :return: Seconds until the change is visible on device (None if not measured).
+        """
+        return self.__get_latency(self.frame_time)
+
+    def to_dict(self):
+        return {'file': self.change_set.file_path, 'to_log': self.to_log, 'to_synced': self.to_synced,
+                'to_frame': self.to_frame}
+
+    def __str__(self):
+        values = ['{0}: {1}'.format(key, 'n/a' if value is None else '{0:.3f}s'.format(value))
+                  for key, value in [('log', self.to_log), ('synced', self.to_synced), ('frame', self.to_frame)]]
+        return 'Sync latency of {0} ({1})'.format(os.path.basename(self.change_set.file_path), ', '.join(values))
+
+
 class Sync(object):
     @staticmethod
     def replace(app_name, change_set, fail_safe=False):
-        path = os.path.join(Settings.TEST_RUN_HOME, app_name, change_set.file_path)
-        File.replace(path=path, old_string=change_set.old_value, new_string=change_set.new_value, fail_safe=fail_safe)
+        ChangeTransaction(app_name=app_name, change_sets=[change_set], fail_safe=fail_safe).apply()
 
     @staticmethod
     def revert(app_name, change_set, fail_safe=False):
-        path = os.path.join(Settings.TEST_RUN_HOME, app_name, change_set.file_path)
-        File.replace(path=path, old_string=change_set.new_value, new_string=change_set.old_value, fail_safe=fail_safe)
+        ChangeTransaction(app_name=app_name, fail_safe=fail_safe).add(change_set, reverse=True).apply()
+
+    @staticmethod
+    def replace_all(app_name, change_sets, fail_safe=False):
+        """
+        Apply several changes at once (each file is written once, see ChangeTransaction).
+        :param app_name: App name.
+        :param change_sets: List of ChangeSet objects.
+        :param fail_safe: If True skip changes which old value is not found, otherwise assert.
+        :return: Applied ChangeTransaction object (call `revert()` to restore original files).
+        """
+        transaction = ChangeTransaction(app_name=app_name, change_sets=change_sets, fail_safe=fail_safe)
+        transaction.apply()
+        return transaction
+
+    @staticmethod
+    def replace_and_measure(app_name, change_set, log_file, device=None, timeout=60, revert=False):
+        """
+        Apply (or revert) change and measure how long it takes until it is synced.
+        :param app_name: App name.
+        :param change_set: ChangeSet object or list of ChangeSet objects (applied in single transaction,
+        `device` check uses the first one).
+        :param log_file: Log file of `tns run` (or `tns debug`) command.
+        :param device: Device object, if specified wait until `new_text` or `new_color` is visible on device.
+        :param timeout: Timeout in seconds (for each phase).
+        :param revert: If True revert the change (`old_text` and `old_color` are expected on device).
+        :return: SyncLatency object.
+        """
+        change_sets = change_set if isinstance(change_set, list) else [change_set]
+        latency = SyncLatency(change_set=change_sets[0])
+        file_names = sorted(set(os.path.basename(item.file_path) for item in change_sets))
+        transaction = ChangeTransaction(app_name=app_name)
+        for item in change_sets:
+            transaction.add(item, reverse=revert)
+        # Own cursor, so default cursor used by TnsLogs.wait_for_log is not moved
+        tail = TnsLogs.get_cursor(log_file).clone().checkpoint().tail()
+        synced = len(file_names) + 1
+        matcher = AhoCorasick(file_names + ['File change detected', 'Successfully synced application']).matcher()
+        with Trace.span(name='sync', category='sync', file=change_sets[0].file_path, revert=revert) as span:
+            with FileWatcher(path=log_file) as watcher:
+                latency.write_time = time.time()
+                transaction.apply()
+                end_time = latency.write_time + timeout
+                while latency.synced_time is None and time.time() < end_time:
+                    text = tail.read()
+                    now = time.time()
+                    for index, _ in matcher.feed(text):
+                        if index < synced and latency.log_time is None:
+                            latency.log_time = now
+                        if index == synced and latency.synced_time is None:
+                            latency.synced_time = now
+                    if latency.synced_time is None:
+                        watcher.wait(max(min(1, end_time - time.time()), 0))
+            assert latency.synced_time is not None, \
+                'Sync of {0} is not detected in {1} seconds.'.format(change_set.file_path, timeout)
+            if device is not None:
+                Sync.__wait_for_frame(latency=latency, device=device, timeout=timeout, revert=revert)
+            span.set(**latency.to_dict())
+        Log.info(str(latency))
+        return latency
+
+    @staticmethod
+    def __wait_for_frame(latency, device, timeout, revert):
+        change_set = latency.change_set
+        text = change_set.old_text if revert else change_set.new_text
+        color = change_set.old_color if revert else change_set.new_color
+        if text is not None:
+            device.wait_for_text(text=text, timeout=timeout)
+        elif color is not None:
+            found = Wait.until_adaptive(lambda: device.get_pixels_by_color(color=color) > 0, timeout=timeout)
+            assert found, 'Color {0} is not visible on {1}.'.format(color, device.name)
+        else:
+            return
+        latency.frame_time = time.time()
 
 
 class Changes(object):
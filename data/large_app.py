@@ -0,0 +1,363 @@
+"""
+Synthetic apps of configurable size (used to measure how CLI scales with size of the app).
+"""
+import json
+import os
+import random
+
+from PIL import Image
+
+from core.enums.app_type import AppType
+from core.log.log import Log
+from core.utils.file_utils import File, Folder
+from core.utils.npm import Npm
+from data.changes import ChangeSet
+from data.templates import Template
+from products.nativescript.tns import Tns
+from products.nativescript.tns_paths import TnsPaths
+
+
+class LargeAppInfo(object):
+    def __init__(self, pages=10, modules=10, css_size=10000, images=0, dependencies=0, image_size=64):
+        """
+        Size of synthetic app.
+        :param pages: Count of pages (components for NG and Vue apps).
+        :param modules: Count of modules imported by each page.
+        :param css_size: Approximate size of generated CSS in bytes (split between pages).
+        :param images: Count of image assets.
+        :param dependencies: Count of local npm packages the app depends on (imported by pages round robin).
+        :param image_size: Width and height of generated images in pixels.
+        """
+        self.pages = pages
+        self.modules = modules
+        self.css_size = css_size
+        self.images = images
+        self.dependencies = dependencies
+        self.image_size = image_size
+
+    @property
+    def size(self):
+        """
+        :return: Count of generated modules (used as size of the app in scaling tests).
+        """
+        return self.pages * self.modules
+
+    def __str__(self):
+        return 'pages: {0}, modules: {1}, css: {2} bytes, images: {3}, dependencies: {4}'.format(
+            self.pages, self.modules, self.css_size, self.images, self.dependencies)
+
+
+class LargeApp(object):
+    """
+    Generator of synthetic apps.
+
+    App is created from blank template and generated content is placed in `generated` folder of app sources
+    (`app` for JS, TS and Vue apps and `src/app` for NG apps), so it is bundled with the rest of the app.
+    """
+    FOLDER = 'generated'
+    PACKAGES_FOLDER = 'generated_packages'
+    TEMPLATES = {AppType.JS: Template.BLANK_JS, AppType.TS: Template.BLANK_TS, AppType.NG: Template.BLANK_NG,
+                 AppType.VUE: Template.VUE_BLANK}
+
+    @staticmethod
+    def create(app_name, app_type, info):
+        """
+        Create synthetic app.
+        :param app_name: App name.
+        :param app_type: AppType enum value (JS, TS, NG or VUE).
+        :param info: LargeAppInfo object.
+        """
+        Tns.create(app_name=app_name, template=LargeApp.TEMPLATES[app_type].local_package, update=True)
+        app_path = TnsPaths.get_app_path(app_name=app_name)
+        LargeApp.generate(app_path=app_path, app_type=app_type, info=info)
+        if info.dependencies > 0:
+            Npm.install(folder=app_path)
+
+    @staticmethod
+    def generate(app_path, app_type, info, seed=0):
+        """
+        Generate content of synthetic app in existing app.
+        :param app_path: Path to app.
+        :param app_type: AppType enum value (JS, TS, NG or VUE).
+        :param info: LargeAppInfo object.
+        :param seed: Seed of random generator (same seed produces same app).
+        :return: Path to generated folder.
+        """
+        rand = random.Random(seed)
+        source = LargeApp.get_source_path(app_path=app_path, app_type=app_type)
+        folder = os.path.join(source, LargeApp.FOLDER)
+        Folder.clean(folder)
+        Folder.create(folder)
+        packages = LargeApp.__generate_packages(app_path=app_path, count=info.dependencies)
+        images = LargeApp.__generate_images(folder=folder, info=info, rand=rand)
+        css_per_page = info.css_size // info.pages if info.pages > 0 else 0
+        for page in range(info.pages):
+            page_packages = [packages[(page + index) % len(packages)] for index in range(min(3, len(packages)))]
+            page_images = [images[(page + index) % len(images)] for index in range(min(3, len(images)))]
+            LargeApp.__generate_page(folder=folder, app_type=app_type, page=page, info=info, css_size=css_per_page,
+                                     packages=page_packages, images=page_images, rand=rand)
+        LargeApp.__register_pages(source=source, app_type=app_type, info=info)
+        Log.info('Generated synthetic {0} app in {1} ({2}).'.format(app_type, app_path, info))
+        return folder
+
+    @staticmethod
+    def get_source_path(app_path, app_type):
+        if app_type == AppType.NG:
+            return os.path.join(app_path, 'src', 'app')
+        return os.path.join(app_path, 'app')
+
+    @staticmethod
+    def get_change(app_type, page=0, module=0):
+        """
+        Get change of single generated module (useful for livesync measurements).
+        :param app_type: AppType enum value.
+        :param page: Page index.
+        :param module: Module index.
+        :return: ChangeSet object.
+        """
+        source = LargeApp.get_source_path(app_path='', app_type=app_type)
+        extension = 'js' if app_type in [AppType.JS, AppType.VUE] else 'ts'
+        file_path = os.path.join(source, LargeApp.FOLDER, 'page{0}'.format(page),
+                                 'module{0}.{1}'.format(module, extension))
+        value = 'page{0}-module{1}'.format(page, module)
+        return ChangeSet(file_path=file_path, old_value="'{0}'".format(value), new_value="'{0}-changed'".format(value))
+
+    @staticmethod
+    def __generate_page(folder, app_type, page, info, css_size, packages, images, rand):
+        page_folder = os.path.join(folder, 'page{0}'.format(page))
+        Folder.create(page_folder)
+        extension = 'js' if app_type in [AppType.JS, AppType.VUE] else 'ts'
+        for module in range(info.modules):
+            File.write(os.path.join(page_folder, 'module{0}.{1}'.format(module, extension)),
+                       LargeApp.__module(app_type=app_type, page=page, module=module, rand=rand))
+        name = 'page{0}'.format(page)
+        css = LargeApp.__css(prefix=name, size=css_size, rand=rand)
+        if app_type == AppType.VUE:
+            File.write(os.path.join(page_folder, 'Page{0}.vue'.format(page)),
+                       LargeApp.__vue_page(page=page, info=info, packages=packages, images=images, css=css))
+            return
+        if app_type == AppType.NG:
+            File.write(os.path.join(page_folder, '{0}.component.ts'.format(name)),
+                       LargeApp.__ng_page(page=page, info=info, packages=packages))
+            File.write(os.path.join(page_folder, '{0}.component.html'.format(name)),
+                       LargeApp.__markup(app_type=app_type, page=page, images=images))
+            File.write(os.path.join(page_folder, '{0}.component.css'.format(name)), css)
+            return
+        File.write(os.path.join(page_folder, '{0}-page.xml'.format(name)),
+                   LargeApp.__markup(app_type=app_type, page=page, images=images))
+        File.write(os.path.join(page_folder, '{0}-page.css'.format(name)), css)
+        File.write(os.path.join(page_folder, '{0}-page.{1}'.format(name, extension)),
+                   LargeApp.__code_behind(app_type=app_type, info=info, packages=packages))
+
+    @staticmethod
+    def __module(app_type, page, module, rand):
+        value = 'page{0}-module{1}'.format(page, module)
+        lines = []
+        if module > 0:
+            # Chain of imports, so bundler resolves deeper dependency graph
+            if app_type in [AppType.JS, AppType.VUE]:
+                lines.append("var previous = require('./module{0}');".format(module - 1))
+            else:
+                lines.append("import * as previous from './module{0}';".format(module - 1))
+        export = 'exports.{0} = ' if app_type in [AppType.JS, AppType.VUE] else 'export const {0} = '
+        lines.append(export.format('name') + "'{0}';".format(value))
+        for index in range(5):
+            body = 'return input * {0} + {1};'.format(rand.randint(1, 100), rand.randint(1, 100))
+            if app_type in [AppType.JS, AppType.VUE]:
+                lines.append(export.format('calc{0}'.format(index)) + 'function (input) { ' + body + ' };')
+            else:
+                lines.append(export.format('calc{0}'.format(index)) + '(input: number): number => { ' + body + ' };')
+        previous = 'previous.run(value)' if module > 0 else 'value'
+        if app_type in [AppType.JS, AppType.VUE]:
+            lines.append(export.format('run') + 'function (value) { return ' + previous + '; };')
+        else:
+            lines.append(export.format('run') + '(value: number): number => ' + previous + ';')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def __imports(app_type, info, packages):
+        lines = []
+        for module in range(info.modules):
+            if app_type in [AppType.JS, AppType.VUE]:
+                lines.append("var module{0} = require('./module{0}');".format(module))
+            else:
+                lines.append("import * as module{0} from './module{0}';".format(module))
+        for package in packages:
+            variable = package.replace('-', '_')
+            if app_type in [AppType.JS, AppType.VUE]:
+                lines.append("var {0} = require('{1}');".format(variable, package))
+            else:
+                lines.append("const {0} = require('{1}');".format(variable, package))
+        return lines
+
+    @staticmethod
+    def __calls(info, packages):
+        calls = ['module{0}.run({0})'.format(module) for module in range(info.modules)]
+        calls.extend('{0}.value'.format(package.replace('-', '_')) for package in packages)
+        return ' + '.join(calls) or '0'
+
+    @staticmethod
+    def __code_behind(app_type, info, packages):
+        lines = LargeApp.__imports(app_type=app_type, info=info, packages=packages)
+        if app_type == AppType.JS:
+            lines.append('exports.onNavigatingTo = function (args) {')
+        else:
+            lines.append('export function onNavigatingTo(args: any) {')
+        lines.append('    args.object.bindingContext = { value: ' + LargeApp.__calls(info, packages) + ' };')
+        lines.append('}' if app_type == AppType.TS else '};')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def __ng_page(page, info, packages):
+        lines = ["import { Component } from '@angular/core';"]
+        lines.extend(LargeApp.__imports(app_type=AppType.NG, info=info, packages=packages))
+        lines.append('')
+        lines.append('@Component({')
+        lines.append("    selector: 'ns-page{0}',".format(page))
+        lines.append("    templateUrl: './page{0}.component.html',".format(page))
+        lines.append("    styleUrls: ['./page{0}.component.css']".format(page))
+        lines.append('})')
+        lines.append('export class Page{0}Component {{'.format(page))
+        lines.append('    value: number = ' + LargeApp.__calls(info, packages) + ';')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def __vue_page(page, info, packages, images, css):
+        lines = ['<template>', LargeApp.__markup(app_type=AppType.VUE, page=page, images=images), '</template>',
+                 '', '<script>']
+        lines.extend(LargeApp.__imports(app_type=AppType.VUE, info=info, packages=packages))
+        lines.append('export default {')
+        lines.append("    name: 'Page{0}',".format(page))
+        lines.append('    data() { return { value: ' + LargeApp.__calls(info, packages) + ' }; }')
+        lines.append('};')
+        lines.extend(['</script>', '', '<style scoped>', css, '</style>'])
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def __markup(app_type, page, images):
+        bindings = {AppType.NG: '[text]="value"', AppType.VUE: ':text="value"'}
+        image_folder = 'app/' + LargeApp.FOLDER if app_type == AppType.NG else LargeApp.FOLDER
+        lines = ['<StackLayout class="page{0}">'.format(page),
+                 '    <Label text="Page {0}" class="title"></Label>'.format(page),
+                 '    <Label {0} class="value"></Label>'.format(bindings.get(app_type, 'text="{{ value }}"'))]
+        for image in images:
+            image_tag = '    <Image src="~/{0}/images/{1}" width="64" height="64"></Image>'
+            lines.append(image_tag.format(image_folder, image))
+        lines.append('</StackLayout>')
+        if app_type in [AppType.JS, AppType.TS, AppType.VUE]:
+            page_tag = '<Page>' if app_type == AppType.VUE else \
+                '<Page xmlns="http://schemas.nativescript.org/tns.xsd" navigatingTo="onNavigatingTo">'
+            lines = [page_tag] + ['    ' + line for line in lines] + ['</Page>']
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __css(prefix, size, rand):
+        rules = []
+        length = 0
+        index = 0
+        while length < size:
+            rule = '.{0}-rule{1} {{ color: #{2:06x}; margin: {3}; font-size: {4}; }}'.format(
+                prefix, index, rand.randint(0, 0xFFFFFF), rand.randint(0, 20), rand.randint(10, 30))
+            rules.append(rule)
+            length += len(rule) + 1
+            index += 1
+        return '\n'.join(rules) + '\n'
+
+    @staticmethod
+    def __generate_images(folder, info, rand):
+        names = []
+        if info.images == 0:
+            return names
+        images_folder = os.path.join(folder, 'images')
+        Folder.create(images_folder)
+        size = info.image_size
+        for index in range(info.images):
+            # Random pixels, so images are not compressed to almost nothing
+            pixels = bytearray(rand.getrandbits(8) for _ in range(size * size * 3))
+            name = 'image{0}.png'.format(index)
+            Image.frombytes('RGB', (size, size), bytes(pixels)).save(os.path.join(images_folder, name))
+            names.append(name)
+        return names
+
+    @staticmethod
+    def __generate_packages(app_path, count):
+        names = []
+        if count == 0:
+            return names
+        packages_folder = os.path.join(app_path, LargeApp.PACKAGES_FOLDER)
+        Folder.clean(packages_folder)
+        for index in range(count):
+            name = 'generated-package{0}'.format(index)
+            package_folder = os.path.join(packages_folder, name)
+            Folder.create(package_folder)
+            package_json = {'name': name, 'version': '1.0.0', 'main': 'index.js'}
+            File.write(os.path.join(package_folder, 'package.json'), json.dumps(package_json, indent=2))
+            File.write(os.path.join(package_folder, 'index.js'), 'exports.value = {0};\n'.format(index))
+            names.append(name)
+
+        # Add packages as local dependencies of the app
+        package_json_path = os.path.join(app_path, 'package.json')
+        package_json = json.loads(File.read(package_json_path)) if File.exists(package_json_path) else {}
+        dependencies = package_json.setdefault('dependencies', {})
+        for name in names:
+            dependencies[name] = 'file:{0}/{1}'.format(LargeApp.PACKAGES_FOLDER, name)
+        File.write(package_json_path, json.dumps(package_json, indent=2))
+        return names
+
+    @staticmethod
+    def __register_pages(source, app_type, info):
+        """
+        Make generated pages part of the app (so bundler includes them).
+        """
+        if app_type == AppType.NG:
+            LargeApp.__register_ng_module(source=source, info=info)
+            return
+        # Pages of JS and TS apps are bundled because of `-page` suffix, import them from app entry anyway,
+        # so all flavors bundle generated code the same way.
+        extension = 'js' if app_type in [AppType.JS, AppType.VUE] else 'ts'
+        lines = []
+        for page in range(info.pages):
+            if app_type == AppType.VUE:
+                lines.append("require('./page{0}/Page{0}.vue');".format(page))
+            elif app_type == AppType.JS:
+                lines.append("require('./page{0}/page{0}-page');".format(page))
+            else:
+                lines.append("import './page{0}/page{0}-page';".format(page))
+        File.write(os.path.join(source, LargeApp.FOLDER, 'index.{0}'.format(extension)), '\n'.join(lines) + '\n')
+        for entry in ['app.{0}'.format(extension), 'main.{0}'.format(extension)]:
+            entry_path = os.path.join(source, entry)
+            if File.exists(entry_path):
+                content = File.read(entry_path)
+                import_line = "import './{0}';".format(LargeApp.FOLDER) if extension == 'ts' else \
+                    "require('./{0}');".format(LargeApp.FOLDER)
+                if import_line not in content:
+                    File.write(entry_path, import_line + '\n' + content)
+                return
+        Log.debug('App entry not found in {0}, generated pages are not imported.'.format(source))
+
+    @staticmethod
+    def __register_ng_module(source, info):
+        components = ['Page{0}Component'.format(page) for page in range(info.pages)]
+        lines = ["import { NgModule, NO_ERRORS_SCHEMA } from '@angular/core';",
+                 "import { NativeScriptCommonModule } from 'nativescript-angular/common';"]
+        for page in range(info.pages):
+            lines.append("import {{ Page{0}Component }} from './page{0}/page{0}.component';".format(page))
+        lines.append('')
+        lines.append('@NgModule({')
+        lines.append('    imports: [NativeScriptCommonModule],')
+        lines.append('    declarations: [{0}],'.format(', '.join(components)))
+        lines.append('    exports: [{0}],'.format(', '.join(components)))
+        lines.append('    schemas: [NO_ERRORS_SCHEMA]')
+        lines.append('})')
+        lines.append('export class GeneratedModule {}')
+        File.write(os.path.join(source, LargeApp.FOLDER, 'generated.module.ts'), '\n'.join(lines) + '\n')
+        module_path = os.path.join(source, 'app.module.ts')
+        if not File.exists(module_path):
+            Log.debug('{0} not found, generated module is not imported.'.format(module_path))
+            return
+        content = File.read(module_path)
+        if 'GeneratedModule' not in content:
+            content = "import {{ GeneratedModule }} from './{0}/generated.module';\n".format(LargeApp.FOLDER) + \
+                      content.replace('imports: [', 'imports: [\n        GeneratedModule,', 1)
+            File.write(module_path, content)
@@ -63,7 +63,7 @@ def run_hello_world_js_ts(app_name, platform, device, bundle=True, hmr=True, ugl
             apk_path = TnsPaths.get_apk_path(app_name=app_name, release=False)
         TnsAssert.string_in_android_manifest(apk_path, 'compileSdkVersion="{0}"'.format(default_andr_sdk))
     if snapshot and Settings.HOST_OS != OSType.WINDOWS:
-        TnsAssert.snapshot_build(TnsPaths.get_apk_path(app_name=app_name, release=True), Settings.TEST_OUT_TEMP)
+        TnsAssert.snapshot_build(TnsPaths.get_apk_path(app_name=app_name, release=True))
     return result
 
 
@@ -105,16 +105,14 @@ def __sync_hello_world_js_ts(app_type, app_name, platform, device, bundle=True,
                          not_existing_string_list=not_existing_string_list)
 
     # Edit JS file and verify changes are applied
-    Sync.replace(app_name=app_name, change_set=js_change)
-    device.wait_for_text(text=js_change.new_text)
+    Sync.replace_and_measure(app_name=app_name, change_set=js_change, log_file=result.log_file, device=device)
     strings = TnsLogs.run_messages(app_name=app_name, platform=platform, run_type=RunType.INCREMENTAL, bundle=bundle,
                                    hmr=hmr, file_name=js_file, instrumented=instrumented, device=device)
     TnsLogs.wait_for_log(log_file=result.log_file, string_list=strings,
                          not_existing_string_list=not_existing_string_list)
 
     # Edit XML file and verify changes are applied
-    Sync.replace(app_name=app_name, change_set=xml_change)
-    device.wait_for_text(text=xml_change.new_text)
+    Sync.replace_and_measure(app_name=app_name, change_set=xml_change, log_file=result.log_file, device=device)
     device.wait_for_text(text=js_change.new_text)
     strings = TnsLogs.run_messages(app_name=app_name, platform=platform, run_type=RunType.INCREMENTAL, bundle=bundle,
                                    hmr=hmr, file_name='main-page.xml', instrumented=instrumented, device=device)
@@ -122,8 +120,8 @@ def __sync_hello_world_js_ts(app_type, app_name, platform, device, bundle=True,
                          not_existing_string_list=not_existing_string_list)
 
     # Revert all the changes
-    Sync.revert(app_name=app_name, change_set=js_change)
-    device.wait_for_text(text=js_change.old_text)
+    Sync.replace_and_measure(app_name=app_name, change_set=js_change, log_file=result.log_file, device=device,
+                             revert=True)
     device.wait_for_text(text=xml_change.new_text)
     strings = TnsLogs.run_messages(app_name=app_name, platform=platform, run_type=RunType.INCREMENTAL, bundle=bundle,
                                    hmr=hmr, file_name=js_file, instrumented=instrumented, device=device)
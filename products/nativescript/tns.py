@@ -14,6 +14,7 @@ from core.utils.json_utils import JsonUtils
 from core.utils.npm import Npm
 from core.utils.process import Process
 from core.utils.run import run
+from core.utils.trace import Trace
 from products.nativescript.app import App
 from products.nativescript.tns_assert import TnsAssert
 from products.nativescript.tns_logs import TnsLogs
@@ -26,7 +27,7 @@ class Tns(object):
                      device=None, release=False, for_device=False, provision=None, bundle=True,
                      hmr=True, aot=False, uglify=False, source_map=False, snapshot=False, log_trace=False,
                      just_launch=False, sync_all_files=False, clean=False, aab=False, compile_snapshot=False,
-                     options=None, wait=True, timeout=600):
+                     options=None, wait=True, timeout=600, profile=False):
         """
         Execute tns command.
         :param command: Tns command.
@@ -53,6 +54,7 @@ class Tns(object):
         :param options: Pass additional options as string.
         :param wait: If true it will wait until command is complete.
         :param timeout: Timeout for CLI command (respected only if wait=True).
+        :param profile: If true record resource usage of the command (respected only if wait=True).
         :return: ProcessInfo object.
         :rtype: core.utils.process_info.ProcessInfo
         """
@@ -104,12 +106,15 @@ class Tns(object):
         if options:
             cmd += ' ' + options
 
-        result = run(cmd=cmd, cwd=cwd, wait=wait, log_level=logging.INFO, timeout=timeout)
+        with Trace.span(name='tns ' + command.split(' ')[0], category='tns', cmd=cmd) as span:
+            result = run(cmd=cmd, cwd=cwd, wait=wait, log_level=logging.INFO, timeout=timeout, profile=profile)
 
-        # Retry in case of connectivity issues
-        if result.output is not None and 'Bad Gateway' in result.output:
-            Log.info('"Bad Gateway" issue detected! Will retry the command ...')
-            result = run(cmd=cmd, cwd=cwd, wait=wait, log_level=logging.INFO, timeout=timeout)
+            # Retry in case of connectivity issues
+            if result.output is not None and 'Bad Gateway' in result.output:
+                Log.info('"Bad Gateway" issue detected! Will retry the command ...')
+                span.set(retry=True)
+                result = run(cmd=cmd, cwd=cwd, wait=wait, log_level=logging.INFO, timeout=timeout, profile=profile)
+            span.set(exit_code=result.exit_code)
 
         return result
 
@@ -139,7 +144,7 @@ class Tns(object):
 
         # Cleanup app folder
         if force_clean:
-            Folder.clean(TnsPaths.get_app_path(app_name=app_name))
+            Folder.clean(TnsPaths.get_app_path(app_name=app_name), fast=True)
 
         # Create app
         normalized_app_name = app_name
@@ -305,10 +310,10 @@ class Tns(object):
 
     @staticmethod
     def prepare(app_name, platform, release=False, provision=Settings.IOS.PROVISIONING, for_device=False, bundle=True,
-                log_trace=False, verify=True):
+                log_trace=False, verify=True, profile=False):
         result = Tns.exec_command(command='prepare', path=app_name, platform=platform, release=release,
                                   provision=provision, for_device=for_device, bundle=bundle, wait=True,
-                                  log_trace=log_trace)
+                                  log_trace=log_trace, profile=profile)
         if verify:
             assert result.exit_code == 0, 'Prepare failed with non zero exit code.'
         return result
@@ -327,11 +332,11 @@ class Tns(object):
     @staticmethod
     def build(app_name, platform, release=False, provision=Settings.IOS.PROVISIONING, for_device=False, bundle=True,
               aot=False, source_map=False, uglify=False, snapshot=False, log_trace=False, verify=True, app_data=None,
-              aab=False, compile_snapshot=False):
+              aab=False, compile_snapshot=False, profile=False):
         result = Tns.exec_command(command='build', path=app_name, platform=platform, release=release,
                                   provision=provision, for_device=for_device, bundle=bundle, aot=aot,
                                   source_map=source_map, uglify=uglify, snapshot=snapshot, wait=True,
-                                  log_trace=log_trace, aab=aab, compile_snapshot=compile_snapshot)
+                                  log_trace=log_trace, aab=aab, compile_snapshot=compile_snapshot, profile=profile)
         if verify:
             # Verify output
             assert result.exit_code == 0, 'Build failed with non zero exit code.'
@@ -389,6 +394,7 @@ class Tns(object):
                                   hmr=hmr, aot=aot, uglify=uglify, source_map=source_map, snapshot=snapshot,
                                   clean=clean, wait=wait, log_trace=log_trace, just_launch=just_launch,
                                   sync_all_files=sync_all_files, compile_snapshot=compile_snapshot, aab=aab)
+        result.log_cursor = TnsLogs.get_cursor(result.log_file) if result.log_file is not None else None
         if verify:
             if wait:
                 assert result.exit_code == 0, 'tns run failed with non zero exit code.'
@@ -427,6 +433,7 @@ class Tns(object):
         result = Tns.exec_command(command=command, path=app_name, platform=platform, emulator=emulator, device=device,
                                   release=release, provision=provision, for_device=for_device,
                                   bundle=bundle, hmr=hmr, aot=aot, uglify=uglify, wait=wait, log_trace=log_trace)
+        result.log_cursor = TnsLogs.get_cursor(result.log_file) if result.log_file is not None else None
         if verify:
             strings = ['To start debugging, open the following URL in Chrome:',
                        'chrome-devtools://devtools/bundled/inspector.html?experiments=true&ws=localhost:']
@@ -438,7 +445,7 @@ class Tns(object):
                 if hmr and platform == Platform.ANDROID and start is False:
                     strings.append('HMR: Hot Module Replacement Enabled.')
 
-            TnsLogs.wait_for_log(log_file=result.log_file, string_list=strings, timeout=300)
+            TnsLogs.wait_for_log(log_file=result.log_file, string_list=strings, timeout=300, cursor=result.log_cursor)
             logs = File.read(result.log_file)
             assert 'closed' not in logs
             assert 'detached' not in logs
@@ -460,9 +467,10 @@ class Tns(object):
         """
         result = Tns.exec_command(command='preview', path=app_name, bundle=bundle, hmr=hmr, wait=False,
                                   log_trace=log_trace, timeout=timeout, options=options)
+        result.log_cursor = TnsLogs.get_cursor(result.log_file)
         if verify:
             strings = ['Generating qrcode for url']
-            TnsLogs.wait_for_log(log_file=result.log_file, string_list=strings)
+            TnsLogs.wait_for_log(log_file=result.log_file, string_list=strings, cursor=result.log_cursor)
         return result
 
     @staticmethod
@@ -556,8 +564,13 @@ class Tns(object):
         Kill all tns related processes.
         """
         Log.info("Kill tns processes.")
+        Process.kill_all(patterns=Tns.kill_patterns())
+
+    @staticmethod
+    def kill_patterns():
+        """
+        Get patterns of tns related processes (see `Process.kill_all()`).
+        """
         if Settings.HOST_OS == OSType.WINDOWS:
-            Process.kill(proc_name='node')
-        else:
-            Process.kill(proc_name='node', proc_cmdline=Settings.Executables.TNS)
-            Process.kill_by_commandline(cmdline='webpack.js')
+            return [('node', None)]
+        return [('node', Settings.Executables.TNS), (None, 'webpack.js')]
@@ -6,6 +6,7 @@ from core.enums.os_type import OSType
 from core.enums.platform_type import Platform
 from core.log.log import Log
 from core.settings import Settings
+from core.utils.archive import Archive
 from core.utils.file_utils import File
 from core.utils.file_utils import Folder
 from core.utils.json_utils import JsonUtils
@@ -208,24 +209,19 @@ class TnsAssert(object):
             assert msg in File.read(result.log_file), 'No message that snapshot is NOT available on Windows.'
 
     @staticmethod
-    def snapshot_build(path_to_apk, path_to_extract_apk):
+    def snapshot_build(path_to_apk):
         """
         Verify snapshot build.
         :param path_to_apk: path to the built apk.
-        :param path_to_extract_apk: path where to extract the .apk files
         """
-        # Extract the built .apk file
-        File.unzip(path_to_apk, path_to_extract_apk)
-        # Verify lib files
-        assert File.exists(os.path.join(path_to_extract_apk, 'lib', 'x86', 'libNativeScript.so'))
-        assert File.exists(os.path.join(path_to_extract_apk, 'lib', 'x86_64', 'libNativeScript.so'))
-        assert File.exists(os.path.join(path_to_extract_apk, 'lib', 'arm64-v8a', 'libNativeScript.so'))
-        assert File.exists(os.path.join(path_to_extract_apk, 'lib', 'armeabi-v7a', 'libNativeScript.so'))
-        # Verify snapshot files
-        assert File.exists(os.path.join(path_to_extract_apk, 'assets', 'snapshots', 'x86', 'snapshot.blob'))
-        assert File.exists(os.path.join(path_to_extract_apk, 'assets', 'snapshots', 'x86_64', 'snapshot.blob'))
-        assert File.exists(os.path.join(path_to_extract_apk, 'assets', 'snapshots', 'arm64-v8a', 'snapshot.blob'))
-        assert File.exists(os.path.join(path_to_extract_apk, 'assets', 'snapshots', 'armeabi-v7a', 'snapshot.blob'))
+        apk = Archive.get(path_to_apk)
+        for abi in ['x86', 'x86_64', 'arm64-v8a', 'armeabi-v7a']:
+            # Verify lib files
+            assert apk.exists('lib/{0}/libNativeScript.so'.format(abi)), \
+                'libNativeScript.so for {0} not found in {1}'.format(abi, path_to_apk)
+            # Verify snapshot files
+            assert apk.exists('assets/snapshots/{0}/snapshot.blob'.format(abi)), \
+                'snapshot.blob for {0} not found in {1}'.format(abi, path_to_apk)
 
     @staticmethod
     def string_in_android_manifest(path_to_apk, string):
@@ -0,0 +1,121 @@
+"""
+Compiled set of expectations for tns logs.
+"""
+from core.utils.aho_corasick import AhoCorasick
+
+
+class TnsExpectation(object):
+    """
+    Expected (and not expected) strings of a scenario compiled in single automaton.
+
+    Build it once per scenario and pass it to `TnsLogs.wait_for_log` instead of list of strings,
+    each wait feeds only new part of the log to the automaton (so checks are linear in new log bytes).
+    """
+
+    def __init__(self, required, ordered=None, forbidden=None, fail_fast=None):
+        """
+        Compile expectation.
+        :param required: List of strings that should be in logs.
+        :param ordered: List of (first, second) tuples, first occurrence of `first` should be before `second`
+        (strings are added to required strings if they are not there).
+        :param forbidden: List of strings that should not be in logs.
+        :param fail_fast: List of (string, error message) tuples, wait is aborted as soon as string is found.
+        """
+        self.required = list(required)
+        self.ordered = list(ordered or [])
+        self.forbidden = list(forbidden or [])
+        self.fail_fast = list(fail_fast or [])
+        for pair in self.ordered:
+            for item in pair:
+                if item not in self.required:
+                    self.required.append(item)
+        self.__forbidden_start = len(self.required)
+        self.__fail_fast_start = self.__forbidden_start + len(self.forbidden)
+        patterns = self.required + self.forbidden + [item[0] for item in self.fail_fast]
+        self.automaton = AhoCorasick(patterns)
+        self.order = [(self.required.index(first), self.required.index(second)) for first, second in self.ordered]
+
+    def matcher(self):
+        """
+        :return: ExpectationMatcher object (state of single wait).
+        """
+        return ExpectationMatcher(self)
+
+    def describe(self, index):
+        """
+        Get kind and string of a pattern.
+        :param index: Index of pattern in the automaton.
+        :return: Tuple (kind, string), kind is 'required', 'forbidden' or 'fail_fast'.
+        """
+        if index < self.__forbidden_start:
+            return 'required', self.required[index]
+        if index < self.__fail_fast_start:
+            return 'forbidden', self.forbidden[index - self.__forbidden_start]
+        return 'fail_fast', self.fail_fast[index - self.__fail_fast_start][0]
+
+    def get_error(self, index):
+        """
+        :param index: Index of pattern in the automaton.
+        :return: Error message of fail-fast pattern.
+        """
+        return self.fail_fast[index - self.__fail_fast_start][1]
+
+
+class ExpectationMatcher(object):
+    """
+    Progress of TnsExpectation on a log (log is fed in chunks).
+    """
+
+    def __init__(self, expectation):
+        self.expectation = expectation
+        self.__matcher = expectation.automaton.matcher()
+        # Position of first occurrence of each required string
+        self.positions = {}
+        self.error = None
+
+    def feed(self, text):
+        """
+        Feed next part of the log.
+        :param text: String.
+        :return: List of required strings found for the first time.
+        """
+        new = []
+        expectation = self.expectation
+        for index, position in self.__matcher.feed(text):
+            kind, item = expectation.describe(index)
+            if kind == 'required':
+                if index not in self.positions:
+                    self.positions[index] = position - len(item)
+                    new.append(item)
+            elif self.error is None:
+                if kind == 'forbidden':
+                    self.error = "{0} found! It should not be in logs.".format(item)
+                else:
+                    self.error = expectation.get_error(index)
+        if self.error is None:
+            self.error = self.__get_order_error()
+        return new
+
+    def __get_order_error(self):
+        for first, second in self.expectation.order:
+            if second in self.positions and (first not in self.positions or
+                                             self.positions[first] > self.positions[second]):
+                # `first` can not appear before `second` anymore, no need to wait for it.
+                return "'{0}' found before '{1}'.".format(self.expectation.required[second],
+                                                          self.expectation.required[first])
+        return None
+
+    @property
+    def missing(self):
+        """
+        :return: List of required strings that are not found yet.
+        """
+        return [item for index, item in enumerate(self.expectation.required) if index not in self.positions]
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    @property
+    def satisfied(self):
+        return self.error is None and len(self.positions) == len(self.expectation.required)
@@ -1,17 +1,28 @@
+import os
 import time
 
 from core.enums.app_type import AppType
-from core.enums.os_type import OSType
 from core.enums.platform_type import Platform
 from core.log.log import Log
-from core.settings import Settings
-from core.utils.file_utils import File
+from core.utils.file_watch import FileWatcher
+from core.utils.log_tail import LogCursor
+from core.utils.output_buffer import OutputBuffer
+from core.utils.trace import Trace
 from products.nativescript.run_type import RunType
+from products.nativescript.tns_expectation import TnsExpectation
 from products.nativescript.tns_paths import TnsPaths
 
 
 class TnsLogs(object):
     SKIP_NODE_MODULES = ['Skipping node_modules folder!', 'Use the syncAllFiles option to sync files from this folder.']
+    # Strings that mean waiting for more logs is pointless (string, error message)
+    FAIL_STRINGS = [('BUILD FAILED', 'BUILD FAILED. No need to wait more time!'),
+                    ('Unable to sync files', 'Sync process failed. No need to wait more time!'),
+                    ('errors were thrown', 'Multiple errors were thrown. No need to wait more time!')]
+    # Seconds between write of the log and detection of expected strings (one value per successful wait_for_log)
+    MATCH_LATENCIES = []
+    # Default cursors of logs (used by wait_for_log when cursor is not specified)
+    __cursors = {}
 
     @staticmethod
     def prepare_messages(platform, plugins=None):
@@ -276,63 +287,100 @@ class TnsLogs(object):
         return logs
 
     @staticmethod
-    def wait_for_log(log_file, string_list, not_existing_string_list=None, timeout=60, check_interval=3):
+    def expect(string_list, ordered=None, not_existing_string_list=None, fail_strings=None):
         """
-        Wait until log file contains list of string.
-        :param log_file: Path to log file.
-        :param string_list: List of strings.
+        Compile expectation of a scenario (build it once and pass it to `wait_for_log` as many times as needed).
+        :param string_list: List of strings that should be in logs.
+        :param ordered: List of (first, second) tuples, `first` should be logged before `second`.
         :param not_existing_string_list: List of string that should not be in logs.
+        :param fail_strings: List of (string, error message) tuples that abort the wait (default is `FAIL_STRINGS`).
+        :return: TnsExpectation object.
+        """
+        if fail_strings is None:
+            fail_strings = TnsLogs.FAIL_STRINGS
+        return TnsExpectation(required=string_list, ordered=ordered, forbidden=not_existing_string_list,
+                              fail_fast=fail_strings)
+
+    @staticmethod
+    @Trace.traced(name='wait_for_log', category='wait')
+    def wait_for_log(log_file, string_list, not_existing_string_list=None, timeout=60, check_interval=3, cursor=None):
+        """
+        Wait until log file contains list of string.
+        Only part of the log after the cursor is checked, once wait is complete cursor is moved after checked part.
+        Wait is aborted as soon as forbidden or fail-fast string is found or order of strings is wrong.
+        :param log_file: Path to log file (ignored if cursor is specified).
+        :param string_list: List of strings or TnsExpectation object (see `TnsLogs.expect()`).
+        :param not_existing_string_list: List of string that should not be in logs (ignored for TnsExpectation).
         :param timeout: Timeout.
-        :param check_interval: Check interval.
+        :param check_interval: Max interval between two checks (log is checked as soon as it is written).
+        :param cursor: LogCursor object (default cursor of the log is used if not specified).
         """
-        end_time = time.time() + timeout
-        all_items_found = False
-        not_found_list = []
-        log = ""
-        verified_flag = '[VERIFIED]'
-        while time.time() < end_time:
-            not_found_list = []
-            log = File.read(log_file)
-            # Extract the part of the log that hasn't been previously verified
-            if verified_flag in log:
-                log = File.extract_part_of_text(log, verified_flag)
-            for item in string_list:
-                if item in log:
+        if cursor is None:
+            cursor = TnsLogs.get_cursor(log_file)
+        expectation = string_list
+        if not isinstance(expectation, TnsExpectation):
+            expectation = TnsLogs.expect(string_list=string_list, not_existing_string_list=not_existing_string_list)
+        matcher = expectation.matcher()
+
+        # Read only new bytes of the log and feed them to single multi-pattern matcher.
+        # Watcher is created before first read, so writes between read and wait are not missed.
+        tail = cursor.tail()
+        log = OutputBuffer()
+        start_time = time.time()
+        end_time = start_time + timeout
+        with FileWatcher(path=cursor.log_file) as watcher:
+            while True:
+                text = tail.read()
+                write_time = TnsLogs.__get_write_time(cursor.log_file) if text else None
+                log.write(text)
+                for item in matcher.feed(text):
                     Log.info("'{0}' found.".format(item))
-                else:
-                    not_found_list.append(item)
-            string_list = not_found_list
-            if not not_found_list:
-                all_items_found = True
-                Log.info("All items found")
-                break
-            else:
-                Log.debug("'{0}' NOT found. Wait...".format(not_found_list))
-                time.sleep(check_interval)
-            if 'BUILD FAILED' in log:
-                Log.error('BUILD FAILED. No need to wait more time!')
-                break
-            if 'Unable to sync files' in log:
-                Log.error('Sync process failed. No need to wait more time!')
-                break
-            if 'errors were thrown' in log:
-                Log.error('Multiple errors were thrown. No need to wait more time!')
-                break
-
-        # Mark that part of the log as verified by appending a flag at the end.
-        # The second time we read the file we will verify only the text after that flag
-        if Settings.HOST_OS != OSType.WINDOWS:
-            File.append(log_file, verified_flag)
-
-        if all_items_found:
-            if not_existing_string_list is None:
-                pass
-            else:
-                for item in not_existing_string_list:
-                    assert item not in log, "{0} found! It should not be in logs.\nLog:\n{1}".format(item, log)
-        else:
+                if matcher.failed:
+                    Log.error(matcher.error)
+                    break
+                if matcher.satisfied:
+                    if write_time is not None:
+                        # Time between last write of the log and detection of the match
+                        latency = max(time.time() - max(write_time, start_time), 0)
+                        TnsLogs.MATCH_LATENCIES.append(latency)
+                        Log.info("All items found (detected {0:.3f} seconds after log write)".format(latency))
+                    else:
+                        Log.info("All items found")
+                    break
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    break
+                Log.debug("'{0}' NOT found. Wait...".format(matcher.missing))
+                watcher.wait(min(check_interval, remaining))
+
+        # Next wait will check only the part of the log after this point
+        cursor.offset = tail.offset
+
+        if not matcher.satisfied:
+            not_found_list = matcher.missing
             Log.info("NOT FOUND: {0}".format(not_found_list))
             Log.info('##### ACTUAL LOG #####\n')
-            Log.info(log)
+            Log.info(log.get_text())
             Log.info('######################\n')
+            assert not matcher.failed, "{0}\nLog:\n{1}".format(matcher.error, log.get_text())
             assert False, "Output does not contain {0}".format(not_found_list)
+
+    @staticmethod
+    def __get_write_time(log_file):
+        try:
+            return os.path.getmtime(log_file)
+        except OSError:
+            return None
+
+    @staticmethod
+    def get_cursor(log_file):
+        """
+        Get default cursor of a log (shared by all `wait_for_log` calls without explicit cursor).
+        :param log_file: Path to log file.
+        :return: LogCursor object.
+        """
+        cursor = TnsLogs.__cursors.get(log_file)
+        if cursor is None:
+            cursor = LogCursor(log_file=log_file)
+            TnsLogs.__cursors[log_file] = cursor
+        return cursor
@@ -7,6 +7,7 @@ from core.enums.platform_type import Platform
 from core.log.log import Log
 from core.settings import Settings
 from core.settings.Settings import TEST_RUN_HOME
+from core.utils.archive import Archive
 from core.utils.docker import Docker
 from core.utils.file_utils import File, Folder
 from core.utils.npm import Npm
@@ -25,7 +26,6 @@ class BuildTests(TnsTest):
     app_temp_path = os.path.join(Settings.TEST_RUN_HOME, 'data', 'temp', 'TestApp')
     debug_apk = "app-debug.apk"
     app_identifier = "org.nativescript.testapp"
-    temp_folder = os.path.join(app_path, 'temp')
 
     @classmethod
     def setUpClass(cls):
@@ -78,18 +78,15 @@ class BuildTests(TnsTest):
 
         # Verify apk does not contain aar files
         apk_path = TnsPaths.get_apk_path(app_name=self.app_name, release=False)
-        File.unzip(apk_path, self.temp_folder)
-        # Clean META-INF folder. It contains com.android.support.... files which are expected to be there due to
+        apk = Archive.get(apk_path)
+        # Skip META-INF folder. It contains com.android.support.... files which are expected to be there due to
         # https://github.com/NativeScript/nativescript-cli/pull/3923
-        Folder.clean(os.path.join(self.temp_folder, 'META-INF'))
-        assert not File.pattern_exists(self.temp_folder, '*.aar')
-        assert not File.pattern_exists(self.temp_folder, '*.plist')
-        assert not File.pattern_exists(self.temp_folder, '*.android.*')
-        assert not File.pattern_exists(self.temp_folder, '*.ios.*')
+        for pattern in ['*.aar', '*.plist', '*.android.*', '*.ios.*']:
+            matches = [name for name in apk.find(pattern) if not name.startswith('META-INF/')]
+            assert not matches, '{0} found in apk: {1}'.format(pattern, matches)
 
         # Verify app is built with android sdk 29 by default
         TnsAssert.string_in_android_manifest(apk_path, 'compileSdkVersion="29"')
-        Folder.clean(self.temp_folder)
 
         # Verify incremental native build
         result = Tns.exec_command(command='build --clean', path=self.app_name,
@@ -107,7 +104,7 @@ class BuildTests(TnsTest):
         # Verify snapshot files in the built .apk
         apk_path = TnsPaths.get_apk_path(app_name=self.app_name, release=True)
         if Settings.HOST_OS != OSType.WINDOWS:
-            TnsAssert.snapshot_build(apk_path, self.temp_folder)
+            TnsAssert.snapshot_build(apk_path)
 
         # Verify app is built with android sdk 29 by default
         TnsAssert.string_in_android_manifest(apk_path, 'compileSdkVersion="29"')
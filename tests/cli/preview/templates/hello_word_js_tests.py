@@ -162,14 +162,11 @@ class PreviewJSTests(TnsPreviewJSTests):
         self.sim.wait_for_text(text=Changes.JSHelloWord.JS.new_text)
 
         # Check changes are not synced more than once per platform
-        # Extract the last part of the log
-        log = File.read(result.log_file)
-        log = File.extract_part_of_text(log, '[VERIFIED]')
+        # Get the part of the log written since last check
+        log = result.log_cursor.read()
         # Verify files are synced once
         TnsAssert.file_is_synced_once(log, device=self.emu, file_name='main-view-model.js')
         TnsAssert.file_is_synced_once(log, device=self.sim, file_name='main-view-model.js')
-        # Mark that part of the log as verified before next sync
-        File.append(result.log_file, '[VERIFIED]')
 
         # Edit XML file and verify changes are applied on both emulators
         Sync.replace(app_name=self.app_name, change_set=Changes.JSHelloWord.XML)
@@ -177,9 +174,8 @@ class PreviewJSTests(TnsPreviewJSTests):
         self.sim.wait_for_text(text=Changes.JSHelloWord.XML.new_text)
 
         # Check changes are not synced more than once per platform
-        # Extract the last part of the log
-        log = File.read(result.log_file)
-        log = File.extract_part_of_text(log, '[VERIFIED]')
+        # Get the part of the log written since last check
+        log = result.log_cursor.read()
         # Verify files are synced once
         TnsAssert.file_is_synced_once(log, device=self.emu, file_name='main-page.xml')
         TnsAssert.file_is_synced_once(log, device=self.sim, file_name='main-page.xml')
@@ -35,7 +35,7 @@ class TnsRunNGTests(TnsRunTest):
             Tns.platform_add_ios(app_name=cls.app_name, framework_path=Settings.IOS.FRAMEWORK_PATH)
 
         # Copy TestApp to data folder.
-        Folder.copy(source=cls.source_project_dir, target=cls.target_project_dir)
+        Folder.clone(source=cls.source_project_dir, target=cls.target_project_dir)
 
     def setUp(self):
         TnsRunTest.setUp(self)
@@ -1,17 +1,17 @@
 """
 Tests for app size ot {N} apps.
 """
-import logging
 import os
 import unittest
 
 from core.base_test.tns_test import TnsTest
 from core.enums.os_type import OSType
+from core.log.log import Log
 from core.settings import Settings
+from core.utils.archive import Archive
 from core.utils.docker import Docker
 from core.utils.file_utils import File, Folder
 from core.utils.perf_utils import PerfUtils
-from core.utils.run import run
 from data.templates import Template
 from products.nativescript.tns import Tns
 from products.nativescript.tns_paths import TnsPaths
@@ -59,25 +59,19 @@ class AppSizeTests(TnsTest):
         assert PerfUtils.is_value_in_range(actual=Folder.get_size(folder), expected=58628036, tolerance=0.1)
 
     def test_003_js_app_apk(self):
-        # Extract APK
-        apk = TnsPaths.get_apk_path(app_name=self.js_app, release=True)
-        extracted_apk = os.path.join(Settings.TEST_OUT_TEMP, 'js-apk')
-        File.unzip(file_path=apk, dest_dir=extracted_apk)
-
-        res = os.path.join(extracted_apk, 'res')
-        assets_app = os.path.join(extracted_apk, 'assets', 'app')
-        assets_snapshots = os.path.join(extracted_apk, 'assets', 'snapshots')
-        lib = os.path.join(extracted_apk, 'lib')
-        run(cmd='du -hs *', cwd=lib, wait=True, log_level=logging.INFO)
+        # Inspect APK (content is not extracted)
+        apk_path = TnsPaths.get_apk_path(app_name=self.js_app, release=True)
+        apk = Archive.get(apk_path)
+        Log.info('Size of lib folders: {0}'.format(apk.get_size_breakdown('lib')))
 
         # Verify content of APK
-        assert PerfUtils.is_value_in_range(actual=Folder.get_size(lib), expected=51992248, tolerance=0.05)
-        assert PerfUtils.is_value_in_range(actual=Folder.get_size(res), expected=796627, tolerance=0.05)
-        assert PerfUtils.is_value_in_range(actual=Folder.get_size(assets_app), expected=1210914, tolerance=0.05)
-        assert PerfUtils.is_value_in_range(actual=Folder.get_size(assets_snapshots), expected=16023484, tolerance=0.05)
+        assert PerfUtils.is_value_in_range(actual=apk.get_size('lib'), expected=51992248, tolerance=0.05)
+        assert PerfUtils.is_value_in_range(actual=apk.get_size('res'), expected=796627, tolerance=0.05)
+        assert PerfUtils.is_value_in_range(actual=apk.get_size('assets/app'), expected=1210914, tolerance=0.05)
+        assert PerfUtils.is_value_in_range(actual=apk.get_size('assets/snapshots'), expected=16023484, tolerance=0.05)
 
         # Verify final apk size
-        assert PerfUtils.is_value_in_range(actual=File.get_size(apk), expected=25826703, tolerance=0.03)
+        assert PerfUtils.is_value_in_range(actual=File.get_size(apk_path), expected=25826703, tolerance=0.03)
 
     @unittest.skipIf(Settings.HOST_OS != OSType.OSX, 'iOS tests can be executed only on macOS.')
     def test_102_js_app_ipa(self):
@@ -93,20 +87,16 @@ class AppSizeTests(TnsTest):
         assert PerfUtils.is_value_in_range(actual=Folder.get_size(app_folder), expected=210482662, tolerance=0.1)
 
     def test_102_ng_app_apk(self):
-        # Extract APK
-        apk = TnsPaths.get_apk_path(app_name=self.ng_app, release=True)
-        extracted_apk = os.path.join(Settings.TEST_OUT_TEMP, 'ng-apk')
-        File.unzip(file_path=apk, dest_dir=extracted_apk)
-
-        assets_app = os.path.join(extracted_apk, 'assets', 'app')
-        assets_snapshots = os.path.join(extracted_apk, 'assets', 'snapshots')
+        # Inspect APK (content is not extracted)
+        apk_path = TnsPaths.get_apk_path(app_name=self.ng_app, release=True)
+        apk = Archive.get(apk_path)
 
         # No asserts for lib and res, since it is same as JS project
-        assert PerfUtils.is_value_in_range(actual=Folder.get_size(assets_app), expected=1991318, tolerance=0.05)
-        assert PerfUtils.is_value_in_range(actual=Folder.get_size(assets_snapshots), expected=27041144, tolerance=0.05)
+        assert PerfUtils.is_value_in_range(actual=apk.get_size('assets/app'), expected=1991318, tolerance=0.05)
+        assert PerfUtils.is_value_in_range(actual=apk.get_size('assets/snapshots'), expected=27041144, tolerance=0.05)
 
         # Verify final apk size
-        assert PerfUtils.is_value_in_range(actual=File.get_size(apk), expected=28482168, tolerance=0.03)
+        assert PerfUtils.is_value_in_range(actual=File.get_size(apk_path), expected=28482168, tolerance=0.03)
 
     @unittest.skipIf(Settings.HOST_OS != OSType.OSX, 'iOS tests can be executed only on macOS.')
     def test_102_ng_app_ipa(self):
@@ -10,6 +10,7 @@ from parameterized import parameterized
 from core.base_test.tns_test import TnsTest
 from core.enums.os_type import OSType
 from core.enums.platform_type import Platform
+from core.log.log import Log
 from core.settings import Settings
 from core.utils.file_utils import Folder, File
 from core.utils.gradle import Gradle
@@ -94,6 +95,15 @@ class PrepareAndBuildPerfTests(TnsTest):
         expected = Helpers.get_expected_result(template, Platform.IOS, 'build_incremental')
         assert PerfUtils.is_value_in_range(actual, expected, TOLERANCE), 'Incremental ios build time is not OK.'
 
+    @parameterized.expand(TEST_DATA)
+    def test_400_build_android_initial_resources(self, template, template_package, change_set):
+        Helpers.assert_resources(template, Platform.ANDROID, 'build_initial')
+
+    @parameterized.expand(TEST_DATA)
+    @unittest.skipIf(Settings.HOST_OS != OSType.OSX, 'iOS tests can be executed only on macOS.')
+    def test_401_build_ios_initial_resources(self, template, template_package, change_set):
+        Helpers.assert_resources(template, Platform.IOS, 'build_initial')
+
 
 class PrepareBuildInfo(object):
     prepare_initial = 0
@@ -101,6 +111,13 @@ class PrepareBuildInfo(object):
     prepare_incremental = 0
     build_initial = 0
     build_incremental = 0
+    # Resource usage (peak memory in MB and CPU time in seconds)
+    prepare_initial_peak_rss = 0
+    prepare_initial_cpu = 0
+    build_initial_peak_rss = 0
+    build_initial_cpu = 0
+    build_incremental_peak_rss = 0
+    build_incremental_cpu = 0
 
 
 class Helpers(object):
@@ -109,6 +126,7 @@ class Helpers(object):
         prepare_initial = 0
         build_initial = 0
         build_incremental = 0
+        resources = {}
         for _ in range(RETRY_COUNT):
             Tns.kill()
             Gradle.kill()
@@ -124,27 +142,56 @@ class Helpers(object):
                 raise Exception('Unknown platform: ' + str(platform))
 
             # Prepare
-            time = Tns.prepare(app_name=APP_NAME, platform=platform, bundle=True).duration
-            prepare_initial = prepare_initial + time
+            prepare = Tns.prepare(app_name=APP_NAME, platform=platform, bundle=True, profile=True)
+            prepare_initial = prepare_initial + prepare.duration
+            Helpers.add_resources(resources, 'prepare_initial', prepare)
 
             # Build
-            time = Tns.build(app_name=APP_NAME, platform=platform, bundle=True).duration
-            build_initial = build_initial + time
+            build = Tns.build(app_name=APP_NAME, platform=platform, bundle=True, profile=True)
+            build_initial = build_initial + build.duration
+            Helpers.add_resources(resources, 'build_initial', build)
             Sync.replace(app_name=APP_NAME, change_set=change_set)
-            time = Tns.build(app_name=APP_NAME, platform=platform, bundle=True).duration
-            build_incremental = build_incremental + time
+            build = Tns.build(app_name=APP_NAME, platform=platform, bundle=True, profile=True)
+            build_incremental = build_incremental + build.duration
+            Helpers.add_resources(resources, 'build_incremental', build)
 
         # Calculate averages
         result = PrepareBuildInfo()
         result.prepare_initial = prepare_initial / RETRY_COUNT
         result.build_initial = build_initial / RETRY_COUNT
         result.build_incremental = build_incremental / RETRY_COUNT
+        for key, value in resources.items():
+            setattr(result, key, value / RETRY_COUNT)
 
         # Save to results file
         File.delete(path=result_file)
         result_json = json.dumps(result, default=lambda o: o.__dict__, sort_keys=True, indent=4)
         File.write(path=result_file, text=str(result_json))
 
+    @staticmethod
+    def add_resources(resources, entry, result):
+        resources[entry + '_peak_rss'] = resources.get(entry + '_peak_rss', 0) + result.resources.peak_rss_mb
+        resources[entry + '_cpu'] = resources.get(entry + '_cpu', 0) + result.resources.cpu_time
+
+    @staticmethod
+    def assert_resources(template, platform, entry):
+        """
+        Assert peak memory and CPU time against expected values in tests/perf/data.json.
+        Test is skipped (after all available expectations are asserted) if some expected values are missing.
+        """
+        missing = []
+        for metric in ['peak_rss', 'cpu']:
+            actual = Helpers.get_actual_result(template, platform, '{0}_{1}'.format(entry, metric))
+            expected = EXPECTED_RESULTS[template][str(platform)].get('{0}_{1}'.format(entry, metric))
+            Log.info('{0} {1} of {2}: {3} (expected: {4})'.format(entry, metric, template, actual, expected))
+            if expected is None:
+                missing.append('{0}_{1}={2}'.format(entry, metric, actual))
+                continue
+            assert PerfUtils.is_value_below(actual, expected, TOLERANCE), '{0} {1} is too high.'.format(entry, metric)
+        if missing:
+            raise unittest.SkipTest('No expected resources of {0} in data.json (actual: {1}).'.format(
+                template, ', '.join(missing)))
+
     @staticmethod
     def get_result_file_name(template, platform):
         result_file = os.path.join(Settings.TEST_OUT_HOME, '{0}_{1}.json'.format(template, str(platform)))
@@ -0,0 +1,186 @@
+# pylint: disable=unused-argument
+# pylint: disable=undefined-variable
+
+import json
+import os
+import time
+import unittest
+
+from parameterized import parameterized
+
+from core.base_test.tns_run_test import TnsRunTest
+from core.enums.platform_type import Platform
+from core.log.log import Log
+from core.settings import Settings
+from core.utils.file_utils import Folder, File
+from core.utils.file_watch import FileWatcher
+from core.utils.json_utils import JsonUtils
+from core.utils.perf_utils import PerfUtils
+from data.changes import Changes, Sync
+from data.templates import Template
+from products.nativescript.run_type import RunType
+from products.nativescript.tns import Tns
+from products.nativescript.tns_logs import TnsLogs
+
+CHANGE_COUNT = 10
+QUIET_PERIOD = 5
+TOLERANCE = 0.20
+APP_NAME = Settings.AppName.DEFAULT
+EXPECTED_RESULTS = JsonUtils.read(os.path.join(Settings.TEST_RUN_HOME, 'tests', 'perf', 'data.json'))
+
+
+# noinspection PyMethodMayBeStatic,PyUnusedLocal
+class LiveSyncPerfTests(TnsRunTest):
+    TEST_DATA = [
+        ('hello-world-js', Template.HELLO_WORLD_JS.local_package,
+         [Changes.JSHelloWord.JS, Changes.JSHelloWord.XML, Changes.JSHelloWord.CSS]),
+        ('hello-world-ts', Template.HELLO_WORLD_TS.local_package,
+         [Changes.TSHelloWord.TS, Changes.TSHelloWord.XML, Changes.TSHelloWord.CSS]),
+        ('hello-world-ng', Template.HELLO_WORLD_NG.local_package,
+         [Changes.NGHelloWorld.TS, Changes.NGHelloWorld.HTML, Changes.NGHelloWorld.CSS]),
+        ('blank-vue', Template.VUE_BLANK.local_package,
+         [Changes.BlankVue.VUE_SCRIPT, Changes.BlankVue.VUE_TEMPLATE, Changes.BlankVue.VUE_STYLE]),
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        TnsRunTest.setUpClass()
+
+    def setUp(self):
+        TnsRunTest.setUp(self)
+
+    @classmethod
+    def tearDownClass(cls):
+        TnsRunTest.tearDownClass()
+
+    @parameterized.expand(TEST_DATA)
+    def test_001_livesync_data(self, template, template_package, changes):
+        result_file = Helpers.get_result_file_name(template, Platform.ANDROID)
+        Helpers.measure_livesync(template=template_package, platform=Platform.ANDROID, device=self.emu,
+                                 changes=changes, result_file=result_file)
+
+    @parameterized.expand(TEST_DATA)
+    def test_100_sequential_android(self, template, template_package, changes):
+        Helpers.assert_results(template, Platform.ANDROID, lower=['sequential_p50', 'sequential_p95', 'sequential_max'])
+
+    @parameterized.expand(TEST_DATA)
+    def test_200_burst_android(self, template, template_package, changes):
+        Helpers.assert_results(template, Platform.ANDROID, lower=['burst_duration'], higher=['burst_throughput'])
+
+
+class LiveSyncInfo(object):
+    # Seconds between write of the file and 'Successfully synced application' (changes are applied one by one)
+    sequential_p50 = 0
+    sequential_p95 = 0
+    sequential_max = 0
+    sequential_throughput = 0
+    # Seconds between first write and last sync (all changes are applied at once)
+    burst_duration = 0
+    burst_throughput = 0
+
+
+class Helpers(object):
+    @staticmethod
+    def measure_livesync(template, platform, device, changes, result_file):
+        Tns.kill()
+        Folder.clean(folder=os.path.join(Settings.TEST_RUN_HOME, APP_NAME))
+        Tns.create(app_name=APP_NAME, template=template, update=True)
+        Tns.platform_add_android(app_name=APP_NAME, framework_path=Settings.Android.FRAMEWORK_PATH)
+        result = Tns.run(app_name=APP_NAME, platform=platform, emulator=True, wait=False, hmr=True)
+        strings = TnsLogs.run_messages(app_name=APP_NAME, platform=platform, run_type=RunType.UNKNOWN, hmr=True,
+                                       device=device)
+        TnsLogs.wait_for_log(log_file=result.log_file, string_list=strings, timeout=300)
+
+        # Sequential changes (each change and its revert is measured)
+        latencies = []
+        start = time.time()
+        for index in range(CHANGE_COUNT):
+            change_set = changes[(index // 2) % len(changes)]
+            latency = Sync.replace_and_measure(app_name=APP_NAME, change_set=change_set, log_file=result.log_file,
+                                               revert=index % 2 == 1)
+            latencies.append(latency.to_synced)
+        sequential_duration = time.time() - start
+
+        # Burst of changes (CLI is expected to batch them)
+        burst_duration = Helpers.burst(changes=changes, log_file=result.log_file)
+        Tns.kill()
+
+        info = LiveSyncInfo()
+        stats = PerfUtils.get_latency_stats(latencies)
+        info.sequential_p50 = stats['p50']
+        info.sequential_p95 = stats['p95']
+        info.sequential_max = stats['max']
+        info.sequential_throughput = CHANGE_COUNT * 60 / sequential_duration
+        info.burst_duration = burst_duration
+        info.burst_throughput = CHANGE_COUNT * 60 / burst_duration
+
+        # Save to results file
+        File.delete(path=result_file)
+        result_json = json.dumps(info, default=lambda o: o.__dict__, sort_keys=True, indent=4)
+        File.write(path=result_file, text=str(result_json))
+
+    @staticmethod
+    def burst(changes, log_file):
+        """
+        Apply CHANGE_COUNT changes without waiting and wait until CLI stops syncing.
+        :return: Seconds between first write and last 'Successfully synced application'.
+        """
+        cursor = TnsLogs.get_cursor(log_file).clone().checkpoint()
+        start = time.time()
+        for index in range(CHANGE_COUNT):
+            change_set = changes[(index // 2) % len(changes)]
+            if index % 2 == 0:
+                Sync.replace(app_name=APP_NAME, change_set=change_set)
+            else:
+                Sync.revert(app_name=APP_NAME, change_set=change_set)
+
+        log = ''
+        last_sync = None
+        end_time = time.time() + 300
+        with FileWatcher(path=log_file) as watcher:
+            while time.time() < end_time:
+                synced = log.count('Successfully synced application')
+                log = log + cursor.read()
+                if log.count('Successfully synced application') > synced:
+                    last_sync = time.time()
+                if last_sync is not None and time.time() - last_sync > QUIET_PERIOD:
+                    break
+                watcher.wait(1)
+        assert last_sync is not None, 'Burst of changes is not synced.'
+        return last_sync - start
+
+    @staticmethod
+    def assert_results(template, platform, lower=None, higher=None):
+        """
+        Assert results against expected values in tests/perf/data.json.
+        Test is skipped (after all available expectations are asserted) if some expected values are missing.
+        :param lower: Entries that should not be higher than expected (latencies).
+        :param higher: Entries that should not be lower than expected (throughput).
+        """
+        missing = []
+        for entry in (lower or []) + (higher or []):
+            actual = Helpers.get_actual_result(template, platform, entry)
+            expected = Helpers.get_expected_result(template, platform, entry)
+            Log.info('{0} of {1}: {2} (expected: {3})'.format(entry, template, actual, expected))
+            if expected is None:
+                missing.append('{0}={1}'.format(entry, actual))
+            elif entry in (higher or []):
+                assert actual >= expected - expected * TOLERANCE, '{0} of {1} is too low.'.format(entry, template)
+            else:
+                assert PerfUtils.is_value_below(actual, expected, TOLERANCE), \
+                    '{0} of {1} is too high.'.format(entry, template)
+        if missing:
+            raise unittest.SkipTest('No expected livesync values of {0} in data.json (actual: {1}).'.format(
+                template, ', '.join(missing)))
+
+    @staticmethod
+    def get_result_file_name(template, platform):
+        return os.path.join(Settings.TEST_OUT_HOME, '{0}_{1}_livesync.json'.format(template, str(platform)))
+
+    @staticmethod
+    def get_actual_result(template, platform, entry):
+        return JsonUtils.read(Helpers.get_result_file_name(template, platform))[entry]
+
+    @staticmethod
+    def get_expected_result(template, platform, entry):
+        return EXPECTED_RESULTS.get(template, {}).get(str(platform), {}).get('livesync', {}).get(entry)
@@ -0,0 +1,135 @@
+# pylint: disable=unused-argument
+# pylint: disable=undefined-variable
+
+import json
+import os
+
+from parameterized import parameterized
+
+from core.base_test.tns_run_test import TnsRunTest
+from core.enums.app_type import AppType
+from core.enums.platform_type import Platform
+from core.log.log import Log
+from core.settings import Settings
+from core.utils.file_utils import Folder, File
+from core.utils.gradle import Gradle
+from core.utils.json_utils import JsonUtils
+from core.utils.perf_utils import PerfUtils
+from data.changes import Sync
+from data.large_app import LargeApp, LargeAppInfo
+from products.nativescript.run_type import RunType
+from products.nativescript.tns import Tns
+from products.nativescript.tns_logs import TnsLogs
+
+# Lower bound of exponent of `time = a + c * size^k` fit on medians (`a` is fixed cost like CLI startup and Gradle
+# configuration), bigger values mean CLI time grows super-linearly with size of the app
+MAX_EXPONENT = 1.2
+# Each size is measured several times, so noise of single measurement is known and does not fail the tests
+REPEAT_COUNT = 3
+ENTRIES = ['prepare', 'build', 'livesync']
+APP_NAME = Settings.AppName.DEFAULT
+SIZES = [
+    LargeAppInfo(pages=10, modules=10, css_size=10000, images=10, dependencies=2),
+    LargeAppInfo(pages=20, modules=10, css_size=20000, images=20, dependencies=4),
+    LargeAppInfo(pages=40, modules=10, css_size=40000, images=40, dependencies=8),
+    LargeAppInfo(pages=80, modules=10, css_size=80000, images=80, dependencies=16),
+    LargeAppInfo(pages=160, modules=10, css_size=160000, images=160, dependencies=32),
+]
+
+
+# noinspection PyMethodMayBeStatic,PyUnusedLocal
+class ScalingPerfTests(TnsRunTest):
+    TEST_DATA = [
+        ('js', AppType.JS),
+        ('ts', AppType.TS),
+        ('ng', AppType.NG),
+        ('vue', AppType.VUE),
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        TnsRunTest.setUpClass()
+
+    def setUp(self):
+        TnsRunTest.setUp(self)
+
+    @classmethod
+    def tearDownClass(cls):
+        TnsRunTest.tearDownClass()
+
+    @parameterized.expand(TEST_DATA)
+    def test_001_scaling_data(self, flavor, app_type):
+        points = []
+        for info in SIZES:
+            samples = [Helpers.measure(app_type=app_type, info=info, platform=Platform.ANDROID, device=self.emu)
+                       for _ in range(REPEAT_COUNT)]
+            point = {'size': info.size, 'pages': info.pages, 'modules': info.modules, 'css_size': info.css_size,
+                     'images': info.images, 'dependencies': info.dependencies}
+            for entry in ENTRIES:
+                point[entry] = [sample[entry] for sample in samples]
+            points.append(point)
+        result_file = Helpers.get_result_file_name(flavor, Platform.ANDROID)
+        File.delete(path=result_file)
+        File.write(path=result_file, text=str(json.dumps(points, sort_keys=True, indent=4)))
+
+    @parameterized.expand(TEST_DATA)
+    def test_100_prepare_scaling_android(self, flavor, app_type):
+        Helpers.assert_scaling(flavor, Platform.ANDROID, 'prepare')
+
+    @parameterized.expand(TEST_DATA)
+    def test_200_build_scaling_android(self, flavor, app_type):
+        Helpers.assert_scaling(flavor, Platform.ANDROID, 'build')
+
+    @parameterized.expand(TEST_DATA)
+    def test_300_livesync_scaling_android(self, flavor, app_type):
+        Helpers.assert_scaling(flavor, Platform.ANDROID, 'livesync')
+
+
+class Helpers(object):
+    @staticmethod
+    def measure(app_type, info, platform, device):
+        """
+        Create synthetic app and measure prepare, build and livesync time.
+        :return: Dict with prepare, build and livesync times in seconds.
+        """
+        Tns.kill()
+        Gradle.kill()
+        Folder.clean(folder=os.path.join(Settings.TEST_RUN_HOME, APP_NAME), fast=True)
+        LargeApp.create(app_name=APP_NAME, app_type=app_type, info=info)
+        Tns.platform_add_android(app_name=APP_NAME, framework_path=Settings.Android.FRAMEWORK_PATH)
+
+        prepare = Tns.prepare(app_name=APP_NAME, platform=platform, bundle=True)
+        build = Tns.build(app_name=APP_NAME, platform=platform, bundle=True)
+
+        result = Tns.run(app_name=APP_NAME, platform=platform, emulator=True, wait=False, hmr=True)
+        strings = TnsLogs.run_messages(app_name=APP_NAME, platform=platform, run_type=RunType.UNKNOWN, hmr=True,
+                                       device=device)
+        TnsLogs.wait_for_log(log_file=result.log_file, string_list=strings, timeout=600)
+        change = LargeApp.get_change(app_type=app_type, page=info.pages - 1, module=info.modules - 1)
+        latency = Sync.replace_and_measure(app_name=APP_NAME, change_set=change, log_file=result.log_file, timeout=300)
+        Tns.kill()
+
+        sample = {'prepare': prepare.duration, 'build': build.duration, 'livesync': latency.to_synced}
+        Log.info('Scaling of {0} app with size {1}: {2}'.format(app_type, info.size, sample))
+        return sample
+
+    @staticmethod
+    def assert_scaling(flavor, platform, entry):
+        points = JsonUtils.read(Helpers.get_result_file_name(flavor, platform))
+        sizes = [point['size'] for point in points]
+        samples = [point[entry] for point in points]
+        for size, values in zip(sizes, samples):
+            Log.info('{0} {1} time for {2} modules: {3:.2f}s (samples: {4})'.format(
+                flavor, entry, size, PerfUtils.get_percentile(values, 50), values))
+        assert len(set(sizes)) >= 4, 'At least four app sizes are needed to measure scaling.'
+        exponent = PerfUtils.get_marginal_scaling_exponent(sizes, samples)
+        if exponent is None:
+            Log.info('{0} {1} size dependent time is not bigger than measurement noise.'.format(flavor, entry))
+            return
+        Log.info('{0} {1} scaling exponent of size dependent time: {2:.2f}'.format(flavor, entry, exponent))
+        assert exponent <= MAX_EXPONENT, \
+            '{0} time of {1} apps grows super-linearly with app size.'.format(entry, flavor)
+
+    @staticmethod
+    def get_result_file_name(flavor, platform):
+        return os.path.join(Settings.TEST_OUT_HOME, '{0}_{1}_scaling.json'.format(flavor, str(platform)))
@@ -65,8 +65,8 @@ class AndroidRuntimeTests(TnsTest):
         File.replace(path=webpack_config, old_string=old_string, new_string=new_string, backup_files=True)
         Adb.clear_logcat(device_id=self.emulator.id)
         Tns.run_android(APP_NAME, device=self.emulator.id, just_launch=True, wait=True)
-        assert_result = Wait.until(lambda: 'we got called from onCreate of custom-activity.js' in Adb.get_logcat(
-            device_id=self.emulator.id))
+        assert_result = Adb.wait_for_logcat(device_id=self.emulator.id,
+                                            text='we got called from onCreate of custom-activity.js', timeout=100)
         output = Adb.get_logcat(device_id=self.emulator.id)
 
         # make sure app hasn't crashed
@@ -74,8 +74,8 @@ class AndroidRuntimeTests(TnsTest):
             "App crashed with error activity"
         # check if we got called from custom activity that overrides the default one
         assert assert_result, "Expected output not found! Logs: " + Adb.get_logcat(device_id=self.emulator.id)
-        assert_result = Wait.until(lambda: "we got called from onCreate of my-custom-class.js" in Adb.get_logcat(
-            device_id=self.emulator.id))
+        assert_result = Adb.wait_for_logcat(device_id=self.emulator.id,
+                                            text='we got called from onCreate of my-custom-class.js', timeout=100)
         # make sure we called custom activity declared in manifest
         assert assert_result, "Expected output not found! Logs: " + Adb.get_logcat(device_id=self.emulator.id)
 
@@ -16,7 +16,6 @@ from core.utils.device.device_manager import DeviceManager
 from core.utils.file_utils import File, Folder
 from core.utils.assertions import Assert
 from core.utils.run import run
-from core.utils.wait import Wait
 from data.templates import Template
 from products.nativescript.tns import Tns
 from products.nativescript.tns_logs import TnsLogs
@@ -153,7 +152,6 @@ System\.err:.+at require\(:\d+:\d+\)"""  # noqa: E501, E261, W291
 .+System\.err:.+at webpackJsonpCallback\(file:\/\/\/data\/data\/org\.nativescript\.TestApp\/files\/app\/runtime\.js:\d+:\d+\)
 .+System\.err:.+at \(file:\/\/\/data\/data\/org\.nativescript\.TestApp\/files\/app\/bundle\.js:\d+:\d+\)
 .+System\.err:.+at require\(:\d+:\d+\)"""  # noqa: E501, E261, W291
-            Wait.until(lambda: "Error: Kill the app!" in Adb.get_logcat(self.emulator.id), timeout=240,
-                       period=5)
+            Adb.wait_for_logcat(device_id=self.emulator.id, text='Error: Kill the app!', timeout=240)
             Assert.assert_with_regex(Adb.get_logcat(self.emulator.id),
                                      regex_to_check)